@@ -0,0 +1 @@
+"""Qt-free building blocks for the COA Laptop Inspection System"""
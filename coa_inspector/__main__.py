@@ -0,0 +1,6 @@
+"""Allow `python -m coa_inspector detect|inspect ...`"""
+import sys
+
+from coa_inspector.cli import main
+
+sys.exit(main())
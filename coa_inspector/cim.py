@@ -0,0 +1,357 @@
+"""Batched CIM (WMI) collection for Windows hardware detection
+
+Instead of spawning wmic once per property, every CIM class the detection
+helpers need is fetched by a single PowerShell script that prints one JSON
+document. The parse_* functions turn that document into the dictionaries
+shown in the specs display. The script runner is pluggable: anything that
+takes (script, timeout) and returns the JSON text can be used, which lets the
+parsers be exercised on Linux against recorded output.
+"""
+import base64
+import json
+import re
+import subprocess
+from typing import Any, Callable, Dict, List, Optional
+
+from coa_inspector.storage import describe_volume
+
+# CIM classes and the properties read from each. The static classes cannot
+# change without a reboot and are fetched by their own query, which the
+# detection skips when every probe reading them is served from the cache.
+STATIC_CIM_QUERIES = {
+    'Win32_BIOS': ['SerialNumber', 'Version', 'SMBIOSBIOSVersion', 'Manufacturer', 'ReleaseDate'],
+    'Win32_ComputerSystem': ['Manufacturer', 'Model', 'SystemFamily', 'TotalPhysicalMemory'],
+    'Win32_ComputerSystemProduct': ['IdentifyingNumber', 'Name', 'Vendor'],
+    'Win32_SystemEnclosure': ['SerialNumber'],
+    'Win32_PhysicalMemory': ['Capacity', 'Speed', 'ConfiguredClockSpeed', 'MemoryType',
+                             'SMBIOSMemoryType', 'Manufacturer', 'PartNumber', 'DeviceLocator'],
+    'Win32_VideoController': ['Name', 'AdapterRAM', 'DriverVersion'],
+}
+VOLATILE_CIM_QUERIES = {
+    'Win32_DesktopMonitor': ['Name', 'ScreenWidth', 'ScreenHeight'],
+    'Win32_PnPEntity': ['Name', 'PNPClass', 'DeviceID', 'Status'],
+}
+CIM_QUERIES = {**STATIC_CIM_QUERIES, **VOLATILE_CIM_QUERIES}
+
+# Extra values computed in the same PowerShell session as the volatile classes
+CIM_EXTRAS = {
+    # Storage module enums are turned into their names ("SSD", "NVMe")
+    'PhysicalDisks': ("Get-PhysicalDisk | Select-Object DeviceId, FriendlyName, Size, "
+                      "@{n='MediaType';e={\"$($_.MediaType)\"}}, @{n='BusType';e={\"$($_.BusType)\"}}"),
+    'Partitions': ("Get-Partition | Where-Object DriveLetter | Select-Object DiskNumber, "
+                   "@{n='DriveLetter';e={\"$($_.DriveLetter)\"}}"),
+    'PrimaryScreen': ("Add-Type -AssemblyName System.Windows.Forms; "
+                      "[System.Windows.Forms.Screen]::PrimaryScreen.Bounds | "
+                      "Select-Object Width, Height"),
+}
+
+# Serial numbers that OEMs leave as placeholders
+PLACEHOLDER_SERIALS = ['', '0', 'None', 'To be filled by O.E.M.', 'Default string', 'System Serial Number']
+
+# Peripheral classification rules, checked in order against every PnP device:
+# (category, PnP classes, pattern matched against the device name)
+PERIPHERAL_RULES = [
+    ('Cameras', {'camera', 'image'}, r'camera|webcam|\bcam\b'),
+    ('Biometric', {'biometric'}, r'fingerprint|biometric|face ?(recognition|ir)'),
+    ('Bluetooth', {'bluetooth'}, r'bluetooth'),
+    ('Card Readers', {'sdhost', 'smartcardreader'}, r'card ?reader|\bsd host|\bmmc\b|smart ?card'),
+    ('Audio', {'media', 'audioendpoint'}, r'audio|speaker|microphone|headphone'),
+    ('Touchpad', set(), r'touch ?pad|precision touch|trackpad|clickpad'),
+    ('Network Adapters', {'net'}, None),
+    ('Keyboards', {'keyboard'}, None),
+    ('Security', {'securitydevices'}, r'\btpm\b|trusted platform'),
+]
+_COMPILED_RULES = [(category, classes, re.compile(pattern, re.IGNORECASE) if pattern else None)
+                   for category, classes, pattern in PERIPHERAL_RULES]
+
+# Hubs and host controllers are not counted as connected USB devices
+_USB_INFRASTRUCTURE = re.compile(r'root hub|usb hub|host controller|composite device', re.IGNORECASE)
+
+# SMBIOS memory type codes
+MEMORY_TYPES = {
+    "20": "DDR",
+    "21": "DDR2",
+    "24": "DDR3",
+    "26": "DDR4",
+    "29": "LPDDR3",
+    "30": "LPDDR4",
+    "34": "DDR5",
+    "35": "LPDDR5",
+}
+
+_SCRIPT_HEADER = """
+$ErrorActionPreference = 'SilentlyContinue'
+[Console]::OutputEncoding = [System.Text.Encoding]::UTF8
+function Get-CimRows([string]$ClassName, [string[]]$Properties) {
+    foreach ($item in @(Get-CimInstance -ClassName $ClassName)) {
+        $row = [ordered]@{}
+        foreach ($p in $Properties) {
+            $v = $item.$p
+            if ($v -is [datetime]) { $v = $v.ToString('yyyy-MM-dd') }
+            $row[$p] = $v
+        }
+        $row
+    }
+}
+$result = [ordered]@{}
+"""
+
+
+class CimError(Exception):
+    """Raised when the batched CIM query cannot be run or parsed"""
+
+
+def build_cim_script(queries: Dict[str, List[str]] = None, extras: Dict[str, str] = None) -> str:
+    """Build the PowerShell script that collects every class in one pass"""
+    queries = CIM_QUERIES if queries is None else queries
+    extras = CIM_EXTRAS if extras is None else extras
+
+    lines = [_SCRIPT_HEADER.strip()]
+    for class_name, properties in queries.items():
+        props = ", ".join(f"'{p}'" for p in properties)
+        lines.append(f"$result['{class_name}'] = @(Get-CimRows '{class_name}' @({props}))")
+    for key, expression in extras.items():
+        lines.append(f"$result['{key}'] = $( {expression} )")
+    lines.append("$result | ConvertTo-Json -Depth 4 -Compress")
+    return "\n".join(lines)
+
+
+class PowerShellExecutor:
+    """Run a script in a fresh powershell.exe process and return its stdout"""
+
+    def __init__(self, executable: str = 'powershell'):
+        self.executable = executable
+
+    def __call__(self, script: str, timeout: float) -> str:
+        encoded = base64.b64encode(script.encode('utf-16-le')).decode('ascii')
+        try:
+            result = subprocess.run(
+                [self.executable, '-NoProfile', '-NonInteractive', '-EncodedCommand', encoded],
+                capture_output=True, text=True, encoding='utf-8', errors='replace',
+                timeout=timeout, creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise CimError(f"PowerShell query failed: {e}") from e
+
+        if result.returncode != 0:
+            raise CimError(f"PowerShell exited with code {result.returncode}: {result.stderr.strip()[:200]}")
+        return result.stdout
+
+
+class CimSnapshot:
+    """One batched CIM collection pass, queried by class name"""
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        self.data = data or {}
+
+    @classmethod
+    def from_json(cls, text: str) -> 'CimSnapshot':
+        text = (text or '').strip().lstrip('\ufeff')
+        if not text:
+            raise CimError("CIM query returned no output")
+        try:
+            data = json.loads(text)
+        except ValueError as e:
+            raise CimError(f"CIM query returned invalid JSON: {e}") from e
+        if not isinstance(data, dict):
+            raise CimError("CIM query returned an unexpected document")
+        return cls(data)
+
+    def rows(self, class_name: str) -> List[Dict[str, Any]]:
+        """All instances of a class (ConvertTo-Json collapses single-item arrays)"""
+        value = self.data.get(class_name)
+        if value is None:
+            return []
+        if isinstance(value, dict):
+            return [value]
+        return [row for row in value if isinstance(row, dict)]
+
+    def first(self, class_name: str) -> Dict[str, Any]:
+        rows = self.rows(class_name)
+        return rows[0] if rows else {}
+
+    def value(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def __bool__(self) -> bool:
+        return bool(self.data)
+
+
+def collect_cim_snapshot(executor: Callable[[str, float], str] = None, timeout: float = 60,
+                         queries: Dict[str, List[str]] = None, extras: Dict[str, str] = None) -> CimSnapshot:
+    """Run the batched CIM script once and parse its JSON output (every class unless queries/extras are given)"""
+    executor = executor or PowerShellExecutor()
+    return CimSnapshot.from_json(executor(build_cim_script(queries, extras), timeout))
+
+
+def _clean(value: Any) -> str:
+    return str(value).strip() if value is not None else ''
+
+
+def _valid_serial(value: Any) -> Optional[str]:
+    serial = _clean(value)
+    return serial if serial not in PLACEHOLDER_SERIALS else None
+
+
+def memory_type_name(type_code: Any) -> str:
+    """Convert an SMBIOS memory type code to a name"""
+    code = _clean(type_code)
+    return MEMORY_TYPES.get(code, f"Type {code}")
+
+
+def parse_bios_info(cim: CimSnapshot) -> Dict:
+    """BIOS serial, version, manufacturer and release date"""
+    bios = cim.first('Win32_BIOS')
+    if not bios:
+        return {'Error': 'Could not retrieve BIOS info'}
+
+    return {
+        'Serial Number': _valid_serial(bios.get('SerialNumber')) or "Not available",
+        'Version': _clean(bios.get('SMBIOSBIOSVersion')) or _clean(bios.get('Version')) or "Not available",
+        'Manufacturer': _clean(bios.get('Manufacturer')) or "Not available",
+        'Release Date': _clean(bios.get('ReleaseDate')) or "Not available",
+    }
+
+
+def parse_system_serial(cim: CimSnapshot) -> str:
+    """First usable serial from BIOS, product and enclosure records"""
+    candidates = [
+        cim.first('Win32_BIOS').get('SerialNumber'),
+        cim.first('Win32_ComputerSystemProduct').get('IdentifyingNumber'),
+        cim.first('Win32_SystemEnclosure').get('SerialNumber'),
+    ]
+    for candidate in candidates:
+        serial = _valid_serial(candidate)
+        if serial:
+            return serial
+    return "Not available"
+
+
+def parse_ram_details(cim: CimSnapshot) -> Dict:
+    """Module count, speed and memory type"""
+    modules = cim.rows('Win32_PhysicalMemory')
+    if not modules:
+        return {}
+
+    first = modules[0]
+    speed = first.get('ConfiguredClockSpeed') or first.get('Speed')
+    type_code = first.get('SMBIOSMemoryType') or first.get('MemoryType')
+    return {
+        'Modules': len(modules),
+        'Speed': f"{speed} MHz" if speed else "Unknown",
+        'Type': memory_type_name(type_code) if type_code else "Unknown",
+    }
+
+
+def parse_storage_info(cim: CimSnapshot, volumes: List[Dict]) -> Dict:
+    """Physical disks with media type, bus and the volumes stored on them"""
+    disks = cim.rows('PhysicalDisks')
+    if not disks:
+        return {}
+
+    # Drive letter -> disk number
+    disk_of_letter = {_clean(part.get('DriveLetter')).upper(): _clean(part.get('DiskNumber'))
+                      for part in cim.rows('Partitions')}
+
+    storage_info = {}
+    for disk in sorted(disks, key=lambda row: int(_clean(row.get('DeviceId')) or 0)):
+        number = _clean(disk.get('DeviceId'))
+        bus = _clean(disk.get('BusType')) or "Unknown"
+        media = _clean(disk.get('MediaType'))
+        if bus == "NVMe":
+            media = "NVMe SSD"
+        elif media not in ("SSD", "HDD"):
+            media = "Unknown"
+
+        drive = {
+            'Device': f"Disk {number}",
+            'Model': _clean(disk.get('FriendlyName')) or "Unknown",
+            'Media': media,
+            'Bus': bus,
+            'Removable': "Yes" if bus in ("USB", "SD", "MMC") else "No",
+            # Disks are sold in decimal gigabytes
+            'Total': f"{int(disk.get('Size') or 0) // (1000**3)} GB",
+        }
+        on_disk = [describe_volume(volume) for volume in volumes
+                   if disk_of_letter.get(volume['Device'][:1].upper()) == number]
+        if on_disk:
+            drive['Volumes'] = on_disk
+        storage_info[f'Drive_{len(storage_info) + 1}'] = drive
+    return storage_info
+
+
+def parse_graphics_info(cim: CimSnapshot) -> Dict:
+    cards = [_clean(row.get('Name')) for row in cim.rows('Win32_VideoController') if _clean(row.get('Name'))]
+    return {'Cards': cards if cards else ["Unable to detect graphics cards"]}
+
+
+def parse_display_info(cim: CimSnapshot) -> Dict:
+    """Primary screen resolution and monitor name"""
+    display_info = {'Resolution': "Unable to detect", 'Name': "Built-in Display"}
+
+    monitor = cim.first('Win32_DesktopMonitor')
+    if monitor:
+        if monitor.get('ScreenWidth') and monitor.get('ScreenHeight'):
+            display_info['Resolution'] = f"{monitor['ScreenWidth']}x{monitor['ScreenHeight']}"
+        if _clean(monitor.get('Name')):
+            display_info['Name'] = _clean(monitor['Name'])
+
+    # The Windows Forms primary screen bounds are more reliable than WMI
+    screen = cim.value('PrimaryScreen')
+    if isinstance(screen, dict) and screen.get('Width') and screen.get('Height'):
+        display_info['Resolution'] = f"{screen['Width']}x{screen['Height']}"
+
+    return display_info
+
+
+def classify_pnp_device(row: Dict[str, Any]) -> Optional[str]:
+    """Peripheral category of one Win32_PnPEntity row, or None"""
+    name = _clean(row.get('Name'))
+    pnp_class = _clean(row.get('PNPClass')).lower()
+    for category, classes, pattern in _COMPILED_RULES:
+        if pnp_class in classes or (pattern is not None and pattern.search(name)):
+            return category
+    return None
+
+
+def pnp_inventory(cim: CimSnapshot) -> Dict[str, List[str]]:
+    """Classify every PnP device in one pass; also lists connected USB devices"""
+    inventory: Dict[str, List[str]] = {}
+    for row in cim.rows('Win32_PnPEntity'):
+        name = _clean(row.get('Name'))
+        if not name:
+            continue
+        category = classify_pnp_device(row)
+        if category and name not in inventory.get(category, []):
+            inventory.setdefault(category, []).append(name)
+        if (_clean(row.get('DeviceID')).upper().startswith('USB\\')
+                and not _USB_INFRASTRUCTURE.search(name)):
+            inventory.setdefault('USB', []).append(name)
+    return inventory
+
+
+def parse_peripheral_devices(cim: CimSnapshot) -> Dict:
+    """Webcam, audio, USB, Bluetooth, biometric and card reader summary"""
+    inventory = pnp_inventory(cim)
+    cameras = inventory.get('Cameras', [])
+    audio = inventory.get('Audio', [])
+
+    return {
+        'Webcam': cameras[0] if cameras else "No webcam detected",
+        'Audio Devices': audio[:2] if audio else ["No audio devices"],
+        'USB Devices': f"{len(inventory.get('USB', []))} USB devices connected",
+        'Bluetooth': "Available" if inventory.get('Bluetooth') else "Not detected",
+        'Fingerprint Reader': "Available" if inventory.get('Biometric') else "Not detected",
+        'Card Reader': "Available" if inventory.get('Card Readers') else "Not detected",
+        'Inventory': inventory,
+    }
+
+
+def parse_warranty_info(cim: CimSnapshot, serial_number: str) -> Dict:
+    system = cim.first('Win32_ComputerSystem')
+    return {
+        'Manufacturer': _clean(system.get('Manufacturer')) or "Unknown",
+        'Model': _clean(system.get('Model')) or "Unknown",
+        'Serial Number': serial_number,
+        'Note': "Check manufacturer website for warranty details",
+    }
@@ -0,0 +1,194 @@
+"""Headless command-line interface
+
+    python main.py detect [--json] [--out FILE] [--force]
+    python main.py inspect (--template NAME | --cpu .. --ram .. --storage ..) [--out FILE]
+    python main.py startup-benchmark [--runs N] [--budget SECONDS]
+    python main.py throughput-server [--host ADDRESS] [--port PORT]
+    python main.py check-db [--db FILE]
+
+detect runs the same hardware detection as the Auto-Detect button; inspect
+also validates the result against a PR template from the database (or PR
+requirements given on the command line) and writes a machine-readable
+result. startup-benchmark times how long the GUI takes to show its login
+window. throughput-server runs the sink/source that the LAN throughput test
+in the network dialog connects to, until interrupted. check-db brings a
+database to the current schema version and fails if one of the queries
+behind the window's lists would scan a table without an index. Nothing here
+imports PySide6, pandas or reportlab, so the commands start quickly and
+work from a WinPE or Linux boot stick.
+"""
+import argparse
+import json
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from coa_inspector.database import InspectionDatabase
+from coa_inspector.detection import HardwareDetector, format_specs
+from coa_inspector.startup import DEFAULT_BUDGET, run_startup_benchmark
+from coa_inspector.throughput import DEFAULT_PORT, ThroughputServer
+from coa_inspector.validation import validate_specs
+
+# Exit codes
+EXIT_PASS = 0
+EXIT_FAIL = 1
+EXIT_ERROR = 2
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="main.py", description="COA Laptop Inspector (headless mode)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    detect = subparsers.add_parser('detect', help="Detect hardware specifications")
+    detect.add_argument('--json', action='store_true', help="Print JSON instead of the text report")
+
+    inspect = subparsers.add_parser('inspect', help="Detect hardware and validate it against a PR")
+    inspect.add_argument('--template', help="Name of a PR template stored in the database")
+    inspect.add_argument('--cpu', default='', help="PR CPU requirement (overrides the template)")
+    inspect.add_argument('--ram', default='', help="PR RAM requirement (overrides the template)")
+    inspect.add_argument('--storage', default='', help="PR storage requirement (overrides the template)")
+
+    benchmark = subparsers.add_parser('startup-benchmark',
+                                      help="Time how long the GUI takes to show the login window")
+    benchmark.add_argument('--runs', type=int, default=5, help="Number of launches (default: %(default)s)")
+    benchmark.add_argument('--budget', type=float, default=DEFAULT_BUDGET,
+                           help="Maximum median seconds to the login window (default: %(default)s)")
+
+    server = subparsers.add_parser('throughput-server', help="Serve LAN throughput tests from this machine")
+    server.add_argument('--host', default='0.0.0.0', help="Address to listen on (default: all interfaces)")
+    server.add_argument('--port', type=int, default=DEFAULT_PORT, help="TCP port (default: %(default)s)")
+
+    check_db = subparsers.add_parser('check-db', help="Migrate a database and check its hot queries use indexes")
+    check_db.add_argument('--db', default=':memory:',
+                          help="Database to migrate and check (default: a new in-memory database)")
+
+    for command in (detect, inspect):
+        command.add_argument('--out', help="Write the result to this file instead of standard output")
+        command.add_argument('--db', default='coa_inspections.db', help="Inspection database (default: %(default)s)")
+        command.add_argument('--force', action='store_true', help="Ignore cached BIOS, serial and GPU results")
+    return parser
+
+
+def load_template(db_path: Path, template_name: str) -> Optional[Dict]:
+    """PR template from the database, or None when it does not exist"""
+    if not db_path.exists():
+        return None
+    try:
+        with InspectionDatabase(db_path) as database:
+            return database.find_template(template_name)
+    except sqlite3.OperationalError:
+        return None  # Database without a templates table
+
+
+def detect_specs(args) -> Dict:
+    detector = HardwareDetector(Path(args.db).parent)
+    try:
+        return detector.collect_specs(force_full=args.force)
+    finally:
+        detector.stop()
+
+
+def run_detect(args) -> int:
+    specs = detect_specs(args)
+    if args.json or args.out:
+        write_output(args.out, json.dumps(specs, indent=2, default=str), 'detect')
+    else:
+        write_output(None, format_specs(specs), 'detect')
+    return EXIT_PASS
+
+
+def run_inspect(args) -> int:
+    template = {}
+    if args.template:
+        template = load_template(Path(args.db), args.template)
+        if template is None:
+            print(f"PR template '{args.template}' not found in {args.db}", file=sys.stderr)
+            return EXIT_ERROR
+
+    pr_specs = {
+        'cpu': args.cpu or template.get('pr_cpu') or '',
+        'ram': args.ram or template.get('pr_ram') or '',
+        'storage': args.storage or template.get('pr_storage') or '',
+    }
+    if not any(pr_specs.values()):
+        print("Give --template or at least one of --cpu, --ram, --storage", file=sys.stderr)
+        return EXIT_ERROR
+
+    specs = detect_specs(args)
+    validation, overall_status = validate_specs(specs, {key: value.upper() for key, value in pr_specs.items()})
+
+    result = {
+        'inspected_at': datetime.now().isoformat(),
+        'template': args.template or '',
+        'agency_name': template.get('agency_name') or '',
+        'serial_number': specs.get('System', {}).get('System Serial', ''),
+        'purchase_request_specs': pr_specs,
+        'detected_specs': specs,
+        'validation_results': {'validation': validation, 'overall_status': overall_status},
+    }
+    write_output(args.out, json.dumps(result, indent=2, default=str), 'inspect')
+    return EXIT_PASS if overall_status == "PASS" else EXIT_FAIL
+
+
+def run_startup_benchmark_command(args) -> int:
+    result = run_startup_benchmark(runs=args.runs, budget=args.budget)
+    runs = ", ".join(f"{seconds:.2f}s" for seconds in result['runs'])
+    verdict = "PASS" if result['passed'] else "FAIL"
+    write_output(None, f"Login window after: {runs}\n"
+                       f"Median {result['median']:.2f}s, max {result['max']:.2f}s, "
+                       f"budget {result['budget']:.2f}s - {verdict}", 'startup-benchmark')
+    return EXIT_PASS if result['passed'] else EXIT_FAIL
+
+
+def run_throughput_server(args) -> int:
+    with ThroughputServer(args.host, args.port) as server:
+        if sys.stdout is not None:
+            print(f"Throughput server listening on {args.host}:{args.port} (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return EXIT_PASS
+
+
+def run_check_db(args) -> int:
+    with InspectionDatabase(args.db) as database:
+        version = database.init_schema()
+        plans = database.query_plans()
+        unindexed = database.unindexed_queries()
+    lines = [f"Schema version {version}"]
+    for name, plan in plans.items():
+        lines.append(f"{name}: {'; '.join(plan)}{' - NOT INDEXED' if name in unindexed else ''}")
+    lines.append("FAIL" if unindexed else "PASS")
+    write_output(None, "\n".join(lines), 'check-db')
+    return EXIT_FAIL if unindexed else EXIT_PASS
+
+
+def write_output(path: Optional[str], text: str, command: str):
+    """Write to path, or to stdout; the windowed executable has no stdout"""
+    if path is None and sys.stdout is None:
+        path = f"{command}_result.json"
+    if path is None:
+        sys.stdout.write(text + "\n")
+    else:
+        Path(path).write_text(text + "\n", encoding='utf-8')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        if args.command == 'detect':
+            return run_detect(args)
+        if args.command == 'startup-benchmark':
+            return run_startup_benchmark_command(args)
+        if args.command == 'throughput-server':
+            return run_throughput_server(args)
+        if args.command == 'check-db':
+            return run_check_db(args)
+        return run_inspect(args)
+    except Exception as e:
+        if sys.stderr is not None:
+            print(f"Error: {e}", file=sys.stderr)
+        return EXIT_ERROR
@@ -0,0 +1,342 @@
+"""Side-by-side comparison of a PR against detected hardware
+
+Used by the Specification Comparison tab. Unlike validation, which only
+decides pass/fail for CPU, RAM and storage, every row here carries the PR
+text, the detected value and a note, and graphics, WiFi and the physical
+condition are included.
+"""
+from typing import Dict, List
+
+from coa_inspector.validation import extract_gb, internal_storage_gb
+
+
+def compare_inspection(inspection_data: Dict) -> List[Dict]:
+    """Comparison rows for the detected specs, PR specs and physical condition of an inspection"""
+    detected_specs = inspection_data.get('detected_specs', {})
+    pr_specs = inspection_data.get('purchase_request_specs', {})
+    physical_condition = inspection_data.get('physical_condition', {})
+
+    comparison_data = [
+        compare_cpu_specs(pr_specs.get('cpu', ''), detected_specs.get('CPU', {})),
+        compare_ram_specs(pr_specs.get('ram', ''), detected_specs.get('RAM', {})),
+        compare_storage_specs(pr_specs.get('storage', ''), detected_specs.get('Storage', {})),
+        compare_graphics_specs(pr_specs.get('graphics', ''), detected_specs.get('Graphics', {})),
+        compare_wifi_specs(pr_specs.get('wifi', ''), detected_specs.get('Network', {})),
+    ]
+    for component in ('Chassis', 'Screen', 'Keyboard', 'Ports'):
+        comparison_data.append(assess_physical_condition(component, physical_condition.get(component.lower(), '')))
+
+    if 'System' in detected_specs:
+        comparison_data.append({
+            'component': 'Operating System',
+            'pr_spec': 'N/A',
+            'actual_spec': detected_specs['System'].get('OS', 'Unknown'),
+            'status': 'INFO',
+            'notes': 'Detected operating system'
+        })
+
+    if 'Battery' in detected_specs:
+        battery_info = detected_specs['Battery']
+        comparison_data.append({
+            'component': 'Battery',
+            'pr_spec': 'N/A',
+            'actual_spec': f"{battery_info.get('Percent', 'N/A')} - {battery_info.get('Power Plugged', 'N/A')}",
+            'status': 'INFO',
+            'notes': 'Battery status'
+        })
+
+    return comparison_data
+
+
+def status_counts(comparison_data: List[Dict]) -> Dict[str, int]:
+    """Number of rows per status (PASS, FAIL, WARNING, INFO)"""
+    counts = {'PASS': 0, 'FAIL': 0, 'WARNING': 0, 'INFO': 0}
+    for item in comparison_data:
+        counts[item['status']] = counts.get(item['status'], 0) + 1
+    return counts
+
+
+def compare_cpu_specs(pr_cpu: str, actual_cpu: dict) -> dict:
+    """Compare CPU specifications"""
+    actual_name = actual_cpu.get('Name', 'Not detected')
+    actual_cores = actual_cpu.get('Cores', 'N/A')
+    actual_threads = actual_cpu.get('Threads', 'N/A')
+
+    if not pr_cpu:
+        return {
+            'component': 'CPU',
+            'pr_spec': 'Not specified',
+            'actual_spec': f"{actual_name} ({actual_cores} cores, {actual_threads} threads)",
+            'status': 'INFO',
+            'notes': 'No PR specification provided'
+        }
+
+    # Enhanced CPU matching
+    pr_upper = pr_cpu.upper()
+    actual_upper = actual_name.upper()
+
+    # Check for model number matches (e.g., i7, i5, Ryzen 7, etc.)
+    common_indicators = ['I7', 'I5', 'I3', 'RYZEN 7', 'RYZEN 5', 'RYZEN 3', 'CORE I7', 'CORE I5', 'CORE I3']
+
+    pr_indicator = next((ind for ind in common_indicators if ind in pr_upper), None)
+    actual_indicator = next((ind for ind in common_indicators if ind in actual_upper), None)
+
+    if pr_indicator and actual_indicator and pr_indicator == actual_indicator:
+        return {
+            'component': 'CPU',
+            'pr_spec': pr_cpu,
+            'actual_spec': f"{actual_name} ({actual_cores} cores, {actual_threads} threads)",
+            'status': 'PASS',
+            'notes': f'CPU tier matches: {pr_indicator}'
+        }
+    elif pr_upper in actual_upper:
+        return {
+            'component': 'CPU',
+            'pr_spec': pr_cpu,
+            'actual_spec': f"{actual_name} ({actual_cores} cores, {actual_threads} threads)",
+            'status': 'PASS',
+            'notes': 'Exact CPU model match'
+        }
+    else:
+        return {
+            'component': 'CPU',
+            'pr_spec': pr_cpu,
+            'actual_spec': f"{actual_name} ({actual_cores} cores, {actual_threads} threads)",
+            'status': 'FAIL',
+            'notes': 'CPU specification does not match PR requirements'
+        }
+
+
+def compare_ram_specs(pr_ram: str, actual_ram: dict) -> dict:
+    """Compare RAM specifications"""
+    actual_total = actual_ram.get('Total', 'Not detected')
+
+    if not pr_ram:
+        return {
+            'component': 'RAM',
+            'pr_spec': 'Not specified',
+            'actual_spec': actual_total,
+            'status': 'INFO',
+            'notes': 'No PR specification provided'
+        }
+
+    pr_gb = extract_gb(pr_ram)
+    actual_gb = extract_gb(actual_total)
+
+    if pr_gb and actual_gb:
+        if actual_gb >= pr_gb:
+            return {
+                'component': 'RAM',
+                'pr_spec': pr_ram,
+                'actual_spec': actual_total,
+                'status': 'PASS',
+                'notes': f'RAM capacity meets requirement ({actual_gb}GB >= {pr_gb}GB)'
+            }
+        else:
+            return {
+                'component': 'RAM',
+                'pr_spec': pr_ram,
+                'actual_spec': actual_total,
+                'status': 'FAIL',
+                'notes': f'RAM capacity insufficient ({actual_gb}GB < {pr_gb}GB)'
+            }
+
+    return {
+        'component': 'RAM',
+        'pr_spec': pr_ram,
+        'actual_spec': actual_total,
+        'status': 'WARNING',
+        'notes': 'Could not parse RAM specifications for comparison'
+    }
+
+
+def compare_storage_specs(pr_storage: str, actual_storage: dict) -> dict:
+    """Compare storage specifications"""
+    if not pr_storage:
+        return {
+            'component': 'Storage',
+            'pr_spec': 'Not specified',
+            'actual_spec': format_storage_info(actual_storage),
+            'status': 'INFO',
+            'notes': 'No PR specification provided'
+        }
+
+    pr_gb = extract_gb(pr_storage)
+    total_actual_gb = internal_storage_gb(actual_storage)
+
+    if pr_gb and total_actual_gb > 0:
+        if total_actual_gb >= pr_gb:
+            return {
+                'component': 'Storage',
+                'pr_spec': pr_storage,
+                'actual_spec': format_storage_info(actual_storage),
+                'status': 'PASS',
+                'notes': f'Total storage meets requirement ({total_actual_gb}GB >= {pr_gb}GB)'
+            }
+        else:
+            return {
+                'component': 'Storage',
+                'pr_spec': pr_storage,
+                'actual_spec': format_storage_info(actual_storage),
+                'status': 'FAIL',
+                'notes': f'Total storage insufficient ({total_actual_gb}GB < {pr_gb}GB)'
+            }
+
+    return {
+        'component': 'Storage',
+        'pr_spec': pr_storage,
+        'actual_spec': format_storage_info(actual_storage),
+        'status': 'WARNING',
+        'notes': 'Could not parse storage specifications'
+    }
+
+
+def compare_graphics_specs(pr_graphics: str, actual_graphics: dict) -> dict:
+    """Compare graphics specifications"""
+    actual_cards = actual_graphics.get('Cards', ['Not detected'])
+    actual_display = ", ".join(actual_cards) if isinstance(actual_cards, list) else str(actual_cards)
+
+    if not pr_graphics:
+        return {
+            'component': 'Graphics',
+            'pr_spec': 'Not specified',
+            'actual_spec': actual_display,
+            'status': 'INFO',
+            'notes': 'No PR specification provided'
+        }
+
+    pr_upper = pr_graphics.upper()
+    actual_upper = actual_display.upper()
+
+    # Check for graphics card family matches
+    common_families = ['GEFORCE', 'RADEON', 'INTEL HD', 'INTEL UHD', 'IRIS XE']
+
+    pr_family = next((fam for fam in common_families if fam in pr_upper), None)
+    actual_family = next((fam for fam in common_families if fam in actual_upper), None)
+
+    if pr_family and actual_family:
+        if pr_family in actual_family or actual_family in pr_family:
+            return {
+                'component': 'Graphics',
+                'pr_spec': pr_graphics,
+                'actual_spec': actual_display,
+                'status': 'PASS',
+                'notes': f'Graphics family matches: {pr_family}'
+            }
+
+    if pr_upper in actual_upper:
+        return {
+            'component': 'Graphics',
+            'pr_spec': pr_graphics,
+            'actual_spec': actual_display,
+            'status': 'PASS',
+            'notes': 'Exact graphics card match'
+        }
+
+    return {
+        'component': 'Graphics',
+        'pr_spec': pr_graphics,
+        'actual_spec': actual_display,
+        'status': 'FAIL',
+        'notes': 'Graphics specification does not match PR requirements'
+    }
+
+
+def compare_wifi_specs(pr_wifi: str, actual_network: dict) -> dict:
+    """Compare WiFi specifications"""
+    # Extract WiFi adapters from network info
+    wifi_adapters = []
+    for interface, info in actual_network.items():
+        if any(wifi_keyword in interface.upper() for wifi_keyword in ['WIFI', 'WIRELESS', '802.11']) or \
+                (isinstance(info, dict) and info.get('Type') == 'Wireless'):
+            wifi_adapters.append(interface)
+
+    actual_display = ", ".join(wifi_adapters) if wifi_adapters else "No WiFi adapters detected"
+
+    if not pr_wifi:
+        return {
+            'component': 'WiFi',
+            'pr_spec': 'Not specified',
+            'actual_spec': actual_display,
+            'status': 'INFO',
+            'notes': 'No PR specification provided'
+        }
+
+    # Basic WiFi standard checking
+    wifi_standards = ['802.11AX', 'WIFI 6', '802.11AC', 'WIFI 5', '802.11N', 'WIFI 4']
+
+    pr_upper = pr_wifi.upper()
+    actual_upper = actual_display.upper()
+
+    pr_standard = next((std for std in wifi_standards if std in pr_upper), None)
+    actual_standard = next((std for std in wifi_standards if std in actual_upper), None)
+
+    if pr_standard and actual_standard:
+        # Compare WiFi standards (higher is better)
+        pr_index = wifi_standards.index(pr_standard)
+        actual_index = wifi_standards.index(actual_standard)
+
+        if actual_index <= pr_index:  # Lower index means better standard
+            return {
+                'component': 'WiFi',
+                'pr_spec': pr_wifi,
+                'actual_spec': actual_display,
+                'status': 'PASS',
+                'notes': f'WiFi standard meets requirement: {actual_standard}'
+            }
+        else:
+            return {
+                'component': 'WiFi',
+                'pr_spec': pr_wifi,
+                'actual_spec': actual_display,
+                'status': 'FAIL',
+                'notes': f'WiFi standard insufficient: {actual_standard} vs required {pr_standard}'
+            }
+
+    return {
+        'component': 'WiFi',
+        'pr_spec': pr_wifi,
+        'actual_spec': actual_display,
+        'status': 'WARNING',
+        'notes': 'Could not verify WiFi specifications'
+    }
+
+
+def assess_physical_condition(component: str, condition: str) -> dict:
+    """Assess physical condition and return comparison result"""
+    condition_map = {
+        'Excellent': 'PASS',
+        'Good': 'PASS',
+        'Fair': 'WARNING',
+        'Poor': 'FAIL',
+        'Damaged': 'FAIL',
+        'Cracked': 'FAIL',
+        'Non-functional': 'FAIL',
+        'All Working': 'PASS',
+        'Some Issues': 'WARNING',
+        'Major Issues': 'FAIL'
+    }
+
+    status = condition_map.get(condition, 'INFO')
+
+    return {
+        'component': f'Physical {component}',
+        'pr_spec': 'Good Condition',
+        'actual_spec': condition,
+        'status': status,
+        'notes': f'Physical condition assessment: {condition}'
+    }
+
+
+def format_storage_info(storage_info: dict) -> str:
+    """Format storage information for display"""
+    if not storage_info:
+        return "No storage devices detected"
+
+    drives = []
+    for drive, info in storage_info.items():
+        if 'Total' in info:
+            media = f" {info['Media']}" if info.get('Media') else ""
+            drives.append(f"{info.get('Device', drive)}: {info['Total']}{media}")
+
+    return " | ".join(drives) if drives else "Storage info unavailable"
@@ -0,0 +1,153 @@
+"""Concurrent TCP and DNS connectivity checks
+
+Replaces the single `ping` that used to sit inside hardware detection. All
+targets are checked at once on a private asyncio loop, TCP by opening a
+connection and DNS by resolving a name, and the whole check returns within
+a short budget even when the bench network is offline. Targets are
+configurable, so the check can be pointed at a local listener instead of
+the internet.
+"""
+import asyncio
+import json
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+# (host, port) pairs checked with a TCP connect
+DEFAULT_TCP_TARGETS = [('8.8.8.8', 53), ('1.1.1.1', 53), ('www.google.com', 443)]
+
+# Host names that must resolve through the configured DNS servers
+DEFAULT_DNS_NAMES = ['www.google.com', 'www.coa.gov.ph']
+
+# Seconds allowed for the whole check
+DEFAULT_BUDGET = 3.0
+
+
+@dataclass
+class TargetResult:
+    """Outcome of checking one target"""
+    kind: str  # "TCP" or "DNS"
+    target: str
+    ok: bool
+    latency_ms: float = 0.0
+    error: str = ""
+
+    @property
+    def label(self) -> str:
+        return f"{self.kind} {self.target}"
+
+    def summary(self) -> str:
+        return f"{self.latency_ms:.0f} ms" if self.ok else f"Failed - {self.error}"
+
+
+@dataclass
+class ConnectivityReport:
+    """Per-target results of one connectivity check"""
+    results: List[TargetResult]
+    duration: float = 0.0
+
+    @property
+    def connected(self) -> bool:
+        return any(result.ok for result in self.results if result.kind == "TCP")
+
+    @property
+    def dns_ok(self) -> bool:
+        return any(result.ok for result in self.results if result.kind == "DNS")
+
+    def status(self) -> str:
+        if self.connected:
+            return "Internet: Connected"
+        if self.dns_ok:
+            return "Internet: DNS only (no TCP targets reachable)"
+        return "Internet: No Connection"
+
+    def as_dict(self) -> Dict[str, str]:
+        """Status plus one entry per target, as stored in the detected specs"""
+        details = {'Status': self.status()}
+        for result in self.results:
+            details[result.label] = result.summary()
+        return details
+
+
+def load_targets(path: Union[str, Path]) -> Tuple[List[Tuple[str, int]], List[str]]:
+    """Read targets from a JSON file like {"tcp": ["10.0.0.1:80"], "dns": ["intranet.local"]}
+
+    Returns the defaults when the file does not exist.
+    """
+    path = Path(path)
+    if not path.exists():
+        return list(DEFAULT_TCP_TARGETS), list(DEFAULT_DNS_NAMES)
+
+    data = json.loads(path.read_text(encoding='utf-8'))
+    tcp_targets = [parse_host_port(entry, "TCP target") for entry in data.get('tcp', [])]
+    return tcp_targets, [str(name) for name in data.get('dns', [])]
+
+
+def parse_host_port(entry, what: str = "Target") -> Tuple[str, int]:
+    """'10.0.0.1:80' or '[fe80::1]:80' -> (host, port)"""
+    host, _, port = str(entry).rpartition(':')
+    if not host or not port.isdigit():
+        raise ValueError(f"{what} must be host:port, got '{entry}'")
+    return host.strip('[]'), int(port)
+
+
+async def check_tcp(host: str, port: int, timeout: float) -> TargetResult:
+    started = time.perf_counter()
+    target = f"{host}:{port}"
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except asyncio.TimeoutError:
+        return TargetResult("TCP", target, False, error="timed out")
+    except OSError as e:
+        return TargetResult("TCP", target, False, error=e.strerror or type(e).__name__)
+    latency = (time.perf_counter() - started) * 1000
+    writer.close()
+    return TargetResult("TCP", target, True, latency)
+
+
+async def check_dns(name: str, timeout: float) -> TargetResult:
+    started = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    try:
+        await asyncio.wait_for(loop.getaddrinfo(name, None, type=socket.SOCK_STREAM), timeout)
+    except asyncio.TimeoutError:
+        return TargetResult("DNS", name, False, error="timed out")
+    except OSError as e:
+        return TargetResult("DNS", name, False, error=e.strerror or type(e).__name__)
+    return TargetResult("DNS", name, True, (time.perf_counter() - started) * 1000)
+
+
+async def _check_all(tcp_targets: Sequence[Tuple[str, int]], dns_names: Sequence[str],
+                     budget: float) -> List[TargetResult]:
+    checks = [check_tcp(host, port, budget) for host, port in tcp_targets]
+    checks += [check_dns(name, budget) for name in dns_names]
+    return list(await asyncio.gather(*checks))
+
+
+def check_connectivity(tcp_targets: Optional[Sequence[Tuple[str, int]]] = None,
+                       dns_names: Optional[Sequence[str]] = None,
+                       budget: float = DEFAULT_BUDGET) -> ConnectivityReport:
+    """Check every target concurrently and return within roughly budget seconds
+
+    Runs its own event loop, so it can be called from any worker thread.
+    """
+    tcp_targets = DEFAULT_TCP_TARGETS if tcp_targets is None else tcp_targets
+    dns_names = DEFAULT_DNS_NAMES if dns_names is None else dns_names
+
+    started = time.perf_counter()
+    # Name lookups run on executor threads that cannot be interrupted; the
+    # loop is closed without waiting on them so a hung resolver cannot
+    # stretch the check past its budget
+    executor = ThreadPoolExecutor(max_workers=max(4, len(tcp_targets) + len(dns_names)),
+                                  thread_name_prefix="connectivity")
+    loop = asyncio.new_event_loop()
+    loop.set_default_executor(executor)
+    try:
+        results = loop.run_until_complete(_check_all(tcp_targets, dns_names, budget))
+    finally:
+        executor.shutdown(wait=False)
+        loop.close()
+    return ConnectivityReport(results, time.perf_counter() - started)
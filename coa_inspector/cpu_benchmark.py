@@ -0,0 +1,149 @@
+"""Multi-core CPU benchmark
+
+A fixed integer kernel runs in a process pool with 1, N/2 and N workers
+(N = logical processors). Throughput with one worker is the single-thread
+score, with N workers the all-core score, and their ratio the effective
+parallelism, which is checked against the core and thread counts hardware
+detection reported. Worker processes are started and warmed up before
+anything is timed, and each worker count is repeated through the
+benchmark harness.
+"""
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import psutil
+
+from coa_inspector.harness import BenchmarkHarness, format_spread
+
+# Kernel iterations in one work unit (roughly 0.1 s on a current laptop core)
+KERNEL_ITERATIONS = 2_000_000
+UNITS_PER_WORKER = 2
+
+# All-core throughput below this many physical cores' worth is flagged
+MIN_PARALLEL_FRACTION = 0.6
+
+
+def compute_kernel(iterations: int) -> int:
+    """Integer multiply/add/mask loop; the same work on every machine"""
+    x = 1
+    for i in range(iterations):
+        x = (x * 1103515245 + 12345 + i) & 0xFFFFFFFF
+    return x
+
+
+def run_units(units: int, iterations: int) -> int:
+    """Worker task: run the kernel units times"""
+    for _ in range(units):
+        compute_kernel(iterations)
+    return units
+
+
+def _warm_up(delay: float) -> int:
+    """Keeps a worker busy long enough that the pool has to start every process"""
+    compute_kernel(1000)
+    time.sleep(delay)
+    return os.getpid()
+
+
+@dataclass
+class CpuBenchmarkResult:
+    """Median throughput in million kernel iterations per second, keyed by worker count"""
+    scores: Dict[int, float] = field(default_factory=dict)
+    score_stats: Dict[int, Dict] = field(default_factory=dict)  # Measurement.as_dict() per worker count
+    physical_cores: int = 0
+    logical_threads: int = 0
+    single_thread_score: float = 0.0
+    all_core_score: float = 0.0
+    effective_parallelism: float = 0.0
+    scaling_efficiency: float = 0.0  # all-core score / (single-thread score * workers), in percent
+    verdict: str = ""
+    cancelled: bool = False
+
+    def as_dict(self) -> Dict:
+        return asdict(self)
+
+
+def worker_counts(logical_threads: int) -> List[int]:
+    """1, N/2 and N workers without duplicates"""
+    return sorted({1, max(1, logical_threads // 2), max(1, logical_threads)})
+
+
+def scaling_verdict(effective_parallelism: float, physical_cores: int, logical_threads: int) -> str:
+    reported = f"{physical_cores} cores / {logical_threads} threads reported"
+    if logical_threads <= 1:
+        return f"Single processor ({reported})"
+    if effective_parallelism < MIN_PARALLEL_FRACTION * physical_cores:
+        return (f"Below expected: all cores together do the work of {effective_parallelism:.1f} "
+                f"({reported})")
+    return f"Consistent with {reported}"
+
+
+def run_cpu_benchmark(physical_cores: Optional[int] = None, logical_threads: Optional[int] = None,
+                      units_per_worker: int = UNITS_PER_WORKER, iterations: int = KERNEL_ITERATIONS,
+                      harness: Optional[BenchmarkHarness] = None,
+                      on_progress: Optional[Callable[[str], None]] = None,
+                      cancel_event: Optional[threading.Event] = None) -> CpuBenchmarkResult:
+    """Measure single-thread and all-core throughput
+
+    physical_cores and logical_threads default to what psutil reports; pass the
+    detected values to compare against the inspection's specs.
+    """
+    logical_threads = logical_threads or psutil.cpu_count(logical=True) or 1
+    physical_cores = physical_cores or psutil.cpu_count(logical=False) or logical_threads
+    harness = harness or BenchmarkHarness()
+    result = CpuBenchmarkResult(physical_cores=physical_cores, logical_threads=logical_threads)
+    counts = worker_counts(logical_threads)
+
+    # spawn everywhere: it is the only method on Windows, and forking the
+    # multi-threaded GUI process is unsafe on Linux
+    with ProcessPoolExecutor(max_workers=max(counts), mp_context=multiprocessing.get_context('spawn')) as pool:
+        if on_progress is not None:
+            on_progress(f"CPU: starting {max(counts)} worker processes")
+        wait([pool.submit(_warm_up, 0.2) for _ in range(max(counts))])
+
+        for workers in counts:
+            if cancel_event is not None and cancel_event.is_set():
+                result.cancelled = True
+                break
+            if on_progress is not None:
+                on_progress(f"CPU: {workers} worker{'s' if workers > 1 else ''}")
+
+            def benchmark(workers=workers) -> int:
+                futures = [pool.submit(run_units, units_per_worker, iterations) for _ in range(workers)]
+                return sum(future.result() for future in futures) * iterations
+
+            measurement = harness.run(benchmark, "Mops/s", scale=1e-6, cancel_event=cancel_event)
+            if not measurement.values:
+                result.cancelled = True
+                break
+            result.scores[workers] = measurement.median
+            result.score_stats[workers] = measurement.as_dict()
+
+    if result.scores:
+        result.single_thread_score = result.scores[min(result.scores)]
+        result.all_core_score = result.scores[max(result.scores)]
+        result.effective_parallelism = result.all_core_score / result.single_thread_score
+        result.scaling_efficiency = result.effective_parallelism / max(result.scores) * 100
+        result.verdict = scaling_verdict(result.effective_parallelism, physical_cores, logical_threads)
+    return result
+
+
+def format_cpu_result(result: CpuBenchmarkResult) -> List[str]:
+    lines = ["CPU Test (process pool)"]
+    for workers, score in result.scores.items():
+        lines.append(f"  {workers} worker{'s' if workers > 1 else ''}: {score:.1f} Mops/s"
+                     f"{format_spread(result.score_stats.get(workers))}")
+    lines += [
+        f"  Single-thread score: {result.single_thread_score:.1f} Mops/s",
+        f"  All-core score: {result.all_core_score:.1f} Mops/s",
+        f"  Scaling: {result.effective_parallelism:.2f}x ({result.scaling_efficiency:.0f}% efficiency)",
+        f"  {result.verdict}",
+    ]
+    if result.cancelled:
+        lines.append("  Cancelled - results are partial")
+    return lines
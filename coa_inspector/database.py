@@ -0,0 +1,533 @@
+"""SQLite persistence for inspections, templates, pending work and audit data
+
+Every query the app runs lives here. Methods return plain tuples, dicts or
+Inspection objects and raise sqlite3 errors to the caller, which decides
+how to show them (a message box in the GUI, an exit code in the CLI).
+
+Each thread gets one long-lived connection, opened on first use and
+tuned once: WAL journaling so readers do not block the writer, a busy
+timeout, relaxed fsync (synchronous=NORMAL, safe with WAL), a larger page
+cache, memory-mapped reads and a per-connection prepared statement cache.
+Writes start with BEGIN IMMEDIATE and a statement that still finds the
+database locked is retried with exponential backoff. WAL needs shared
+memory between processes, which network file systems do not provide, so a
+database on a network share keeps the rollback journal and relies on the
+busy timeout and retries alone. Threads started outside Python, such as
+QThreads, look alive to Python forever, so they must release() their
+connection before they finish or it stays open until close().
+
+The schema is versioned with PRAGMA user_version: MIGRATIONS[n] takes a
+database from version n to n + 1, and init_schema() applies the missing
+ones at startup, each in its own transaction together with the version
+bump. Add a migration to change the schema; never edit one that has
+shipped. HOT_QUERIES lists the queries behind the lists in the window, and
+unindexed_queries() uses EXPLAIN QUERY PLAN to confirm each is answered
+through an index (`python main.py check-db`).
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
+
+import psutil
+
+from coa_inspector.model import Inspection
+
+T = TypeVar('T')
+
+# Milliseconds SQLite itself waits for a lock before reporting it busy
+BUSY_TIMEOUT_MS = 5000
+
+# Further attempts, and the first delay in seconds (doubled each time),
+# for statements that fail with "database is locked" after the busy timeout
+LOCK_RETRIES = 4
+LOCK_BACKOFF = 0.1
+
+# Negative cache_size is in KiB
+PRAGMAS = {
+    'synchronous': 'NORMAL',
+    'cache_size': -16384,
+    'mmap_size': 64 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+STATEMENT_CACHE_SIZE = 256
+
+NETWORK_FILESYSTEMS = {'nfs', 'nfs4', 'cifs', 'smbfs', 'smb3', '9p', 'fuse.sshfs'}
+
+SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS inspections (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        inspection_date TEXT,
+        inspector_name TEXT,
+        inspector_signature TEXT,
+        inspector_id TEXT,
+        approver_signature TEXT,
+        approver_id TEXT,
+        certificate_id TEXT,
+        signature_timestamp TEXT,
+        agency_name TEXT,
+        pr_number TEXT,
+        serial_number TEXT,
+        laptop_model TEXT,
+        inspection_data TEXT,
+        overall_status TEXT,
+        created_at TEXT,
+        created_by TEXT
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS audit_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        action TEXT,
+        username TEXT,
+        details TEXT,
+        timestamp TEXT
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS pr_templates (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        template_name TEXT UNIQUE,
+        agency_name TEXT,
+        pr_cpu TEXT,
+        pr_ram TEXT,
+        pr_storage TEXT,
+        pr_graphics TEXT,
+        pr_wifi TEXT,
+        pr_notes TEXT,
+        created_by TEXT,
+        created_at TEXT
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS pending_inspections (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        agency_name TEXT,
+        pr_number TEXT,
+        laptop_model TEXT,
+        expected_serial TEXT,
+        pr_cpu TEXT,
+        pr_ram TEXT,
+        pr_storage TEXT,
+        pr_graphics TEXT,
+        pr_wifi TEXT,
+        pr_notes TEXT,
+        status TEXT DEFAULT 'pending',
+        created_by TEXT,
+        created_at TEXT
+    )
+    ''',
+    # Probe and operation timings
+    '''
+    CREATE TABLE IF NOT EXISTS probe_metrics (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        probe TEXT,
+        laptop_model TEXT,
+        duration REAL,
+        outcome TEXT,
+        timed_out INTEGER,
+        username TEXT,
+        recorded_at TEXT
+    )
+    ''',
+]
+
+# Indexes for the ORDER BY and WHERE clauses of HOT_QUERIES
+INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_inspections_date ON inspections (inspection_date)',
+    'CREATE INDEX IF NOT EXISTS idx_inspections_status ON inspections (overall_status)',
+    'CREATE INDEX IF NOT EXISTS idx_pending_status_created ON pending_inspections (status, created_at)',
+    'CREATE INDEX IF NOT EXISTS idx_audit_log_timestamp ON audit_log (timestamp)',
+]
+
+# MIGRATIONS[n] upgrades a database from user_version n to n + 1. The first
+# one creates the original tables; its IF NOT EXISTS lets databases from
+# before versioning (user_version 0 with the tables present) pass through.
+MIGRATIONS: List[List[str]] = [
+    SCHEMA,
+    INDEXES,
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+SEARCH_INSPECTIONS = '''
+    SELECT id, inspection_date, inspector_name, agency_name,
+           pr_number, serial_number, laptop_model, overall_status
+    FROM inspections
+    WHERE serial_number LIKE ? OR pr_number LIKE ? OR agency_name LIKE ?
+    ORDER BY inspection_date DESC
+'''
+INSPECTION_CHOICES = '''
+    SELECT id, inspection_date, agency_name, pr_number, serial_number, laptop_model
+    FROM inspections
+    ORDER BY inspection_date DESC
+'''
+STATUS_COUNTS = "SELECT overall_status, COUNT(*) FROM inspections GROUP BY overall_status"
+LIST_PENDING = '''
+    SELECT id, pr_number, agency_name, laptop_model, pr_cpu, pr_ram, pr_storage, status
+    FROM pending_inspections
+    WHERE status = 'pending'
+    ORDER BY created_at DESC
+'''
+PENDING_CHOICES = '''
+    SELECT id, pr_number, agency_name
+    FROM pending_inspections
+    WHERE status = 'pending'
+    ORDER BY created_at DESC
+'''
+AUDIT_LOG = '''
+    SELECT timestamp, username, action, details
+    FROM audit_log
+    ORDER BY timestamp DESC
+    LIMIT ?
+'''
+
+# Query name: (SQL, sample parameters). Searches use a leading wildcard,
+# which no B-tree index can serve; their index only saves the sort.
+HOT_QUERIES = {
+    'search_inspections': (SEARCH_INSPECTIONS, ('%a%',) * 3),
+    'inspection_choices': (INSPECTION_CHOICES, ()),
+    'status_counts': (STATUS_COUNTS, ()),
+    'list_pending': (LIST_PENDING, ()),
+    'pending_choices': (PENDING_CHOICES, ()),
+    'audit_log': (AUDIT_LOG, (100,)),
+}
+
+# Editable fields of a PR template and a pending inspection
+TEMPLATE_FIELDS = ['template_name', 'agency_name', 'pr_cpu', 'pr_ram', 'pr_storage',
+                   'pr_graphics', 'pr_wifi', 'pr_notes']
+PENDING_FIELDS = ['agency_name', 'pr_number', 'laptop_model', 'expected_serial', 'pr_cpu', 'pr_ram',
+                  'pr_storage', 'pr_graphics', 'pr_wifi', 'pr_notes']
+
+
+def on_network_share(path: Union[str, Path]) -> bool:
+    """Whether path is on a network drive (UNC path, mapped drive, NFS/SMB mount)"""
+    path = os.path.normcase(os.path.abspath(path))
+    if path.startswith('\\\\'):
+        return True
+    try:
+        partitions = psutil.disk_partitions(all=True)
+    except (OSError, psutil.Error):
+        return False
+    mounts = [partition for partition in partitions
+              if path.startswith(os.path.normcase(partition.mountpoint))]
+    if not mounts:
+        return False
+    mount = max(mounts, key=lambda partition: len(partition.mountpoint))
+    return 'remote' in mount.opts.split(',') or mount.fstype.lower() in NETWORK_FILESYSTEMS
+
+
+def _is_locked(error: sqlite3.OperationalError) -> bool:
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+
+class InspectionDatabase:
+    """All reads and writes of the inspection database
+
+    Safe to share between threads; close() when the application exits.
+    """
+
+    def __init__(self, db_path: Union[str, Path] = "coa_inspections.db"):
+        self.db_path = Path(db_path)
+        self.journal_mode = 'DELETE' if on_network_share(self.db_path) else 'WAL'
+        self._connections: Dict[threading.Thread, sqlite3.Connection] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "InspectionDatabase":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _open(self) -> sqlite3.Connection:
+        # Connections never leave their thread, but close() may run on another one
+        conn = sqlite3.connect(self.db_path, isolation_level='IMMEDIATE', check_same_thread=False,
+                               cached_statements=STATEMENT_CACHE_SIZE)
+        conn.execute(f'PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}')
+        try:
+            conn.execute(f'PRAGMA journal_mode = {self.journal_mode}')
+        except sqlite3.OperationalError:
+            pass  # Read-only media, or another process is mid-write; keep the file's current mode
+        for pragma, value in PRAGMAS.items():
+            conn.execute(f'PRAGMA {pragma} = {value}')
+        return conn
+
+    def connect(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use"""
+        thread = threading.current_thread()
+        with self._lock:
+            conn = self._connections.get(thread)
+            if conn is None:
+                # Worker threads come and go; drop the connections of finished ones
+                # (threads Python did not start never finish here, see release())
+                for finished in [other for other in self._connections if not other.is_alive()]:
+                    self._connections.pop(finished).close()
+                conn = self._connections[thread] = self._open()
+        return conn
+
+    def release(self):
+        """Close this thread's connection; the thread's next query opens a new one"""
+        with self._lock:
+            conn = self._connections.pop(threading.current_thread(), None)
+        if conn is not None:
+            conn.close()
+
+    def close(self):
+        """Close every thread's connection; the next query opens a new one"""
+        with self._lock:
+            connections, self._connections = list(self._connections.values()), {}
+        for conn in connections:
+            conn.close()
+
+    def _run(self, work: Callable[[sqlite3.Connection], T]) -> T:
+        """Call work with this thread's connection, retrying while the database is locked"""
+        conn = self.connect()
+        for attempt in range(LOCK_RETRIES + 1):
+            try:
+                return work(conn)
+            except sqlite3.OperationalError as e:
+                if conn.in_transaction:
+                    conn.rollback()
+                if attempt == LOCK_RETRIES or not _is_locked(e):
+                    raise
+            time.sleep(LOCK_BACKOFF * 2 ** attempt)
+
+    def _execute(self, sql: str, params: Tuple = ()) -> int:
+        """Run one write statement; returns the last row id"""
+        def write(conn: sqlite3.Connection) -> int:
+            with conn:
+                return conn.execute(sql, params).lastrowid
+        return self._run(write)
+
+    def _executemany(self, sql: str, rows: List[Tuple]):
+        def write(conn: sqlite3.Connection):
+            with conn:
+                conn.executemany(sql, rows)
+        self._run(write)
+
+    def _fetchall(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        return self._run(lambda conn: conn.execute(sql, params).fetchall())
+
+    def _fetch_dict(self, sql: str, params: Tuple = ()) -> Optional[Dict]:
+        def read(conn: sqlite3.Connection) -> Optional[sqlite3.Row]:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            return cursor.execute(sql, params).fetchone()
+        row = self._run(read)
+        return dict(row) if row else None
+
+    def schema_version(self) -> int:
+        return self._fetchall('PRAGMA user_version')[0][0]
+
+    def init_schema(self) -> int:
+        """Apply the migrations this database is missing; returns the resulting version
+
+        Each migration and its version bump commit together, so an interrupted
+        upgrade resumes at the failed step. The version is re-read under the
+        write lock, so two instances starting at once do not both migrate.
+        """
+        def migrate(conn: sqlite3.Connection) -> int:
+            while True:
+                with conn:
+                    conn.execute('BEGIN IMMEDIATE')
+                    version = conn.execute('PRAGMA user_version').fetchone()[0]
+                    if version >= SCHEMA_VERSION:
+                        return version
+                    for statement in MIGRATIONS[version]:
+                        conn.execute(statement)
+                    conn.execute(f'PRAGMA user_version = {version + 1}')
+        return self._run(migrate)
+
+    def query_plans(self) -> Dict[str, List[str]]:
+        """EXPLAIN QUERY PLAN steps of each of HOT_QUERIES"""
+        return {name: [row[3] for row in self._fetchall(f'EXPLAIN QUERY PLAN {sql}', params)]
+                for name, (sql, params) in HOT_QUERIES.items()}
+
+    def unindexed_queries(self) -> List[str]:
+        """Names of HOT_QUERIES whose plan scans a table without an index or sorts in a temporary B-tree"""
+        def unindexed(step: str) -> bool:
+            return (step.startswith('SCAN ') and ' USING ' not in step) or step.startswith('USE TEMP B-TREE')
+        return [name for name, plan in self.query_plans().items() if any(unindexed(step) for step in plan)]
+
+    def backup(self, target: Union[str, Path]):
+        """Write a consistent copy of the database, including changes still in the WAL, to target"""
+        destination = sqlite3.connect(target)
+        try:
+            self._run(lambda conn: conn.backup(destination))
+            destination.execute('PRAGMA journal_mode = DELETE')  # A single self-contained file
+        finally:
+            destination.close()
+
+    def restore(self, source: Union[str, Path]):
+        """Replace the whole database with the contents of the database file source"""
+        origin = sqlite3.connect(source)
+        try:
+            self._run(lambda conn: origin.backup(conn))
+        finally:
+            origin.close()
+
+    # === AUDIT AND METRICS ===
+
+    def log_action(self, action: str, username: str, details: str = ""):
+        self._execute('''
+            INSERT INTO audit_log (action, username, details, timestamp)
+            VALUES (?, ?, ?, ?)
+        ''', (action, username, details, datetime.now().isoformat()))
+
+    def audit_log(self, limit: int = 100) -> List[Tuple]:
+        """(timestamp, username, action, details), newest first"""
+        return self._fetchall(AUDIT_LOG, (limit,))
+
+    def record_metrics(self, metrics: Iterable[Tuple[str, float, str, bool]], laptop_model: str = "",
+                       username: str = ""):
+        """Store (probe, duration, outcome, timed_out) timings"""
+        recorded_at = datetime.now().isoformat()
+        self._executemany('''
+            INSERT INTO probe_metrics (probe, laptop_model, duration, outcome, timed_out, username, recorded_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', [(probe, laptop_model or "Unknown", duration, outcome, int(timed_out), username, recorded_at)
+              for probe, duration, outcome, timed_out in metrics])
+
+    def probe_metrics(self) -> List[Tuple]:
+        """(probe, laptop_model, duration, outcome, timed_out) rows for summarize_metrics()"""
+        return self._fetchall("SELECT probe, laptop_model, duration, outcome, timed_out FROM probe_metrics")
+
+    # === INSPECTIONS ===
+
+    def save_inspection(self, inspection: Inspection) -> int:
+        """Insert an inspection and return its id"""
+        if not inspection.created_at:
+            inspection.created_at = datetime.now().isoformat()
+        columns = Inspection.columns()
+        inspection.id = self._execute(f'''
+            INSERT INTO inspections ({", ".join(columns)})
+            VALUES ({", ".join("?" * len(columns))})
+        ''', inspection.to_row())
+        return inspection.id
+
+    def get_inspection(self, inspection_id: int) -> Optional[Inspection]:
+        row = self._fetch_dict('SELECT * FROM inspections WHERE id = ?', (inspection_id,))
+        return Inspection.from_row(row) if row else None
+
+    def iter_inspections(self, batch_size: int = 500) -> Iterator[Inspection]:
+        """Every stored inspection, read in batches"""
+        cursor = self.connect().cursor()
+        cursor.row_factory = sqlite3.Row
+        try:
+            cursor.execute('SELECT * FROM inspections ORDER BY id')
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield Inspection.from_row(row)
+        finally:
+            cursor.close()
+
+    def update_validation(self, inspections: Iterable[Inspection]):
+        """Store revalidated inspection data and status of existing inspections"""
+        self._executemany('UPDATE inspections SET inspection_data = ?, overall_status = ? WHERE id = ?',
+                          [(json.dumps(inspection.inspection_data), inspection.overall_status, inspection.id)
+                           for inspection in inspections])
+
+    def search_inspections(self, text: str = "") -> List[Tuple]:
+        """(id, date, inspector, agency, PR, serial, model, status) matching serial, PR or agency"""
+        search_term = f"%{text}%"
+        return self._fetchall(SEARCH_INSPECTIONS, (search_term, search_term, search_term))
+
+    def inspection_choices(self) -> List[Tuple]:
+        """(id, date, agency, PR, serial, model) of every inspection, newest first"""
+        return self._fetchall(INSPECTION_CHOICES)
+
+    def status_counts(self) -> Tuple[int, List[Tuple[str, int]]]:
+        """Total number of inspections and (overall_status, count) pairs"""
+        total = self._fetchall("SELECT COUNT(*) FROM inspections")[0][0]
+        counts = self._fetchall(STATUS_COUNTS)
+        return total, counts
+
+    def benchmark_counts(self) -> List[Tuple[str, int, int]]:
+        """(laptop_model, benchmarked inspections, flagged below their reference) per model"""
+        return self._fetchall(
+            "SELECT laptop_model, COUNT(*), "
+            "SUM(COALESCE(json_extract(inspection_data, '$.performance_tests.Reference.underperforming'), 0)) "
+            "FROM inspections WHERE json_extract(inspection_data, '$.performance_tests.Scores') IS NOT NULL "
+            "GROUP BY laptop_model ORDER BY laptop_model")
+
+    # === PR TEMPLATES ===
+
+    def list_templates(self) -> List[Tuple]:
+        """(id, name, agency, cpu, ram, storage) ordered by name"""
+        return self._fetchall('''
+            SELECT id, template_name, agency_name, pr_cpu, pr_ram, pr_storage
+            FROM pr_templates
+            ORDER BY template_name
+        ''')
+
+    def template_choices(self) -> List[Tuple]:
+        """(id, name, agency) ordered by name"""
+        return self._fetchall('SELECT id, template_name, agency_name FROM pr_templates ORDER BY template_name')
+
+    def templates(self) -> List[Dict]:
+        """Every template as a dict with id and TEMPLATE_FIELDS"""
+        rows = self._fetchall(f'SELECT id, {", ".join(TEMPLATE_FIELDS)} FROM pr_templates')
+        return [dict(zip(['id'] + TEMPLATE_FIELDS, row)) for row in rows]
+
+    def get_template(self, template_id: int) -> Optional[Dict]:
+        return self._fetch_dict('SELECT * FROM pr_templates WHERE id = ?', (template_id,))
+
+    def find_template(self, template_name: str) -> Optional[Dict]:
+        return self._fetch_dict('SELECT * FROM pr_templates WHERE template_name = ?', (template_name,))
+
+    def create_template(self, template_data: Dict, username: str) -> int:
+        """Raises sqlite3.IntegrityError when the name is already taken"""
+        return self._execute(f'''
+            INSERT INTO pr_templates ({", ".join(TEMPLATE_FIELDS)}, created_by, created_at)
+            VALUES ({", ".join("?" * (len(TEMPLATE_FIELDS) + 2))})
+        ''', tuple(template_data[key] for key in TEMPLATE_FIELDS) + (username, datetime.now().isoformat()))
+
+    def update_template(self, template_id: int, template_data: Dict):
+        self._execute(f'''
+            UPDATE pr_templates
+            SET {", ".join(f"{key}=?" for key in TEMPLATE_FIELDS)}
+            WHERE id=?
+        ''', tuple(template_data[key] for key in TEMPLATE_FIELDS) + (template_id,))
+
+    def delete_template(self, template_id: int):
+        self._execute('DELETE FROM pr_templates WHERE id = ?', (template_id,))
+
+    # === PENDING INSPECTIONS ===
+
+    def list_pending(self) -> List[Tuple]:
+        """(id, PR, agency, model, cpu, ram, storage, status) of open work, newest first"""
+        return self._fetchall(LIST_PENDING)
+
+    def pending_choices(self) -> List[Tuple]:
+        """(id, PR, agency) of open work, newest first"""
+        return self._fetchall(PENDING_CHOICES)
+
+    def get_pending(self, pending_id: int) -> Optional[Dict]:
+        return self._fetch_dict('SELECT * FROM pending_inspections WHERE id = ?', (pending_id,))
+
+    def create_pending(self, pending_data: Dict, username: str) -> int:
+        return self._execute(f'''
+            INSERT INTO pending_inspections ({", ".join(PENDING_FIELDS)}, status, created_by, created_at)
+            VALUES ({", ".join("?" * len(PENDING_FIELDS))}, 'pending', ?, ?)
+        ''', tuple(pending_data[key] for key in PENDING_FIELDS) + (username, datetime.now().isoformat()))
+
+    def update_pending(self, pending_id: int, pending_data: Dict):
+        self._execute(f'''
+            UPDATE pending_inspections
+            SET {", ".join(f"{key}=?" for key in PENDING_FIELDS)}
+            WHERE id=?
+        ''', tuple(pending_data[key] for key in PENDING_FIELDS) + (pending_id,))
+
+    def complete_pending(self, pending_id: int):
+        self._execute("UPDATE pending_inspections SET status = 'completed' WHERE id = ?", (pending_id,))
+
+    def delete_pending(self, pending_id: int):
+        self._execute('DELETE FROM pending_inspections WHERE id = ?', (pending_id,))
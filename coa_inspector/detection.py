@@ -0,0 +1,432 @@
+"""Hardware detection that runs without any GUI
+
+HardwareDetector owns the platform probes (CIM through the PowerShell
+worker on Windows, sysfs on Linux, the registry, psutil) and assembles
+them into the detected specs dictionary that the inspection window, the
+command-line interface and saved inspections all share.
+"""
+import copy
+import platform
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import psutil
+
+from coa_inspector.cim import (CIM_EXTRAS, STATIC_CIM_QUERIES, VOLATILE_CIM_QUERIES, CimSnapshot,
+                               collect_cim_snapshot,
+                               parse_bios_info, parse_system_serial, parse_ram_details, parse_storage_info,
+                               parse_graphics_info, parse_display_info,
+                               parse_peripheral_devices, parse_warranty_info)
+from coa_inspector.connectivity import check_connectivity, load_targets, DEFAULT_BUDGET
+from coa_inspector.linux_probes import LinuxProbes
+from coa_inspector.probe_cache import ProbeCache, machine_fingerprint
+from coa_inspector.probes import Probe, ProbeEngine, ProbeResult, PROBE_OK, PROBE_CANCELLED
+from coa_inspector.registry import RegistryProbes
+from coa_inspector.shell_worker import ShellWorker, ShellWorkerError, powershell_worker_command
+from coa_inspector.storage import volume_usage, partition_storage_info
+
+# Order in which detected categories are shown and stored
+SPEC_CATEGORIES = ['CPU', 'RAM', 'Storage', 'Graphics', 'Display', 'Network',
+                   'Peripherals', 'Battery', 'System', 'BIOS', 'Warranty', 'Detection']
+
+# Receives (probe, duration, outcome, timed_out) rows and the laptop model
+MetricsRecorder = Callable[[List[Tuple[str, float, str, bool]], str], None]
+
+
+class HardwareDetector:
+    """Run every hardware probe and build the detected specs dictionary"""
+
+    def __init__(self, data_dir: Union[str, Path] = '.', record_metrics: Optional[MetricsRecorder] = None):
+        data_dir = Path(data_dir)
+        self.record_metrics = record_metrics
+        self.probe_engine = ProbeEngine()
+        self.linux_probes = LinuxProbes()
+        self.registry_probes = RegistryProbes()
+
+        # Long-lived PowerShell worker that runs the batched CIM query, so
+        # detections after the first do not pay PowerShell's cold start
+        self.shell_worker = ShellWorker(powershell_worker_command())
+        self.cim_executor = self.shell_worker
+
+        # Static probe results (BIOS, serial, GPU, ...) reused while the
+        # machine has not been rebooted
+        self.probe_cache = ProbeCache(data_dir / "probe_cache.json")
+
+        # Bench networks can list their own targets in connectivity_targets.json
+        self.connectivity_targets = data_dir / "connectivity_targets.json"
+
+    def start(self):
+        """Warm up the PowerShell worker ahead of the first detection"""
+        if platform.system() == "Windows":
+            try:
+                self.shell_worker.start()
+            except ShellWorkerError as e:
+                print(f"Error starting PowerShell worker: {e}", file=sys.stderr)
+
+    def stop(self):
+        self.shell_worker.stop()
+
+    def build_probes(self) -> List[Probe]:
+        """Probes for the slow detection helpers"""
+        # The Windows helpers parse two batched CIM snapshots instead of
+        # spawning their own wmic. Static probes read only 'Static CIM', so
+        # when they all come from the probe cache that query is skipped.
+        cim_deps = ('CIM',)
+        static_cim_deps = ('Static CIM',)
+        return [
+            Probe('CIM', self.collect_cim, timeout=60, default=CimSnapshot()),
+            Probe('Static CIM', self.collect_static_cim, timeout=60, default=CimSnapshot()),
+            Probe('RAM Details', self.get_ram_details, timeout=5,
+                  depends_on=static_cim_deps, default={}, static=True),
+            Probe('Storage', self.get_storage_info, timeout=15,
+                  depends_on=cim_deps, default={}),
+            Probe('Graphics', self.get_graphics_info, timeout=5,
+                  depends_on=static_cim_deps, default={}, static=True),
+            Probe('Display', self.get_display_info, timeout=5,
+                  depends_on=cim_deps, default={}),
+            Probe('Network', self.get_network_info, timeout=10, default={}),
+            Probe('Connectivity', self.test_network_connectivity, timeout=DEFAULT_BUDGET + 2,
+                  default="Internet: Test Failed"),
+            Probe('Peripherals', self.get_peripheral_devices, timeout=5,
+                  depends_on=cim_deps, default={}),
+            Probe('Battery', self.get_battery_info, timeout=10,
+                  default={'Status': 'Battery info unavailable'}),
+            Probe('System Serial', self.get_system_serial_number, timeout=5,
+                  depends_on=static_cim_deps, default="Not available", static=True),
+            Probe('BIOS', self.get_bios_info, timeout=5,
+                  depends_on=static_cim_deps, default={}, static=True),
+            Probe('Warranty', self.get_warranty_info, timeout=5,
+                  depends_on=('System Serial', 'Static CIM'), default={}, static=True),
+        ]
+
+    def collect_specs(self, on_category=None, on_progress=None,
+                      cancel_event: Optional[threading.Event] = None,
+                      force_full: bool = False, laptop_model: str = "") -> Dict:
+        """Enhanced hardware detection with comprehensive system information
+
+        Safe to run on a worker thread. on_category(category, details)
+        is called as each category becomes available and on_progress(done,
+        total, probe_name) after every probe. Static probes are served from
+        the probe cache unless force_full is set. Probe timings are recorded
+        under laptop_model, or the detected model when it is empty.
+        """
+        specs = {}
+        detection_started = time.perf_counter()
+
+        self.probe_cache.bind(machine_fingerprint(self.get_quick_serial()))
+        if force_full:
+            self.probe_cache.clear()
+
+        def publish(category):
+            if on_category:
+                on_category(category, copy.deepcopy(specs[category]))
+
+        # CPU Information
+        cpu_freq = psutil.cpu_freq()
+        cpu_name = self.probe_cache.get('CPU Name')
+        if cpu_name is None:
+            cpu_name = self.get_cpu_name()
+            self.probe_cache.put('CPU Name', cpu_name)
+        specs['CPU'] = {
+            'Name': cpu_name,
+            'Cores': psutil.cpu_count(logical=False),
+            'Threads': psutil.cpu_count(logical=True),
+            'Max Frequency': f"{cpu_freq.max:.2f} MHz" if cpu_freq else "N/A",
+            'Current Frequency': f"{cpu_freq.current:.2f} MHz" if cpu_freq else "N/A"
+        }
+        publish('CPU')
+
+        # RAM Information with details
+        memory = psutil.virtual_memory()
+        specs['RAM'] = {
+            'Total': f"{memory.total // (1024**3)} GB",
+            'Available': f"{memory.available // (1024**3)} GB",
+            'Used': f"{memory.used // (1024**3)} GB",
+            'Usage Percent': f"{memory.percent}%"
+        }
+        publish('RAM')
+
+        # System Information (published once the serial probe finishes)
+        specs['System'] = {
+            'OS': f"{platform.system()} {platform.version()}",
+            'Architecture': platform.architecture()[0],
+            'Hostname': platform.node(),
+            'System Serial': "Not available"
+        }
+
+        probes = self.build_probes()
+        done = 0
+
+        def apply_result(result: ProbeResult):
+            nonlocal done
+            done += 1
+            category = self.apply_probe_result(specs, result)
+            if category:
+                publish(category)
+            if on_progress:
+                on_progress(done, len(probes), result.name)
+
+        results = self.probe_engine.run(probes, on_result=apply_result, cancel_event=cancel_event,
+                                        cache=self.probe_cache)
+
+        # Per-probe status so slow or failed queries are visible in the report
+        specs['Detection'] = {name: result.summary() for name, result in results.items()}
+
+        # Cached results took no time and would skew the timing statistics
+        model = laptop_model or specs.get('Warranty', {}).get('Model', '')
+        metrics = [(result.name, result.duration, result.status, result.timed_out)
+                   for result in results.values() if not result.cached]
+        metrics.append(('Detection (total)', time.perf_counter() - detection_started,
+                        PROBE_CANCELLED if cancel_event is not None and cancel_event.is_set() else PROBE_OK,
+                        False))
+        if self.record_metrics:
+            self.record_metrics(metrics, model)
+
+        return {category: specs[category] for category in SPEC_CATEGORIES if category in specs}
+
+    def apply_probe_result(self, specs: Dict, result: ProbeResult) -> Optional[str]:
+        """Merge one probe result into specs and return the category it updated"""
+        value = self.probe_value(result)
+        if result.name in ('CIM', 'Static CIM'):
+            return None
+        if result.name == 'RAM Details':
+            specs['RAM'].update(value)
+            return 'RAM'
+        if result.name == 'Network':
+            # Connectivity may have finished first
+            connectivity = specs.get('Network', {}).get('Connectivity_Test')
+            specs['Network'] = value
+            if connectivity is not None:
+                specs['Network']['Connectivity_Test'] = connectivity
+            return 'Network'
+        if result.name == 'Connectivity':
+            specs.setdefault('Network', {})['Connectivity_Test'] = value
+            return 'Network'
+        if result.name == 'System Serial':
+            specs['System']['System Serial'] = value
+            return 'System'
+        specs[result.name] = value
+        return result.name
+
+    def get_cpu_name(self) -> str:
+        """Get the processor brand string (e.g. 'Intel(R) Core(TM) i5-1235U')"""
+        try:
+            if platform.system() == "Windows":
+                # platform.processor() only gives 'Intel64 Family 6 Model ...'
+                name = self.registry_probes.cpu_name()
+                if name:
+                    return name
+            elif platform.system() == "Linux":
+                return self.linux_probes.cpu_name()
+        except Exception as e:
+            print(f"Error reading CPU name: {e}", file=sys.stderr)
+        return platform.processor()
+
+    def get_quick_serial(self) -> str:
+        """Machine identity that can be read without WMI, for the probe cache"""
+        try:
+            if platform.system() == "Windows":
+                # The BIOS serial needs CIM; the registry SMBIOS identity is instant
+                return " ".join(self.registry_probes.system_info().values())
+            elif platform.system() == "Linux":
+                return self.linux_probes.system_serial()
+        except Exception as e:
+            print(f"Error reading machine identity: {e}", file=sys.stderr)
+        return ""
+
+    def get_storage_info(self, cim: Optional[CimSnapshot] = None):
+        """Get physical disks with the volumes on each, without touching network or empty drives"""
+        volumes = volume_usage()
+        if platform.system() == "Linux":
+            return self.linux_probes.storage_info(volumes)
+        if platform.system() == "Windows" and cim:
+            storage_info = parse_storage_info(cim, volumes)
+            if storage_info:
+                return storage_info
+
+        # Physical disks could not be enumerated; list the volumes instead
+        return partition_storage_info(volumes)
+
+    def probe_value(self, result: ProbeResult):
+        """Return a probe's value, noting the failure reason on dict results"""
+        value = result.value
+        if isinstance(value, dict):
+            value = dict(value)
+            if not result.ok:
+                value['Error'] = f"{result.name} probe {result.status}: {result.error}"
+        return value
+
+    def collect_cim(self) -> CimSnapshot:
+        """Fetch the volatile CIM classes and storage/screen extras in one PowerShell call"""
+        if platform.system() != "Windows":
+            return CimSnapshot()
+        return collect_cim_snapshot(self.cim_executor, queries=VOLATILE_CIM_QUERIES, extras=CIM_EXTRAS)
+
+    def collect_static_cim(self) -> CimSnapshot:
+        """Fetch the CIM classes that cannot change without a reboot (BIOS, memory, GPU, ...)"""
+        if platform.system() != "Windows":
+            return CimSnapshot()
+        return collect_cim_snapshot(self.cim_executor, queries=STATIC_CIM_QUERIES, extras={})
+
+    def get_graphics_info(self, cim: Optional[CimSnapshot] = None):
+        """Get graphics card information"""
+        try:
+            if platform.system() == "Windows":
+                return parse_graphics_info(cim if cim is not None else self.collect_static_cim())
+            if platform.system() == "Linux":
+                return self.linux_probes.graphics_info()
+            return {'Cards': ["Graphics detection available on Windows and Linux only"]}
+        except Exception as e:
+            return {'Error': f"Could not detect graphics cards: {str(e)}"}
+
+    def get_network_info(self):
+        """Get network adapter information"""
+        if platform.system() == "Linux":
+            return self.linux_probes.network_info()
+
+        network_info = {}
+        addrs = psutil.net_if_addrs()
+        stats = psutil.net_if_stats()
+
+        for interface, addresses in addrs.items():
+            for addr in addresses:
+                if addr.family == 2:  # IPv4
+                    network_info[interface] = {
+                        'IP Address': addr.address,
+                        'Netmask': addr.netmask,
+                        'Status': 'Up' if interface in stats and stats[interface].isup else 'Down'
+                    }
+                    break  # Only show first IPv4 address per interface
+
+        return network_info
+
+    def get_battery_info(self):
+        """Get battery information if available"""
+        try:
+            if platform.system() == "Linux":
+                return self.linux_probes.battery_info()
+            battery = psutil.sensors_battery()
+            if battery:
+                return {
+                    'Percent': f"{battery.percent}%",
+                    'Power Plugged': "Yes" if battery.power_plugged else "No",
+                    'Time Left': f"{battery.secsleft // 3600}h {(battery.secsleft % 3600) // 60}m" if battery.secsleft != psutil.POWER_TIME_UNLIMITED else "Unknown"
+                }
+            else:
+                return {'Status': 'No battery detected'}
+        except:
+            return {'Status': 'Battery info unavailable'}
+
+    def get_bios_info(self, cim: Optional[CimSnapshot] = None):
+        """Get comprehensive BIOS information"""
+        try:
+            if platform.system() == "Windows":
+                bios_info = parse_bios_info(cim if cim is not None else self.collect_static_cim())
+                # Version, vendor and date are cached in the registry; only
+                # the serial number has to come from the CIM snapshot
+                registry_bios = self.registry_probes.bios_info()
+                if registry_bios:
+                    bios_info.pop('Error', None)
+                    bios_info.setdefault('Serial Number', "Not available")
+                    bios_info.update(registry_bios)
+                return bios_info
+            if platform.system() == "Linux":
+                return self.linux_probes.bios_info()
+            return {'Info': 'BIOS info available on Windows and Linux only'}
+        except Exception as e:
+            return {'Error': f'Could not retrieve BIOS info: {str(e)}'}
+
+    def get_system_serial_number(self, cim: Optional[CimSnapshot] = None):
+        """Get system serial number from the BIOS, product and enclosure records"""
+        try:
+            if platform.system() == "Windows":
+                return parse_system_serial(cim if cim is not None else self.collect_static_cim())
+            if platform.system() == "Linux":
+                return self.linux_probes.system_serial()
+            return "Windows and Linux only"
+        except:
+            return "Error retrieving"
+
+    def test_network_connectivity(self):
+        """Test basic network connectivity with concurrent TCP and DNS checks"""
+        try:
+            tcp_targets, dns_names = load_targets(self.connectivity_targets)
+            return check_connectivity(tcp_targets, dns_names).as_dict()
+        except Exception as e:
+            print(f"Error testing connectivity: {e}", file=sys.stderr)
+            return "Internet: Test Failed"
+
+    def get_ram_details(self, cim: Optional[CimSnapshot] = None) -> Dict:
+        """Get detailed RAM information including type and speed"""
+        try:
+            if platform.system() == "Windows":
+                return parse_ram_details(cim if cim is not None else self.collect_static_cim())
+            if platform.system() == "Linux":
+                return self.linux_probes.ram_details()
+        except Exception as e:
+            return {'Details': f"Could not retrieve RAM details: {str(e)}"}
+        return {}
+
+    def get_display_info(self, cim: Optional[CimSnapshot] = None) -> Dict:
+        """Get display/monitor information"""
+        try:
+            if platform.system() == "Windows":
+                return parse_display_info(cim if cim is not None else self.collect_cim())
+            if platform.system() == "Linux":
+                return self.linux_probes.display_info()
+        except Exception as e:
+            return {'Error': f"Could not detect display: {str(e)}"}
+        return {'Info': 'Display detection unavailable'}
+
+    def get_peripheral_devices(self, cim: Optional[CimSnapshot] = None) -> Dict:
+        """Detect peripheral devices (webcam, audio, USB devices)"""
+        try:
+            if platform.system() == "Windows":
+                return parse_peripheral_devices(cim if cim is not None else self.collect_cim())
+            if platform.system() == "Linux":
+                return self.linux_probes.peripheral_devices()
+        except Exception as e:
+            return {'Error': f"Could not detect peripherals: {str(e)}"}
+        return {'Info': 'Peripheral detection unavailable'}
+
+    def get_warranty_info(self, serial_number: str, cim: Optional[CimSnapshot] = None) -> Dict:
+        """Get warranty information (basic implementation)"""
+        try:
+            if platform.system() == "Windows":
+                warranty_info = parse_warranty_info(cim if cim is not None else self.collect_static_cim(),
+                                                    serial_number)
+                warranty_info.update(self.registry_probes.system_info())
+                return warranty_info
+            if platform.system() == "Linux":
+                return self.linux_probes.warranty_info(serial_number)
+        except Exception as e:
+            return {'Error': f"Could not retrieve warranty info: {str(e)}"}
+        return {'Info': 'Warranty info unavailable'}
+
+
+def format_specs(specs: Dict) -> str:
+    """Plain-text rendering of the detected specs, as shown in the inspection window"""
+    display_text = "=== LAPTOP HARDWARE SPECIFICATIONS ===\n\n"
+
+    for category, details in specs.items():
+        display_text += f"{category}:\n"
+        if isinstance(details, dict):
+            for key, value in details.items():
+                if isinstance(value, (list, dict)):
+                    display_text += f"  {key}:\n"
+                    if isinstance(value, list):
+                        for item in value:
+                            display_text += f"    - {item}\n"
+                    else:
+                        for subkey, subvalue in value.items():
+                            if isinstance(subvalue, list):
+                                subvalue = ", ".join(str(item) for item in subvalue)
+                            display_text += f"    {subkey}: {subvalue}\n"
+                else:
+                    display_text += f"  {key}: {value}\n"
+        display_text += "\n"
+
+    return display_text
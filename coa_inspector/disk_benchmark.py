@@ -0,0 +1,403 @@
+"""Disk benchmark that measures the drive instead of the OS file cache
+
+The old test wrote 5 MB and read it straight back, which only timed the
+page cache. Here the test file is opened with O_DIRECT (Linux) or
+FILE_FLAG_NO_BUFFERING (Windows) so every read and write reaches the
+device; on filesystems that refuse direct I/O the file is fsync'ed and its
+cached pages are dropped before reading. Sequential throughput uses 1 MiB
+blocks, random throughput uses 4 KiB blocks at several queue depths, each
+queue slot being a thread with its own file handle. Every pass is repeated
+through the benchmark harness; sequential passes are capped at
+SEQUENTIAL_REPETITIONS because each one moves the whole test file.
+
+benchmark_targets() lists the writable local volumes with the drive each
+one is on, so the laptop's own disks are tested rather than whatever
+volume the application was started from (often the USB stick), and
+run_disk_benchmarks() tests the chosen ones one after another or at once.
+"""
+import io
+import mmap
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import psutil
+
+from coa_inspector.harness import BenchmarkHarness, format_spread
+from coa_inspector.storage import volume_usage
+
+# Block sizes; both are multiples of the 4 KiB sector alignment direct I/O needs
+SEQUENTIAL_BLOCK = 1024**2
+RANDOM_BLOCK = 4096
+
+DEFAULT_FILE_SIZE = 256 * 1024**2
+DEFAULT_QUEUE_DEPTHS = (1, 4, 16)
+
+# Seconds each random read/write test runs at every queue depth, split
+# across the harness repetitions
+DEFAULT_RANDOM_DURATION = 3.0
+SEQUENTIAL_REPETITIONS = 3
+
+TEST_FILE_NAME = "coa_disk_benchmark.tmp"
+
+# How the OS cache was kept out of the measurement
+BYPASS_DIRECT = "direct I/O"
+BYPASS_DROPPED = "cache dropped before reads"
+BYPASS_NONE = "none (results include OS caching)"
+
+
+@dataclass
+class DiskBenchmarkResult:
+    """Median throughput of one volume; IOPS are keyed by queue depth"""
+    path: str
+    file_size: int
+    cache_bypass: str
+    drive: str = ""
+    removable: bool = False
+    sequential_write_mbps: float = 0.0
+    sequential_read_mbps: float = 0.0
+    random_read_iops: Dict[int, float] = field(default_factory=dict)
+    random_write_iops: Dict[int, float] = field(default_factory=dict)
+    # Measurement.as_dict() for each figure above
+    sequential_write_stats: Dict = field(default_factory=dict)
+    sequential_read_stats: Dict = field(default_factory=dict)
+    random_read_stats: Dict[int, Dict] = field(default_factory=dict)
+    random_write_stats: Dict[int, Dict] = field(default_factory=dict)
+    cancelled: bool = False
+
+    def as_dict(self) -> Dict:
+        return asdict(self)
+
+
+def _aligned_buffer(size: int, fill: bool = False) -> mmap.mmap:
+    """Page-aligned buffer, as direct I/O requires; filled with random bytes so compression cannot help"""
+    buffer = mmap.mmap(-1, size)
+    if fill:
+        buffer.write(os.urandom(size))
+    return buffer
+
+
+def _open_no_buffering(path: Path, write: bool, create: bool) -> io.FileIO:
+    """Open with FILE_FLAG_NO_BUFFERING | FILE_FLAG_WRITE_THROUGH on Windows"""
+    import ctypes
+    import msvcrt
+    from ctypes import wintypes
+
+    GENERIC_READ, GENERIC_WRITE = 0x80000000, 0x40000000
+    FILE_SHARE_READ, FILE_SHARE_WRITE = 0x1, 0x2
+    CREATE_ALWAYS, OPEN_EXISTING = 2, 3
+    FILE_FLAG_NO_BUFFERING, FILE_FLAG_WRITE_THROUGH = 0x20000000, 0x80000000
+
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.CreateFileW.restype = wintypes.HANDLE
+    kernel32.CreateFileW.argtypes = [wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+                                     wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE]
+    handle = kernel32.CreateFileW(str(path), GENERIC_READ | (GENERIC_WRITE if write else 0),
+                                  FILE_SHARE_READ | FILE_SHARE_WRITE, None,
+                                  CREATE_ALWAYS if create else OPEN_EXISTING,
+                                  FILE_FLAG_NO_BUFFERING | FILE_FLAG_WRITE_THROUGH, None)
+    if handle in (None, ctypes.c_void_p(-1).value):
+        raise ctypes.WinError(ctypes.get_last_error())
+    fd = msvcrt.open_osfhandle(handle, os.O_BINARY | (0 if write else os.O_RDONLY))
+    return io.FileIO(fd, 'r+' if write else 'r')
+
+
+def open_uncached(path: Union[str, Path], write: bool = False, create: bool = False) -> Tuple[io.FileIO, bool]:
+    """Open path bypassing the OS file cache where possible
+
+    Returns the unbuffered file and whether direct I/O is in effect.
+    """
+    path = Path(path)
+    if sys.platform == 'win32':
+        try:
+            return _open_no_buffering(path, write, create), True
+        except OSError:
+            pass
+    elif hasattr(os, 'O_DIRECT'):
+        flags = (os.O_RDWR if write else os.O_RDONLY) | os.O_DIRECT
+        if create:
+            flags |= os.O_CREAT | os.O_TRUNC
+        try:
+            return io.FileIO(os.open(path, flags, 0o600), 'r+' if write else 'r'), True
+        except OSError:
+            pass  # tmpfs and some FUSE filesystems refuse O_DIRECT
+    mode = 'w+' if create else 'r+' if write else 'r'
+    return io.FileIO(path, mode), False
+
+
+def drop_cache(path: Union[str, Path]):
+    """Evict the cached pages of a flushed file where the OS supports it (Linux)"""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def _cancelled(cancel_event: Optional[threading.Event]) -> bool:
+    return cancel_event is not None and cancel_event.is_set()
+
+
+def sequential_write(path: Path, size: int, cancel_event: Optional[threading.Event] = None) -> Tuple[int, bool]:
+    """Create the test file; returns bytes written (fsync'ed) and whether direct I/O was used"""
+    buffer = _aligned_buffer(SEQUENTIAL_BLOCK, fill=True)
+    test_file, direct = open_uncached(path, write=True, create=True)
+    written = 0
+    with test_file:
+        while written < size and not _cancelled(cancel_event):
+            written += test_file.write(buffer)
+        os.fsync(test_file.fileno())
+    return written, direct
+
+
+def sequential_read(path: Path, cancel_event: Optional[threading.Event] = None) -> int:
+    """Read the whole test file in large blocks; returns bytes read"""
+    buffer = _aligned_buffer(SEQUENTIAL_BLOCK)
+    test_file, _ = open_uncached(path)
+    total = 0
+    with test_file:
+        while not _cancelled(cancel_event):
+            count = test_file.readinto(buffer)
+            if not count:
+                break
+            total += count
+    return total
+
+
+def random_io(path: Path, size: int, queue_depth: int, duration: float, write: bool = False,
+              cancel_event: Optional[threading.Event] = None) -> int:
+    """4 KiB random reads or writes with queue_depth requests in flight; returns the operations done"""
+    blocks = size // RANDOM_BLOCK
+    deadline = time.perf_counter() + duration
+
+    def worker(seed: int) -> int:
+        rng = random.Random(seed)
+        buffer = _aligned_buffer(RANDOM_BLOCK, fill=write)
+        test_file, _ = open_uncached(path, write=write)
+        operations = 0
+        with test_file:
+            while time.perf_counter() < deadline and not _cancelled(cancel_event):
+                test_file.seek(rng.randrange(blocks) * RANDOM_BLOCK)
+                if write:
+                    test_file.write(buffer)
+                else:
+                    test_file.readinto(buffer)
+                operations += 1
+            if write:
+                os.fsync(test_file.fileno())
+        return operations
+
+    with ThreadPoolExecutor(max_workers=queue_depth, thread_name_prefix="disk-bench") as pool:
+        return sum(pool.map(worker, range(queue_depth)))
+
+
+def run_disk_benchmark(directory: Union[str, Path] = ".", file_size: int = DEFAULT_FILE_SIZE,
+                       queue_depths: Sequence[int] = DEFAULT_QUEUE_DEPTHS,
+                       duration: float = DEFAULT_RANDOM_DURATION,
+                       harness: Optional[BenchmarkHarness] = None,
+                       on_progress: Optional[Callable[[str], None]] = None,
+                       cancel_event: Optional[threading.Event] = None) -> DiskBenchmarkResult:
+    """Benchmark the volume holding directory with a file_size test file
+
+    Raises OSError when the volume does not have room for the test file.
+    """
+    directory = Path(directory)
+    file_size = max(SEQUENTIAL_BLOCK, file_size // SEQUENTIAL_BLOCK * SEQUENTIAL_BLOCK)
+    free = psutil.disk_usage(str(directory)).free
+    if free < file_size + 64 * 1024**2:
+        raise OSError(f"Not enough free space on {directory} for a {file_size // 1024**2} MB test file")
+
+    def progress(message: str):
+        if on_progress is not None:
+            on_progress(message)
+
+    harness = harness or BenchmarkHarness()
+    sequential_harness = replace(harness, repetitions=min(harness.repetitions, SEQUENTIAL_REPETITIONS))
+    random_duration = duration / harness.repetitions
+    path = directory / TEST_FILE_NAME
+    result = DiskBenchmarkResult(str(directory.resolve()), file_size, BYPASS_NONE)
+    name = f"Disk {result.path}"
+    direct = False
+
+    def write_pass() -> int:
+        nonlocal direct
+        written, direct = sequential_write(path, file_size, cancel_event)
+        return written
+
+    def uncache():
+        if not direct:
+            drop_cache(path)
+
+    try:
+        progress(f"{name}: sequential write ({file_size // 1024**2} MB)")
+        measurement = sequential_harness.run(write_pass, "MB/s", scale=1e-6, cancel_event=cancel_event)
+        if not path.exists() or _cancelled(cancel_event):
+            return result
+        result.sequential_write_mbps = measurement.median
+        result.sequential_write_stats = measurement.as_dict()
+        if direct:
+            result.cache_bypass = BYPASS_DIRECT
+        elif hasattr(os, 'posix_fadvise'):
+            result.cache_bypass = BYPASS_DROPPED
+
+        progress(f"{name}: sequential read")
+        measurement = sequential_harness.run(lambda: sequential_read(path, cancel_event), "MB/s", scale=1e-6,
+                                             setup=uncache, cancel_event=cancel_event)
+        result.sequential_read_mbps = measurement.median
+        result.sequential_read_stats = measurement.as_dict()
+
+        for write, iops, stats in ((False, result.random_read_iops, result.random_read_stats),
+                                   (True, result.random_write_iops, result.random_write_stats)):
+            for queue_depth in queue_depths:
+                if _cancelled(cancel_event):
+                    break
+                progress(f"{name}: random 4K {'write' if write else 'read'}, queue depth {queue_depth}")
+                measurement = harness.run(
+                    lambda: random_io(path, file_size, queue_depth, random_duration, write, cancel_event),
+                    "IOPS", setup=None if write else uncache, cancel_event=cancel_event)
+                if measurement.values:
+                    iops[queue_depth] = measurement.median
+                    stats[queue_depth] = measurement.as_dict()
+    finally:
+        result.cancelled = _cancelled(cancel_event)
+        try:
+            path.unlink()
+        except OSError:
+            pass
+    return result
+
+
+def _same_volume(directory: str, mount: str) -> bool:
+    try:
+        return os.stat(directory).st_dev == os.stat(mount).st_dev
+    except OSError:
+        return False
+
+
+def benchmark_directory(mount: str) -> Optional[str]:
+    """A writable directory on the volume mounted at mount
+
+    The temp or home directory when it lives on that volume, since standard
+    users cannot create files in the root of the Windows system drive;
+    otherwise the volume root. None when nothing there is writable.
+    """
+    for candidate in (tempfile.gettempdir(), str(Path.home()), mount):
+        if _same_volume(candidate, mount) and os.access(candidate, os.W_OK):
+            return candidate
+    return None
+
+
+def _drive_of(mount: str, storage_info: Dict) -> Dict:
+    """The get_storage_info() drive whose Volumes list includes mount"""
+    for drive in storage_info.values():
+        if isinstance(drive, dict) and any(entry.startswith(f"{mount} ") for entry in drive.get('Volumes', [])):
+            return drive
+    return {}
+
+
+def benchmark_targets(storage_info: Optional[Dict] = None, volumes: Optional[List[Dict]] = None) -> List[Dict]:
+    """Writable local volumes that can be benchmarked, internal drives first
+
+    storage_info is the detected Storage specs, used to name the drive each
+    volume is on. Each target has Label, Mount, Directory, Drive, Removable,
+    Free and Default; Default marks the volume with the most free space on
+    each internal drive, which is what a plain run tests.
+    """
+    volumes = volume_usage() if volumes is None else volumes
+    storage_info = storage_info or {}
+    targets = []
+    devices = set()
+    for volume in volumes:
+        if 'Skipped' in volume or volume['Kind'] not in ("fixed", "removable"):
+            continue
+        directory = benchmark_directory(volume['Mount'])
+        if directory is None or os.stat(directory).st_dev in devices:
+            continue  # Bind mounts would otherwise test one volume twice
+        devices.add(os.stat(directory).st_dev)
+        drive = _drive_of(volume['Mount'], storage_info)
+        drive_name = ", ".join(drive[key] for key in ('Model', 'Media')
+                               if drive.get(key) not in (None, "", "Unknown")) or volume['Device']
+        targets.append({
+            'Label': f"{volume['Mount']} ({drive_name})",
+            'Mount': volume['Mount'],
+            'Directory': directory,
+            'Drive': drive.get('Device', volume['Device']),
+            'Removable': volume['Kind'] == "removable" or drive.get('Removable') == "Yes",
+            'Free': volume['Free'],
+            'Default': False,
+        })
+    targets.sort(key=lambda target: target['Removable'])
+
+    best_on_drive = {}
+    for target in targets:
+        if not target['Removable'] and target['Free'] > best_on_drive.get(target['Drive'], {}).get('Free', -1):
+            best_on_drive[target['Drive']] = target
+    for target in best_on_drive.values():
+        target['Default'] = True
+    return targets
+
+
+def run_disk_benchmarks(targets: Sequence[Dict], file_size: int = DEFAULT_FILE_SIZE, concurrent: bool = False,
+                        harness: Optional[BenchmarkHarness] = None,
+                        on_progress: Optional[Callable[[str], None]] = None,
+                        cancel_event: Optional[threading.Event] = None) -> Dict[str, Dict]:
+    """Benchmark each benchmark_targets() entry, keyed by its Label
+
+    Concurrent runs load the drives at the same time, which shows whether
+    they share a bus or controller, and are never pinned to a CPU; a drive
+    that fails is reported as
+    {'Error': ..., 'drive': ..., 'removable': ...}.
+    """
+    def run(target: Dict) -> Dict:
+        try:
+            result = run_disk_benchmark(target['Directory'], file_size, harness=harness, on_progress=on_progress,
+                                        cancel_event=cancel_event)
+        except OSError as e:
+            return {'Error': str(e), 'drive': target['Label'], 'removable': target['Removable']}
+        result.drive = target['Label']
+        result.removable = target['Removable']
+        return result.as_dict()
+
+    if concurrent and len(targets) > 1:
+        # Pinning every drive's thread to the same core would serialize them
+        if harness is not None:
+            harness = replace(harness, cpu_affinity=None, high_priority=False)
+        with ThreadPoolExecutor(max_workers=len(targets), thread_name_prefix="disk-target") as pool:
+            return dict(zip((target['Label'] for target in targets), pool.map(run, targets)))
+
+    results = {}
+    for target in targets:
+        if _cancelled(cancel_event):
+            break
+        results[target['Label']] = run(target)
+    return results
+
+
+def format_disk_result(result: DiskBenchmarkResult) -> List[str]:
+    """Report lines such as 'Sequential Read: 1830.2 MB/s'"""
+    lines = [
+        f"Disk Test ({result.file_size // 1024**2} MB on {result.drive or result.path})",
+        f"  Sequential Write: {result.sequential_write_mbps:.1f} MB/s"
+        f"{format_spread(result.sequential_write_stats)}",
+        f"  Sequential Read: {result.sequential_read_mbps:.1f} MB/s"
+        f"{format_spread(result.sequential_read_stats)}",
+    ]
+    for queue_depth, iops in result.random_read_iops.items():
+        lines.append(f"  Random 4K Read QD{queue_depth}: {iops:,.0f} IOPS"
+                     f"{format_spread(result.random_read_stats.get(queue_depth), precision=0)}")
+    for queue_depth, iops in result.random_write_iops.items():
+        lines.append(f"  Random 4K Write QD{queue_depth}: {iops:,.0f} IOPS"
+                     f"{format_spread(result.random_write_stats.get(queue_depth), precision=0)}")
+    lines.append(f"  Cache bypass: {result.cache_bypass}")
+    if result.cancelled:
+        lines.append("  Cancelled - results are partial")
+    return lines
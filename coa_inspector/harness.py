@@ -0,0 +1,227 @@
+"""Repeatable benchmark measurements
+
+Every performance test times its work through BenchmarkHarness.run():
+untimed warmup runs, then a number of repetitions timed with
+perf_counter_ns. Repetitions outside Tukey's fences (1.5 IQR beyond the
+quartiles) are dropped as outliers, and the rest are summarized as the
+median, the interquartile range and a 95% confidence interval of the mean.
+
+The harness can also pin the benchmark to chosen CPUs and raise its
+priority while it runs. On Linux this applies to the calling thread, on
+Windows to the whole process; it is skipped where the OS refuses it (a
+higher priority needs root on Linux). Where it is process-wide, pinned
+blocks running at the same time on several threads share one pin: the
+first applies it and the last one out restores the original settings.
+"""
+import math
+import os
+import statistics
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import psutil
+
+DEFAULT_WARMUP = 1
+DEFAULT_REPETITIONS = 5
+OUTLIER_FENCE = 1.5
+
+# Two-sided 95% Student's t by degrees of freedom; larger samples use the
+# largest entry not above their degrees of freedom, which is conservative
+T_95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262,
+        10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086, 30: 2.042, 60: 2.000, 120: 1.980}
+
+
+@dataclass
+class Measurement:
+    """Summary of the repetitions of one benchmark, in its unit"""
+    unit: str = ""
+    values: List[float] = field(default_factory=list)  # kept repetitions, in run order
+    outliers: List[float] = field(default_factory=list)
+    median: float = 0.0
+    q1: float = 0.0
+    q3: float = 0.0
+    iqr: float = 0.0
+    mean: float = 0.0
+    ci_low: float = 0.0
+    ci_high: float = 0.0
+    warmup: int = 0
+
+    def as_dict(self) -> Dict:
+        return asdict(self)
+
+
+def _t_95(degrees_of_freedom: int) -> float:
+    return T_95[max(df for df in T_95 if df <= degrees_of_freedom)]
+
+
+def _quartiles(values: List[float]):
+    if len(values) < 2:
+        return values[0], values[0]
+    q1, _, q3 = statistics.quantiles(values, n=4, method='inclusive')
+    return q1, q3
+
+
+def summarize(values: List[float], unit: str = "", warmup: int = 0,
+              outlier_fence: float = OUTLIER_FENCE) -> Measurement:
+    """Drop outliers, then compute the median, IQR and 95% confidence interval"""
+    if not values:
+        return Measurement(unit=unit, warmup=warmup)
+    kept, outliers = values, []
+    if len(values) >= 4:
+        q1, q3 = _quartiles(values)
+        low, high = q1 - outlier_fence * (q3 - q1), q3 + outlier_fence * (q3 - q1)
+        kept = [value for value in values if low <= value <= high]
+        outliers = [value for value in values if not low <= value <= high]
+
+    q1, q3 = _quartiles(kept)
+    mean = statistics.fmean(kept)
+    half_width = 0.0
+    if len(kept) > 1:
+        half_width = _t_95(len(kept) - 1) * statistics.stdev(kept) / math.sqrt(len(kept))
+    return Measurement(unit=unit, values=kept, outliers=outliers, median=statistics.median(kept),
+                       q1=q1, q3=q3, iqr=q3 - q1, mean=mean, ci_low=mean - half_width,
+                       ci_high=mean + half_width, warmup=warmup)
+
+
+def format_spread(stats: Dict, precision: int = 1) -> str:
+    """' (IQR 0.2, 95% CI 5.1-5.6)' for a Measurement.as_dict()"""
+    if not stats or len(stats.get('values', [])) < 2:
+        return ""
+    text = (f" (IQR {stats['iqr']:,.{precision}f}, "
+            f"95% CI {stats['ci_low']:,.{precision}f}-{stats['ci_high']:,.{precision}f}")
+    if stats['outliers']:
+        count = len(stats['outliers'])
+        text += f", {count} outlier{'s' if count > 1 else ''} dropped"
+    return text + ")"
+
+
+def _get_affinity() -> List[int]:
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return psutil.Process().cpu_affinity()
+
+
+def _set_affinity(cpus: List[int]):
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cpus)
+    else:
+        psutil.Process().cpu_affinity(cpus)
+
+
+def _get_priority() -> int:
+    if sys.platform == 'win32':
+        return psutil.Process().nice()
+    return os.getpriority(os.PRIO_PROCESS, 0)
+
+
+def _set_priority(priority: int):
+    if sys.platform == 'win32':
+        psutil.Process().nice(priority)
+    else:
+        os.setpriority(os.PRIO_PROCESS, 0, priority)
+
+
+# Without per-thread affinity (Windows, macOS) pinning changes the whole process
+PROCESS_WIDE_PINNING = not hasattr(os, 'sched_setaffinity')
+
+
+def _restore(saved_affinity: Optional[List[int]], saved_priority: Optional[int]):
+    if saved_affinity is not None:
+        try:
+            _set_affinity(saved_affinity)
+        except (OSError, psutil.Error):
+            pass
+    if saved_priority is not None:
+        try:
+            _set_priority(saved_priority)
+        except (OSError, psutil.Error):
+            pass
+
+
+class _SharedPin:
+    """Reference count of the process-wide pin, so concurrent blocks cannot restore it out of order"""
+    lock = threading.Lock()
+    depth = 0
+    saved: tuple = (None, None)
+
+
+@dataclass
+class BenchmarkHarness:
+    """How benchmarks are repeated and where they run"""
+    warmup: int = DEFAULT_WARMUP
+    repetitions: int = DEFAULT_REPETITIONS
+    outlier_fence: float = OUTLIER_FENCE
+    cpu_affinity: Optional[List[int]] = None  # logical CPUs to pin to; None leaves scheduling alone
+    high_priority: bool = False
+
+    def _apply_pin(self):
+        """Pin as configured; returns the (affinity, priority) to restore, None for what was not changed"""
+        saved_affinity = saved_priority = None
+        if self.cpu_affinity:
+            try:
+                saved_affinity = _get_affinity()
+                _set_affinity(self.cpu_affinity)
+            except (AttributeError, OSError, psutil.Error):
+                saved_affinity = None  # not supported here, e.g. macOS
+        if self.high_priority:
+            try:
+                saved_priority = _get_priority()
+                _set_priority(psutil.HIGH_PRIORITY_CLASS if sys.platform == 'win32' else -10)
+            except (OSError, psutil.Error):
+                saved_priority = None
+        return saved_affinity, saved_priority
+
+    @contextmanager
+    def pinned(self):
+        """Apply cpu_affinity and high_priority for the duration of the block"""
+        if not (self.cpu_affinity or self.high_priority):
+            yield
+            return
+        if not PROCESS_WIDE_PINNING:
+            saved = self._apply_pin()
+            try:
+                yield
+            finally:
+                _restore(*saved)
+            return
+
+        with _SharedPin.lock:
+            if _SharedPin.depth == 0:
+                _SharedPin.saved = self._apply_pin()
+            _SharedPin.depth += 1
+        try:
+            yield
+        finally:
+            with _SharedPin.lock:
+                _SharedPin.depth -= 1
+                if _SharedPin.depth == 0:
+                    _restore(*_SharedPin.saved)
+                    _SharedPin.saved = (None, None)
+
+    def run(self, benchmark: Callable[[], float], unit: str, scale: float = 1.0, rate: bool = True,
+            setup: Optional[Callable[[], None]] = None,
+            cancel_event: Optional[threading.Event] = None) -> Measurement:
+        """Time benchmark, which returns the amount of work it did
+
+        Each repetition is reported as work per second times scale, or with
+        rate=False as seconds per unit of work times scale (latencies).
+        setup runs untimed before every warmup and timed repetition.
+        """
+        values = []
+        with self.pinned():
+            for repetition in range(self.warmup + self.repetitions):
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                if setup is not None:
+                    setup()
+                started = time.perf_counter_ns()
+                work = benchmark()
+                elapsed = (time.perf_counter_ns() - started) / 1e9
+                if repetition < self.warmup or not work or not elapsed:
+                    continue
+                values.append(work / elapsed * scale if rate else elapsed / work * scale)
+        return summarize(values, unit, self.warmup, self.outlier_fence)
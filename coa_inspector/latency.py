@@ -0,0 +1,256 @@
+"""Latency, jitter and loss probes for the network test dialog
+
+The connectivity check in hardware detection makes one attempt per target.
+This suite repeats the attempts: every TCP target is connected to and
+every DNS name looked up a number of times, all targets at once on a
+private asyncio loop, and each target is summarized as min/avg/p95
+latency, jitter (mean difference between consecutive round trips) and
+loss (attempts that failed or timed out).
+
+Targets come from connectivity_targets.json, the same file the
+connectivity check reads. DNS names go through the system resolver, which
+answers repeats from its cache; listing servers under "dns_servers" sends
+each lookup as a UDP query straight to those servers instead, which
+measures the server and lets a local stand-in answer the queries:
+
+    {"tcp": ["192.168.1.1:80"], "dns": ["intranet.local"],
+     "dns_servers": ["192.168.1.1:53"]}
+"""
+import asyncio
+import json
+import math
+import random
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from coa_inspector.connectivity import (TargetResult, check_dns, check_tcp, load_targets,
+                                        parse_host_port)
+
+DEFAULT_ROUNDS = 10
+DEFAULT_INTERVAL = 0.2
+DEFAULT_TIMEOUT = 2.0
+
+# A target losing more than this share of its attempts is reported as lossy
+LOSS_WARNING_PERCENT = 10.0
+
+DNS_TYPE_A = 1
+DNS_CLASS_IN = 1
+
+
+@dataclass
+class ProbeStats:
+    """Latency statistics of the attempts made so far against one target"""
+    kind: str  # "TCP" or "DNS"
+    target: str
+    sent: int = 0
+    received: int = 0
+    min_ms: Optional[float] = None
+    avg_ms: Optional[float] = None
+    p95_ms: Optional[float] = None
+    jitter_ms: Optional[float] = None
+    loss_percent: float = 0.0
+    last_error: str = ""
+    latencies_ms: List[Optional[float]] = field(default_factory=list)  # None for a lost attempt
+
+    @property
+    def label(self) -> str:
+        return f"{self.kind} {self.target}"
+
+    def as_dict(self) -> Dict:
+        return asdict(self)
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+
+def latency_stats(kind: str, target: str, latencies: List[Optional[float]],
+                  last_error: str = "") -> ProbeStats:
+    """Summarize round trips in milliseconds, None marking a lost attempt
+
+    Jitter is the mean absolute difference between consecutive successful
+    round trips.
+    """
+    received = [latency for latency in latencies if latency is not None]
+    stats = ProbeStats(kind, target, sent=len(latencies), received=len(received), last_error=last_error,
+                       latencies_ms=[None if latency is None else round(latency, 3) for latency in latencies])
+    if latencies:
+        stats.loss_percent = round((1 - len(received) / len(latencies)) * 100, 1)
+    if received:
+        ordered = sorted(received)
+        stats.min_ms = ordered[0]
+        stats.avg_ms = sum(received) / len(received)
+        stats.p95_ms = _percentile(ordered, 95)
+        differences = [abs(b - a) for a, b in zip(received, received[1:])]
+        stats.jitter_ms = sum(differences) / len(differences) if differences else 0.0
+    return stats
+
+
+@dataclass
+class LatencyReport:
+    """Statistics for every target of one probe suite run"""
+    rounds: int = 0
+    interval: float = 0.0
+    targets: List[ProbeStats] = field(default_factory=list)
+    duration: float = 0.0
+    cancelled: bool = False
+
+    def as_dict(self) -> Dict:
+        return asdict(self)
+
+
+def load_probe_targets(path: Union[str, Path]) -> Tuple[List[Tuple[str, int]], List[str], List[Tuple[str, int]]]:
+    """(tcp targets, dns names, dns servers) from connectivity_targets.json
+
+    dns servers is empty, meaning the system resolver, unless the file
+    lists "dns_servers".
+    """
+    tcp_targets, dns_names = load_targets(path)
+    path = Path(path)
+    if not path.exists():
+        return tcp_targets, dns_names, []
+    data = json.loads(path.read_text(encoding='utf-8'))
+    dns_servers = [parse_host_port(entry, "DNS server") for entry in data.get('dns_servers', [])]
+    return tcp_targets, dns_names, dns_servers
+
+
+def dns_query(name: str, query_id: int, record_type: int = DNS_TYPE_A) -> bytes:
+    """A recursive DNS query packet for name"""
+    header = struct.pack('>HHHHHH', query_id, 0x0100, 1, 0, 0, 0)
+    question = b''.join(bytes([len(label)]) + label
+                        for label in name.rstrip('.').encode('idna').split(b'.'))
+    return header + question + b'\0' + struct.pack('>HH', record_type, DNS_CLASS_IN)
+
+
+class _DnsClient(asyncio.DatagramProtocol):
+    """Resolves the future with the first reply carrying the query id"""
+
+    def __init__(self, query_id: int, reply: asyncio.Future):
+        self.query_id = query_id
+        self.reply = reply
+
+    def datagram_received(self, data: bytes, addr):
+        if len(data) >= 12 and struct.unpack('>H', data[:2])[0] == self.query_id and not self.reply.done():
+            self.reply.set_result(data)
+
+    def error_received(self, exc: Exception):
+        if not self.reply.done():
+            self.reply.set_exception(exc)
+
+
+async def _check_dns_server(name: str, server: Tuple[str, int], timeout: float) -> TargetResult:
+    """Send one UDP query for name to server; a reply with an error code is a failure"""
+    target = f"{name} @ {server[0]}:{server[1]}"
+    loop = asyncio.get_running_loop()
+    query_id = random.randrange(1 << 16)
+    reply = loop.create_future()
+    transport = None
+    try:
+        transport, _ = await loop.create_datagram_endpoint(lambda: _DnsClient(query_id, reply),
+                                                           remote_addr=server)
+        started = time.perf_counter()
+        transport.sendto(dns_query(name, query_id))
+        data = await asyncio.wait_for(reply, timeout)
+    except asyncio.TimeoutError:
+        return TargetResult("DNS", target, False, error="timed out")
+    except OSError as e:
+        return TargetResult("DNS", target, False, error=e.strerror or type(e).__name__)
+    finally:
+        if transport is not None:
+            transport.close()
+    latency = (time.perf_counter() - started) * 1000
+    rcode = struct.unpack('>H', data[2:4])[0] & 0x000F
+    if rcode:
+        return TargetResult("DNS", target, False, error=f"server answered with error code {rcode}")
+    return TargetResult("DNS", target, True, latency)
+
+
+async def _probe_target(kind: str, target: str, attempt: Callable, rounds: int, interval: float,
+                        on_update: Optional[Callable[[ProbeStats], None]],
+                        cancel_event: threading.Event) -> ProbeStats:
+    latencies, last_error = [], ""
+    stats = latency_stats(kind, target, latencies)
+    for round_number in range(rounds):
+        if cancel_event.is_set():
+            break
+        started = time.perf_counter()
+        result = await attempt()
+        latencies.append(result.latency_ms if result.ok else None)
+        last_error = result.error or last_error
+        stats = latency_stats(kind, target, latencies, last_error)
+        if on_update is not None:
+            on_update(stats)
+        if round_number < rounds - 1:
+            await asyncio.sleep(max(0.0, interval - (time.perf_counter() - started)))
+    return stats
+
+
+async def _probe_all(tcp_targets: Sequence[Tuple[str, int]], dns_names: Sequence[str],
+                     dns_servers: Sequence[Tuple[str, int]], rounds: int, interval: float, timeout: float,
+                     on_update: Optional[Callable[[ProbeStats], None]],
+                     cancel_event: threading.Event) -> List[ProbeStats]:
+    probes = [_probe_target("TCP", f"{host}:{port}", lambda host=host, port=port: check_tcp(host, port, timeout),
+                            rounds, interval, on_update, cancel_event)
+              for host, port in tcp_targets]
+    for name in dns_names:
+        if dns_servers:
+            probes += [_probe_target("DNS", f"{name} @ {server[0]}:{server[1]}",
+                                     lambda name=name, server=server: _check_dns_server(name, server, timeout),
+                                     rounds, interval, on_update, cancel_event)
+                       for server in dns_servers]
+        else:
+            probes.append(_probe_target("DNS", name, lambda name=name: check_dns(name, timeout),
+                                        rounds, interval, on_update, cancel_event))
+    return list(await asyncio.gather(*probes))
+
+
+def run_latency_probes(tcp_targets: Sequence[Tuple[str, int]], dns_names: Sequence[str],
+                       dns_servers: Sequence[Tuple[str, int]] = (), rounds: int = DEFAULT_ROUNDS,
+                       interval: float = DEFAULT_INTERVAL, timeout: float = DEFAULT_TIMEOUT,
+                       on_update: Optional[Callable[[ProbeStats], None]] = None,
+                       cancel_event: Optional[threading.Event] = None) -> LatencyReport:
+    """Probe every target rounds times, all targets concurrently
+
+    on_update receives a target's statistics after each of its attempts, so
+    a caller can show results while the suite runs. Attempts of one target
+    start interval seconds apart; a lost attempt waits at most timeout.
+    """
+    cancel_event = cancel_event or threading.Event()
+    started = time.perf_counter()
+    # As in check_connectivity(), system resolver lookups run on threads
+    # that are not waited for when the loop closes
+    executor = ThreadPoolExecutor(max_workers=max(4, len(dns_names)), thread_name_prefix="latency")
+    loop = asyncio.new_event_loop()
+    loop.set_default_executor(executor)
+    try:
+        targets = loop.run_until_complete(_probe_all(tcp_targets, dns_names, dns_servers, rounds, interval,
+                                                     timeout, on_update, cancel_event))
+    finally:
+        executor.shutdown(wait=False)
+        loop.close()
+    return LatencyReport(rounds=rounds, interval=interval, targets=targets,
+                         duration=time.perf_counter() - started, cancelled=cancel_event.is_set())
+
+
+def format_probe_stats(stats: ProbeStats) -> str:
+    if not stats.received:
+        return f"{stats.label}: no replies ({stats.sent} sent) - {stats.last_error or 'failed'}"
+    line = (f"{stats.label}: min {stats.min_ms:.1f} / avg {stats.avg_ms:.1f} / p95 {stats.p95_ms:.1f} ms, "
+            f"jitter {stats.jitter_ms:.1f} ms, loss {stats.loss_percent:.0f}% ({stats.received}/{stats.sent})")
+    if stats.loss_percent > LOSS_WARNING_PERCENT:
+        line += f" - lossy, last error: {stats.last_error}"
+    return line
+
+
+def format_latency_report(report: LatencyReport) -> List[str]:
+    lines = [f"Latency Probes ({report.rounds} rounds, {report.interval:g}s apart, {report.duration:.1f}s)"]
+    lines += [f"  {format_probe_stats(stats)}" for stats in report.targets]
+    if report.cancelled:
+        lines.append("  Cancelled - results are partial")
+    return lines
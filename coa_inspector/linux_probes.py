@@ -0,0 +1,415 @@
+"""Native Linux hardware probes that read sysfs and procfs directly
+
+Used when the inspector runs from a Linux boot stick. Nothing here spawns
+a process: every value comes from /sys/class/dmi/id, /proc/cpuinfo,
+/sys/firmware/dmi, /sys/block, /sys/class/drm, /sys/class/power_supply,
+/sys/class/net and friends, so a full detection takes a few milliseconds.
+The probes return the same dictionaries as the Windows helpers. All paths
+are resolved under a configurable root so a recorded sysfs tree can stand
+in for the real one.
+"""
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import psutil
+
+from coa_inspector.cim import PLACEHOLDER_SERIALS, memory_type_name
+from coa_inspector.storage import describe_volume
+
+# PCI vendor names used when pci.ids is not installed
+PCI_VENDORS = {
+    '8086': 'Intel',
+    '1002': 'AMD',
+    '1022': 'AMD',
+    '10de': 'NVIDIA',
+    '1414': 'Microsoft',
+    '15ad': 'VMware',
+    '1af4': 'Red Hat',
+    '1234': 'QEMU',
+    '80ee': 'VirtualBox',
+}
+
+PCI_IDS_PATHS = ['usr/share/hwdata/pci.ids', 'usr/share/misc/pci.ids', 'usr/share/pci.ids']
+
+# Block devices that are never physical disks
+VIRTUAL_BLOCK_PREFIXES = ('loop', 'ram', 'zram', 'dm-', 'md', 'sr', 'fd', 'nbd')
+
+# DRM connectors wired to the laptop's own panel
+INTERNAL_CONNECTORS = ('eDP', 'LVDS', 'DSI')
+
+
+class LinuxProbes:
+    """Hardware probes backed by sysfs/procfs"""
+
+    def __init__(self, root: str = '/'):
+        self.root = Path(root)
+
+    # === FILE HELPERS ===
+
+    def path(self, relative: str) -> Path:
+        return self.root / relative.lstrip('/')
+
+    def read(self, relative, default: Optional[str] = None) -> Optional[str]:
+        """Read a sysfs attribute, returning default if missing or unreadable"""
+        path = relative if isinstance(relative, Path) else self.path(relative)
+        try:
+            return path.read_text(errors='replace').strip()
+        except OSError:
+            return default
+
+    def read_bytes(self, path: Path) -> bytes:
+        try:
+            return path.read_bytes()
+        except OSError:
+            return b''
+
+    def list_dir(self, relative: str) -> List[Path]:
+        try:
+            return sorted(self.path(relative).iterdir())
+        except OSError:
+            return []
+
+    # === CPU & MEMORY ===
+
+    def cpu_name(self) -> str:
+        """Processor brand string from /proc/cpuinfo"""
+        cpuinfo = self.read('proc/cpuinfo', '')
+        for line in cpuinfo.splitlines():
+            key, _, value = line.partition(':')
+            # 'model name' on x86, 'Model'/'Hardware' on ARM boards
+            if key.strip() in ('model name', 'Model', 'Hardware') and value.strip():
+                return value.strip()
+        return "Unknown processor"
+
+    def ram_details(self) -> Dict:
+        """Module count, type and speed from the SMBIOS type 17 tables (root only)
+
+        Without root only the total from /proc/meminfo is reported.
+        """
+        modules = []
+        for entry in self.list_dir('sys/firmware/dmi/entries'):
+            if entry.name.startswith('17-'):
+                module = self._parse_memory_device(self.read_bytes(entry / 'raw'))
+                if module:
+                    modules.append(module)
+
+        if not modules:
+            total = self.memory_total()
+            if not total:
+                return {}
+            return {'Details': f"{total // (1024**3)} GB visible to the OS; module type and speed need root"}
+
+        speed = modules[0]['configured_speed'] or modules[0]['speed']
+        return {
+            'Modules': len(modules),
+            'Speed': f"{speed} MHz" if speed else "Unknown",
+            'Type': memory_type_name(modules[0]['type']),
+        }
+
+    def memory_total(self) -> int:
+        """MemTotal from /proc/meminfo in bytes, 0 if unreadable"""
+        for line in self.read('proc/meminfo', '').splitlines():
+            key, _, value = line.partition(':')
+            if key == 'MemTotal' and value.split()[:1] and value.split()[0].isdigit():
+                return int(value.split()[0]) * 1024
+        return 0
+
+    @staticmethod
+    def _parse_memory_device(raw: bytes) -> Optional[Dict]:
+        """Decode an SMBIOS Memory Device structure; None for empty slots"""
+        if len(raw) < 0x17 or raw[0] != 17:
+            return None
+        length = raw[1]
+        size = int.from_bytes(raw[0x0C:0x0E], 'little')
+        if size in (0, 0xFFFF):
+            return None
+        return {
+            'type': raw[0x12],
+            'speed': int.from_bytes(raw[0x15:0x17], 'little'),
+            'configured_speed': int.from_bytes(raw[0x20:0x22], 'little') if length >= 0x22 else 0,
+        }
+
+    # === STORAGE ===
+
+    def storage_info(self, volumes: Optional[List[Dict]] = None) -> Dict:
+        """Physical disks from /sys/block with model, media type, bus and volumes"""
+        volumes_by_disk: Dict[str, List[str]] = {}
+        for volume in volumes or []:
+            disk = self.parent_disk(volume['Device'])
+            if disk:
+                volumes_by_disk.setdefault(disk, []).append(describe_volume(volume))
+
+        storage_info = {}
+        for block in self.list_dir('sys/block'):
+            name = block.name
+            if name.startswith(VIRTUAL_BLOCK_PREFIXES):
+                continue
+            sectors = int(self.read(block / 'size', '0') or 0)
+            if not sectors:
+                continue  # Empty card reader or ejected media
+
+            size = sectors * 512
+            rotational = self.read(block / 'queue' / 'rotational') == '1'
+            if name.startswith('nvme'):
+                media, bus = "NVMe SSD", "NVMe"
+            elif name.startswith('mmcblk'):
+                media, bus = "eMMC/SD", "MMC"
+            else:
+                media = "HDD" if rotational else "SSD"
+                bus = self._block_bus(os.path.realpath(block))
+
+            storage_info[f'Drive_{len(storage_info) + 1}'] = {
+                'Device': f"/dev/{name}",
+                'Model': self.read(block / 'device' / 'model') or "Unknown",
+                'Media': media,
+                'Bus': bus,
+                'Removable': "Yes" if self.read(block / 'removable') == '1' else "No",
+                # Disks are sold in decimal gigabytes
+                'Total': f"{size // (1000**3)} GB",
+            }
+            if name in volumes_by_disk:
+                storage_info[f'Drive_{len(storage_info)}']['Volumes'] = volumes_by_disk[name]
+        return storage_info
+
+    def parent_disk(self, device: str) -> Optional[str]:
+        """Disk name ('nvme0n1') that a partition device ('/dev/nvme0n1p2') belongs to"""
+        if not device.startswith('/dev/'):
+            return None
+        name = device[len('/dev/'):]
+        block = self.path(f'sys/class/block/{name}')
+        if not block.exists():
+            return None
+        if (block / 'partition').exists():
+            return Path(os.path.realpath(block)).parent.name
+        return name
+
+    @staticmethod
+    def _block_bus(device_path: str) -> str:
+        """Bus a block device hangs off, judged from its sysfs device path"""
+        for marker, bus in (('/usb', "USB"), ('/virtio', "VirtIO"), ('/ata', "SATA")):
+            if marker in device_path:
+                return bus
+        return "SCSI"
+
+    # === GRAPHICS & DISPLAY ===
+
+    def graphics_info(self) -> Dict:
+        """GPUs behind each /sys/class/drm card"""
+        cards = []
+        for card in self.list_dir('sys/class/drm'):
+            if not card.name.startswith('card') or '-' in card.name:
+                continue
+            device = card / 'device'
+            vendor = (self.read(device / 'vendor') or '').replace('0x', '')
+            product = (self.read(device / 'device') or '').replace('0x', '')
+            if not vendor:
+                continue
+            name = self.pci_name(vendor, product)
+            if name not in cards:
+                cards.append(name)
+        return {'Cards': cards if cards else ["Unable to detect graphics cards"]}
+
+    def pci_name(self, vendor: str, product: str) -> str:
+        """Readable PCI device name from pci.ids, falling back to the vendor table"""
+        for relative in PCI_IDS_PATHS:
+            path = self.path(relative)
+            if path.exists():
+                vendor_name, product_name = self._lookup_pci_ids(path, vendor, product)
+                if vendor_name:
+                    return f"{vendor_name} {product_name}" if product_name else f"{vendor_name} [{vendor}:{product}]"
+        return f"{PCI_VENDORS.get(vendor, 'Unknown vendor')} graphics [{vendor}:{product}]"
+
+    @staticmethod
+    def _lookup_pci_ids(path: Path, vendor: str, product: str):
+        vendor_name = product_name = None
+        try:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    if vendor_name is None:
+                        if line.startswith(vendor + '  '):
+                            vendor_name = line[len(vendor):].strip()
+                    elif line.startswith('\t\t') or line.startswith('#'):
+                        continue
+                    elif line.startswith('\t'):
+                        if line[1:].startswith(product + '  '):
+                            product_name = line[1 + len(product):].strip()
+                            break
+                    else:
+                        break  # Reached the next vendor
+        except OSError:
+            pass
+        return vendor_name, product_name
+
+    def display_info(self) -> Dict:
+        """Resolution and panel name of the connected DRM outputs"""
+        displays = []
+        for connector in self.list_dir('sys/class/drm'):
+            if '-' not in connector.name or self.read(connector / 'status') != 'connected':
+                continue
+            modes = (self.read(connector / 'modes') or '').splitlines()
+            port = connector.name.split('-', 1)[1]
+            internal = port.startswith(INTERNAL_CONNECTORS)
+            displays.append({
+                'Resolution': modes[0] if modes else "Unable to detect",
+                'Name': self._edid_name(self.read_bytes(connector / 'edid'))
+                        or ("Built-in Display" if internal else port),
+                'internal': internal,
+            })
+
+        if not displays:
+            return {'Info': 'Display detection unavailable'}
+
+        # Prefer the built-in panel as the primary display
+        displays.sort(key=lambda d: not d['internal'])
+        primary = displays[0]
+        display_info = {'Resolution': primary['Resolution'], 'Name': primary['Name']}
+        if len(displays) > 1:
+            display_info['External'] = [f"{d['Name']} ({d['Resolution']})" for d in displays[1:]]
+        return display_info
+
+    @staticmethod
+    def _edid_name(edid: bytes) -> Optional[str]:
+        """Monitor name from the EDID display descriptors"""
+        if len(edid) < 128:
+            return None
+        for offset in (54, 72, 90, 108):
+            descriptor = edid[offset:offset + 18]
+            if descriptor[:3] == b'\x00\x00\x00' and descriptor[3] == 0xFC:
+                return descriptor[5:].split(b'\n')[0].decode('ascii', 'replace').strip() or None
+        return None
+
+    # === NETWORK, BATTERY & PERIPHERALS ===
+
+    def network_info(self) -> Dict:
+        """Adapters from /sys/class/net with their IPv4 address"""
+        addresses = psutil.net_if_addrs()
+        network_info = {}
+        for iface in self.list_dir('sys/class/net'):
+            name = iface.name
+            if name == 'lo':
+                continue
+            if (iface / 'wireless').exists() or (iface / 'phy80211').exists():
+                kind = "Wireless"
+            elif (iface / 'device').exists():
+                kind = "Ethernet"
+            else:
+                kind = "Virtual"
+
+            info = {
+                'Type': kind,
+                'MAC': self.read(iface / 'address', 'Unknown'),
+                'Status': 'Up' if self.read(iface / 'operstate') == 'up' else 'Down',
+            }
+            speed = self.read(iface / 'speed')
+            if speed and speed.lstrip('-').isdigit() and int(speed) > 0:
+                info['Link Speed'] = f"{speed} Mbps"
+            for addr in addresses.get(name, []):
+                if addr.family == 2:  # IPv4
+                    info['IP Address'] = addr.address
+                    info['Netmask'] = addr.netmask
+                    break
+            network_info[name] = info
+        return network_info
+
+    def battery_info(self) -> Dict:
+        """Charge, AC state and wear level from /sys/class/power_supply"""
+        batteries = []
+        plugged = None
+        for supply in self.list_dir('sys/class/power_supply'):
+            kind = self.read(supply / 'type')
+            if kind == 'Mains':
+                plugged = plugged or self.read(supply / 'online') == '1'
+            elif kind == 'Battery' and self.read(supply / 'scope') != 'Device':
+                batteries.append(supply)
+
+        if not batteries:
+            return {'Status': 'No battery detected'}
+
+        battery = batteries[0]
+        status = self.read(battery / 'status', 'Unknown')
+        if plugged is None:
+            plugged = status in ('Charging', 'Full', 'Not charging')
+        battery_info = {
+            'Percent': f"{self.read(battery / 'capacity', '?')}%",
+            'Power Plugged': "Yes" if plugged else "No",
+            'Status': status,
+        }
+
+        for prefix in ('energy', 'charge'):
+            full = self.read(battery / f'{prefix}_full')
+            design = self.read(battery / f'{prefix}_full_design')
+            if full and design and int(design) > 0:
+                battery_info['Health'] = f"{int(full) * 100 // int(design)}%"
+                break
+        cycles = self.read(battery / 'cycle_count')
+        if cycles and cycles != '0':
+            battery_info['Cycle Count'] = cycles
+        return battery_info
+
+    def peripheral_devices(self) -> Dict:
+        """Webcam, audio, USB and Bluetooth devices known to the kernel"""
+        cameras = []
+        for video in self.list_dir('sys/class/video4linux'):
+            name = self.read(video / 'name')
+            if name and name not in cameras:
+                cameras.append(name)
+
+        audio = []
+        for line in self.read('proc/asound/cards', '').splitlines():
+            if ' - ' in line and line.strip()[:1].isdigit():
+                audio.append(line.split(' - ', 1)[1].strip())
+
+        usb_count = 0
+        for device in self.list_dir('sys/bus/usb/devices'):
+            vendor = self.read(device / 'idVendor')
+            if vendor and vendor != '1d6b':  # 1d6b is the Linux root hub
+                usb_count += 1
+
+        return {
+            'Webcam': cameras[0] if cameras else "No webcam detected",
+            'Audio Devices': audio[:2] if audio else ["No audio devices"],
+            'USB Devices': f"{usb_count} USB devices connected",
+            'Bluetooth': "Available" if self.list_dir('sys/class/bluetooth') else "Not detected",
+        }
+
+    # === FIRMWARE ===
+
+    def dmi(self, field: str) -> Optional[str]:
+        value = self.read(f'sys/class/dmi/id/{field}')
+        return value if value not in PLACEHOLDER_SERIALS else None
+
+    def bios_info(self) -> Dict:
+        if not self.path('sys/class/dmi/id').exists():
+            return {'Info': 'BIOS info unavailable (no DMI tables)'}
+
+        release_date = self.dmi('bios_date')
+        if release_date and release_date.count('/') == 2:
+            month, day, year = release_date.split('/')
+            release_date = f"{year}-{month}-{day}"
+
+        return {
+            'Serial Number': self.system_serial(),
+            'Version': self.dmi('bios_version') or "Not available",
+            'Manufacturer': self.dmi('bios_vendor') or "Not available",
+            'Release Date': release_date or "Not available",
+        }
+
+    def system_serial(self) -> str:
+        """Serial from the product, chassis or board record"""
+        for field in ('product_serial', 'chassis_serial', 'board_serial'):
+            serial = self.dmi(field)
+            if serial:
+                return serial
+        if self.path('sys/class/dmi/id/product_serial').exists() and not os.access(
+                self.path('sys/class/dmi/id/product_serial'), os.R_OK):
+            return "Not available (run as root)"
+        return "Not available"
+
+    def warranty_info(self, serial_number: str) -> Dict:
+        return {
+            'Manufacturer': self.dmi('sys_vendor') or "Unknown",
+            'Model': self.dmi('product_name') or "Unknown",
+            'Serial Number': serial_number,
+            'Note': "Check manufacturer website for warranty details",
+        }
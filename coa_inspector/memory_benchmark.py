@@ -0,0 +1,229 @@
+"""Memory bandwidth and latency benchmark
+
+Bandwidth follows STREAM: copy (c = a), scale (b = s*c), add (c = a + b)
+and triad (a = b + s*c) over float64 arrays far larger than any laptop's
+last-level cache, each kernel repeated through the benchmark harness and
+the median reported. Bytes moved are counted the STREAM way (2 or 3 arrays
+per kernel); NumPy evaluates the triad in two passes, so its figure is a
+little pessimistic.
+
+Latency is a pointer chase through a random cycle, where every load depends
+on the previous one. The same chase through a cache-sized cycle is timed
+too and subtracted, which removes the interpreter's per-step cost and
+leaves the extra time spent waiting on DRAM.
+
+Measured bandwidth is compared with the peak of a single memory channel at
+the detected RAM speed to spot laptops shipped with one module in a
+dual-channel design. The channel width follows the detected memory type:
+a DDR module is 64 bits wide, while soldered LPDDR is spread over many 16
+or 32-bit channels, so it is not assessed.
+"""
+import re
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import psutil
+
+from coa_inspector.harness import BenchmarkHarness, Measurement, format_spread
+
+# Bytes per STREAM array; three arrays are allocated
+DEFAULT_ARRAY_BYTES = 64 * 1024**2
+STREAM_SCALAR = 3.0
+
+# Pointer chase: a DRAM-sized and a cache-sized cycle of int64 indices
+LATENCY_BYTES = 128 * 1024**2
+CACHED_LATENCY_BYTES = 16 * 1024
+LATENCY_STEPS = 500_000
+
+# Bus width in bytes of one channel per memory type; DDR5 splits its 64 bits
+# into two subchannels, which still sit on the same module
+CHANNEL_BYTES = {
+    'DDR': 8,
+    'DDR2': 8,
+    'DDR3': 8,
+    'DDR4': 8,
+    'DDR5': 8,
+    'LPDDR3': 4,
+    'LPDDR4': 2,
+    'LPDDR5': 2,
+}
+
+
+@dataclass
+class MemoryBenchmarkResult:
+    """Median bandwidth in GB/s per STREAM kernel, latency in nanoseconds"""
+    array_bytes: int = 0
+    bandwidth_gbs: Dict[str, float] = field(default_factory=dict)
+    bandwidth_stats: Dict[str, Dict] = field(default_factory=dict)  # Measurement.as_dict() per kernel
+    latency_ns: float = 0.0
+    latency_stats: Dict = field(default_factory=dict)  # DRAM chase, interpreter overhead included
+    ram_type: str = "Unknown"
+    ram_speed: str = "Unknown"
+    modules: Optional[int] = None
+    channel_peak_gbs: float = 0.0  # theoretical peak of one channel at ram_speed
+    channel_assessment: str = ""
+    cancelled: bool = False
+
+    def as_dict(self) -> Dict:
+        return asdict(self)
+
+
+def stream_bandwidth(array_bytes: int = DEFAULT_ARRAY_BYTES, harness: Optional[BenchmarkHarness] = None,
+                     cancel_event: Optional[threading.Event] = None) -> Dict[str, Measurement]:
+    """GB/s of the copy, scale, add and triad kernels"""
+    harness = harness or BenchmarkHarness()
+    n = array_bytes // 8
+    a = np.full(n, 1.0)
+    b = np.full(n, 2.0)
+    c = np.full(n, 0.0)  # np.zeros would leave the first touch of its pages to the timed copy
+    scalar = STREAM_SCALAR
+
+    def triad():
+        np.multiply(c, scalar, out=a)
+        np.add(a, b, out=a)
+
+    kernels = {
+        'copy': (lambda: np.copyto(c, a), 2),
+        'scale': (lambda: np.multiply(c, scalar, out=b), 2),
+        'add': (lambda: np.add(a, b, out=c), 3),
+        'triad': (triad, 3),
+    }
+    bandwidth = {}
+    for name, (kernel, arrays) in kernels.items():
+        if cancel_event is not None and cancel_event.is_set():
+            break
+
+        def benchmark(kernel=kernel, arrays=arrays) -> int:
+            kernel()
+            return arrays * array_bytes
+
+        bandwidth[name] = harness.run(benchmark, "GB/s", scale=1e-9, cancel_event=cancel_event)
+    return bandwidth
+
+
+def _random_cycle(entries: int, rng: np.random.Generator) -> memoryview:
+    """Indices forming one cycle through every entry in random order"""
+    order = rng.permutation(entries)
+    chain = np.empty(entries, dtype=np.int64)
+    chain[order] = np.roll(order, -1)
+    return memoryview(chain)
+
+
+def _chase(chain: memoryview, steps: int) -> int:
+    """Follow the cycle for steps dependent loads"""
+    index = 0
+    for _ in range(steps):
+        index = chain[index]
+    return steps
+
+
+def pointer_chase_latency(latency_bytes: int = LATENCY_BYTES, steps: int = LATENCY_STEPS,
+                          harness: Optional[BenchmarkHarness] = None,
+                          cancel_event: Optional[threading.Event] = None) -> Tuple[float, Measurement]:
+    """Nanoseconds a dependent load waits on DRAM, interpreter overhead removed
+
+    Also returns the measurement of the DRAM chase itself, overhead included.
+    """
+    harness = harness or BenchmarkHarness()
+    rng = np.random.default_rng(17)
+    cached = _random_cycle(CACHED_LATENCY_BYTES // 8, rng)
+    large = _random_cycle(latency_bytes // 8, rng)
+    _chase(large, steps // 10)  # fault the pages in
+    overhead = harness.run(lambda: _chase(cached, steps), "ns", scale=1e9, rate=False, cancel_event=cancel_event)
+    dram = harness.run(lambda: _chase(large, steps), "ns", scale=1e9, rate=False, cancel_event=cancel_event)
+    return max(0.0, dram.median - overhead.median), dram
+
+
+def speed_mts(ram_speed: str) -> Optional[int]:
+    """Transfer rate from a detected speed such as '3200 MHz' (SMBIOS reports MT/s)"""
+    match = re.search(r'(\d+)', ram_speed or '')
+    return int(match.group(1)) if match and int(match.group(1)) > 0 else None
+
+
+def channel_peak(ram_type: str, ram_speed: str) -> float:
+    """GB/s one channel of ram_type moves at ram_speed; 0 when either is unknown"""
+    transfers = speed_mts(ram_speed)
+    width = CHANNEL_BYTES.get((ram_type or '').upper())
+    return transfers * width / 1000 if transfers and width else 0.0
+
+
+def channel_assessment(bandwidth_gbs: float, channel_peak_gbs: float, modules: Optional[int],
+                       ram_type: str = "") -> str:
+    if (ram_type or '').upper().startswith('LP'):
+        return "Not assessed (LPDDR is soldered across several narrow channels)"
+    if not channel_peak_gbs:
+        return "Unknown (RAM type or speed not detected)"
+    if bandwidth_gbs > 0.9 * channel_peak_gbs:
+        return "Multi-channel (bandwidth exceeds one channel's peak)"
+    if modules == 1:
+        return "Likely single-channel (one module installed)"
+    if bandwidth_gbs < 0.5 * channel_peak_gbs:
+        return "Possibly single-channel (bandwidth below half of one channel's peak)"
+    return "Inconclusive"
+
+
+def run_memory_benchmark(detected_ram: Optional[Dict] = None, array_bytes: int = DEFAULT_ARRAY_BYTES,
+                         harness: Optional[BenchmarkHarness] = None,
+                         on_progress: Optional[Callable[[str], None]] = None,
+                         cancel_event: Optional[threading.Event] = None) -> MemoryBenchmarkResult:
+    """Measure bandwidth and latency and assess the channel configuration
+
+    detected_ram is the RAM entry of the detected specs (Type, Speed, Modules).
+    Arrays shrink when the laptop does not have the memory to spare.
+    """
+    detected_ram = detected_ram or {}
+    available = psutil.virtual_memory().available
+    array_bytes = min(array_bytes, max(8 * 1024**2, available // 8))
+
+    result = MemoryBenchmarkResult(
+        array_bytes=array_bytes,
+        ram_type=detected_ram.get('Type', "Unknown"),
+        ram_speed=detected_ram.get('Speed', "Unknown"),
+        modules=detected_ram.get('Modules'),
+    )
+    if on_progress is not None:
+        on_progress(f"Memory: bandwidth ({array_bytes // 1024**2} MB arrays)")
+    bandwidth = stream_bandwidth(array_bytes, harness, cancel_event)
+    result.bandwidth_gbs = {name: measurement.median for name, measurement in bandwidth.items()
+                            if measurement.values}
+    result.bandwidth_stats = {name: measurement.as_dict() for name, measurement in bandwidth.items()
+                              if measurement.values}
+
+    if cancel_event is not None and cancel_event.is_set():
+        result.cancelled = True
+    else:
+        if on_progress is not None:
+            on_progress("Memory: latency")
+        result.latency_ns, dram = pointer_chase_latency(min(LATENCY_BYTES, array_bytes * 2),
+                                                        harness=harness, cancel_event=cancel_event)
+        result.latency_stats = dram.as_dict()
+
+    result.channel_peak_gbs = channel_peak(result.ram_type, result.ram_speed)
+    best_bandwidth = max(result.bandwidth_gbs.values(), default=0.0)
+    result.channel_assessment = channel_assessment(best_bandwidth, result.channel_peak_gbs, result.modules,
+                                                   result.ram_type)
+    return result
+
+
+def format_memory_result(result: MemoryBenchmarkResult) -> List[str]:
+    lines = [f"Memory Test ({result.array_bytes // 1024**2} MB arrays)"]
+    for kernel, bandwidth in result.bandwidth_gbs.items():
+        lines.append(f"  {kernel.capitalize()}: {bandwidth:.1f} GB/s"
+                     f"{format_spread(result.bandwidth_stats.get(kernel))}")
+    lines.append(f"  Latency: {result.latency_ns:.0f} ns")
+    if result.latency_stats:
+        lines.append(f"  DRAM chase incl. overhead: {result.latency_stats['median']:.0f} ns"
+                     f"{format_spread(result.latency_stats, precision=0)}")
+    ram = f"{result.ram_type} {result.ram_speed}"
+    if result.modules:
+        ram += f", {result.modules} module{'s' if result.modules > 1 else ''}"
+    lines.append(f"  RAM: {ram}")
+    if result.channel_peak_gbs:
+        bits = CHANNEL_BYTES[result.ram_type.upper()] * 8
+        lines.append(f"  One-channel peak: {result.channel_peak_gbs:.1f} GB/s ({bits}-bit {result.ram_type} channel)")
+    lines.append(f"  Channels: {result.channel_assessment}")
+    if result.cancelled:
+        lines.append("  Cancelled - results are partial")
+    return lines
@@ -0,0 +1,62 @@
+"""Latency statistics for recorded probe and operation timings
+
+Every detection probe and the slow inspection operations (performance
+tests, saving, PDF generation) write one row per run into the
+probe_metrics table. These helpers reduce those rows to p50/p95/max per
+probe and laptop model for the Analytics tab.
+"""
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# (probe, laptop_model, duration, outcome, timed_out)
+MetricRow = Tuple[str, str, float, str, int]
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Linearly interpolated percentile of values (pct between 0 and 100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize_metrics(rows: Iterable[MetricRow]) -> Dict[str, List[Dict]]:
+    """Per-probe statistics grouped by laptop model, slowest p95 first"""
+    groups: Dict[Tuple[str, str], List[Tuple[float, str, int]]] = {}
+    for probe, laptop_model, duration, outcome, timed_out in rows:
+        key = (laptop_model or "Unknown", probe)
+        groups.setdefault(key, []).append((duration, outcome, timed_out))
+
+    summary: Dict[str, List[Dict]] = {}
+    for (laptop_model, probe), runs in groups.items():
+        durations = [run[0] for run in runs]
+        summary.setdefault(laptop_model, []).append({
+            'probe': probe,
+            'runs': len(runs),
+            'p50': percentile(durations, 50),
+            'p95': percentile(durations, 95),
+            'max': max(durations),
+            'timeouts': sum(1 for run in runs if run[2]),
+            'errors': sum(1 for run in runs if run[1] != 'ok' and not run[2]),
+        })
+    for stats in summary.values():
+        stats.sort(key=lambda item: item['p95'], reverse=True)
+    return dict(sorted(summary.items()))
+
+
+def format_metrics_report(summary: Dict[str, List[Dict]]) -> str:
+    """Fixed-width text table of the summarized timings"""
+    text = "=== PROBE TIMINGS (seconds) ===\n\n"
+    if not summary:
+        return text + "No timings recorded yet. Run a hardware detection first.\n"
+
+    for laptop_model, stats in summary.items():
+        text += f"Laptop Model: {laptop_model}\n"
+        text += f"  {'Probe':<28}{'Runs':>6}{'p50':>9}{'p95':>9}{'Max':>9}{'Timeouts':>10}{'Errors':>8}\n"
+        for item in stats:
+            text += (f"  {item['probe']:<28}{item['runs']:>6}{item['p50']:>9.2f}{item['p95']:>9.2f}"
+                     f"{item['max']:>9.2f}{item['timeouts']:>10}{item['errors']:>8}\n")
+        text += "\n"
+    return text
@@ -0,0 +1,88 @@
+"""Inspection record as stored in the inspections table
+
+The same object is built from the inspection form, saved by
+InspectionDatabase, read back for history, comparison and revalidation, and
+passed to the report writers, so none of them need a window to work.
+"""
+import json
+from dataclasses import dataclass, field, fields
+from typing import Dict, List, Optional, Tuple
+
+from coa_inspector.validation import validate_specs
+
+
+@dataclass
+class Inspection:
+    """One laptop inspection; inspection_data holds specs, PR, condition and validation"""
+    inspection_date: str = ""
+    inspector_name: str = ""
+    inspector_signature: str = ""
+    inspector_id: str = ""
+    approver_signature: str = ""
+    approver_id: str = ""
+    certificate_id: str = ""
+    signature_timestamp: str = ""
+    agency_name: str = ""
+    pr_number: str = ""
+    serial_number: str = ""
+    laptop_model: str = ""
+    inspection_data: Dict = field(default_factory=dict)
+    overall_status: str = "NOT_VALIDATED"
+    created_at: str = ""
+    created_by: str = ""
+    id: Optional[int] = None
+
+    @classmethod
+    def columns(cls) -> List[str]:
+        """Table columns in INSERT order (id excluded)"""
+        return [f.name for f in fields(cls) if f.name != 'id']
+
+    @classmethod
+    def from_row(cls, row) -> "Inspection":
+        """Build from a `SELECT id, <columns>` row or sqlite3.Row"""
+        values = dict(zip(['id'] + cls.columns(), row)) if not hasattr(row, 'keys') else dict(row)
+        data = values.get('inspection_data') or '{}'
+        values['inspection_data'] = json.loads(data) if isinstance(data, str) else data
+        return cls(**{key: ('' if value is None and key != 'id' else value) for key, value in values.items()})
+
+    def to_row(self) -> Tuple:
+        """Column values in INSERT order, inspection_data serialized to JSON"""
+        row = []
+        for column in self.columns():
+            value = getattr(self, column)
+            row.append(json.dumps(value) if column == 'inspection_data' else value)
+        return tuple(row)
+
+    @property
+    def detected_specs(self) -> Dict:
+        return self.inspection_data.get('detected_specs', {})
+
+    @property
+    def pr_specs(self) -> Dict:
+        return self.inspection_data.get('purchase_request_specs', {})
+
+    @property
+    def physical_condition(self) -> Dict:
+        return self.inspection_data.get('physical_condition', {})
+
+    @property
+    def performance_tests(self) -> Dict:
+        """run_performance_tests() results; empty for inspections saved with the old text report"""
+        results = self.inspection_data.get('performance_tests')
+        return results if isinstance(results, dict) else {}
+
+    @property
+    def benchmark_scores(self) -> Dict[str, float]:
+        return self.performance_tests.get('Scores', {})
+
+    @property
+    def validation(self) -> List[Dict]:
+        return self.inspection_data.get('validation_results', {}).get('validation', [])
+
+    def revalidate(self) -> str:
+        """Validate the stored specs against the stored PR again and update the status"""
+        pr_specs = {key: (value or '').upper() for key, value in self.pr_specs.items()}
+        validation, overall_status = validate_specs(self.detected_specs, pr_specs)
+        self.inspection_data['validation_results'] = {'validation': validation, 'overall_status': overall_status}
+        self.overall_status = overall_status
+        return overall_status
@@ -0,0 +1,80 @@
+"""Performance tests run from the inspection tab
+
+run_performance_tests() returns numeric results per test so they can be
+stored and compared; format_performance_results() turns them into the
+report shown in the window. Every test is timed through one
+BenchmarkHarness, so warmup, repetitions and CPU pinning apply to all of
+them. This module imports NumPy, so the window imports it on first use.
+"""
+import threading
+from typing import Callable, Dict, List, Optional
+
+from coa_inspector.cpu_benchmark import CpuBenchmarkResult, format_cpu_result, run_cpu_benchmark
+from coa_inspector.disk_benchmark import (DEFAULT_FILE_SIZE, DiskBenchmarkResult, benchmark_targets,
+                                          format_disk_result, run_disk_benchmarks)
+from coa_inspector.harness import BenchmarkHarness
+from coa_inspector.memory_benchmark import MemoryBenchmarkResult, format_memory_result, run_memory_benchmark
+from coa_inspector.reference import benchmark_scores, format_reference_summary
+from coa_inspector.throttling import ThrottlingResult, format_throttling_result, run_throttling_test
+
+
+def run_performance_tests(disk_targets: Optional[List[Dict]] = None, disk_file_size: int = DEFAULT_FILE_SIZE,
+                          disk_concurrent: bool = False,
+                          detected_cpu: Optional[Dict] = None, detected_ram: Optional[Dict] = None,
+                          detected_storage: Optional[Dict] = None,
+                          throttling_duration: Optional[float] = None,
+                          harness: Optional[BenchmarkHarness] = None,
+                          on_progress: Optional[Callable[[str], None]] = None,
+                          cancel_event: Optional[threading.Event] = None) -> Dict:
+    """Run the CPU, memory and disk tests; Disk holds one result per drive label
+
+    disk_targets are disk_benchmark.benchmark_targets() entries and default to
+    the Default ones, one volume per internal drive. Scores holds the
+    headline numbers from reference.benchmark_scores().
+
+    detected_cpu and detected_ram are the CPU and RAM entries of the detected
+    specs; CPU scaling is checked against Cores/Threads and memory bandwidth
+    against the RAM Speed and Modules. detected_storage names the drives. The sustained-load test runs last, and
+    only when throttling_duration (seconds) is given. It is a single timed run
+    by nature, so the harness does not repeat it.
+    """
+    detected_cpu = detected_cpu or {}
+    harness = harness or BenchmarkHarness()
+    cpu = run_cpu_benchmark(detected_cpu.get('Cores'), detected_cpu.get('Threads'), harness=harness,
+                            on_progress=on_progress, cancel_event=cancel_event)
+    memory = run_memory_benchmark(detected_ram, harness=harness, on_progress=on_progress,
+                                  cancel_event=cancel_event)
+
+    results = {
+        'CPU': cpu.as_dict(),
+        'Memory': memory.as_dict(),
+    }
+    if disk_targets is None:
+        disk_targets = [target for target in benchmark_targets(detected_storage) if target['Default']]
+    results['Disk'] = run_disk_benchmarks(disk_targets, disk_file_size, disk_concurrent, harness=harness,
+                                          on_progress=on_progress, cancel_event=cancel_event)
+
+    if throttling_duration and not (cancel_event is not None and cancel_event.is_set()):
+        throttling = run_throttling_test(throttling_duration, on_progress=on_progress, cancel_event=cancel_event)
+        results['Throttling'] = throttling.as_dict()
+    results['Scores'] = benchmark_scores(results)
+    return results
+
+
+def format_performance_results(results: Dict) -> str:
+    text = "Performance Test Results:\n\n"
+    text += "\n".join(format_cpu_result(CpuBenchmarkResult(**results['CPU']))) + "\n"
+    text += "\n".join(format_memory_result(MemoryBenchmarkResult(**results['Memory']))) + "\n"
+    disks = results.get('Disk', {})
+    if not disks:
+        text += "Disk Test: no writable local volume selected\n"
+    for label, disk in disks.items():
+        if 'Error' in disk:
+            text += f"Disk Test ({label}): failed - {disk['Error']}\n"
+        else:
+            text += "\n".join(format_disk_result(DiskBenchmarkResult(**disk))) + "\n"
+    if 'Throttling' in results:
+        text += "\n".join(format_throttling_result(ThrottlingResult(**results['Throttling']))) + "\n"
+    if 'Reference' in results:
+        text += "\n".join(format_reference_summary(results['Reference'])) + "\n"
+    return text
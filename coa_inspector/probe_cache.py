@@ -0,0 +1,85 @@
+"""Cache of static probe results keyed by a machine fingerprint
+
+BIOS, serial, memory module and GPU details cannot change without a
+reboot, so when Auto-Detect is run again on the same laptop those probes
+are answered from the cache instead of re-querying the hardware. Entries
+are keyed on a fingerprint of the boot time, hostname and a quickly read
+serial, which changes whenever the machine is rebooted or the inspection
+stick is moved to a different laptop, and they also expire after a fixed
+age. Volatile probes (RAM usage, battery, network) are never cached.
+"""
+import hashlib
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import psutil
+
+# Cached entries older than this are re-detected even on the same boot
+DEFAULT_TTL = 4 * 60 * 60
+
+
+def machine_fingerprint(serial: str = '') -> str:
+    """Short hash of boot time, hostname and serial"""
+    # boot_time can drift by a fraction of a second between calls
+    boot_time = round(psutil.boot_time())
+    identity = f"{boot_time}|{platform.node()}|{serial}"
+    return hashlib.sha256(identity.encode('utf-8')).hexdigest()[:16]
+
+
+class ProbeCache:
+    """Probe values for the current machine, optionally persisted as JSON"""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, ttl: float = DEFAULT_TTL):
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self.fingerprint = ''
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def bind(self, fingerprint: str):
+        """Switch to a machine fingerprint, dropping entries from any other machine"""
+        if fingerprint != self.fingerprint:
+            self.fingerprint = fingerprint
+            self.entries = {}
+
+    def get(self, name: str) -> Optional[Any]:
+        """Cached value for a probe, or None if missing or expired"""
+        entry = self.entries.get(name)
+        if entry is None:
+            return None
+        if time.time() - entry['stored'] > self.ttl:
+            del self.entries[name]
+            return None
+        return entry['value']
+
+    def put(self, name: str, value: Any):
+        self.entries[name] = {'value': value, 'stored': time.time()}
+        self._save()
+
+    def clear(self):
+        """Forget every cached probe so the next detection runs them all"""
+        self.entries = {}
+        self._save()
+
+    def _load(self):
+        if not self.path or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            self.fingerprint = data.get('fingerprint', '')
+            self.entries = data.get('entries', {})
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"Ignoring unreadable probe cache: {e}", file=sys.stderr)
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            self.path.write_text(json.dumps({'fingerprint': self.fingerprint, 'entries': self.entries}),
+                                 encoding='utf-8')
+        except (OSError, TypeError) as e:
+            print(f"Error saving probe cache: {e}", file=sys.stderr)
@@ -0,0 +1,189 @@
+"""Concurrent hardware probe engine
+
+Each hardware helper (RAM details, BIOS, graphics, ...) is wrapped in a
+Probe and handed to ProbeEngine.run(), which executes independent probes on
+a bounded thread pool. Every probe gets its own timeout and the whole run is
+bounded by an overall deadline, so one slow wmic/PowerShell query can no
+longer hold up the rest of the detection. Probes marked static are served
+from a ProbeCache when one is given, and a probe that only feeds cached
+probes (such as the static CIM query) is then not run at all.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .probe_cache import ProbeCache
+
+# Probe outcomes
+PROBE_OK = "ok"
+PROBE_ERROR = "error"
+PROBE_TIMEOUT = "timeout"
+PROBE_CANCELLED = "cancelled"
+
+
+@dataclass
+class Probe:
+    """A single hardware query to run on the probe engine"""
+    name: str
+    func: Callable[..., Any]
+    timeout: float = 20.0
+    depends_on: Tuple[str, ...] = ()
+    default: Any = None
+    static: bool = False  # Cannot change without a reboot, so safe to cache
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of one probe; value falls back to the probe default on failure"""
+    name: str
+    status: str
+    value: Any = None
+    duration: float = 0.0
+    error: str = ""
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.status == PROBE_OK
+
+    @property
+    def timed_out(self) -> bool:
+        return self.status == PROBE_TIMEOUT
+
+    def summary(self) -> str:
+        """Short human readable status, e.g. 'ok (1.24s)'"""
+        if self.cached:
+            return f"{self.status} (cached)"
+        text = f"{self.status} ({self.duration:.2f}s)"
+        return f"{text} - {self.error}" if self.error else text
+
+
+class ProbeEngine:
+    """Run hardware probes concurrently with per-probe timeouts and a deadline"""
+
+    def __init__(self, max_workers: int = 6, deadline: float = 60.0, poll_interval: float = 0.05):
+        self.max_workers = max_workers
+        self.deadline = deadline
+        self.poll_interval = poll_interval
+
+    def run(self, probes: List[Probe],
+            on_result: Optional[Callable[[ProbeResult], None]] = None,
+            cancel_event: Optional[threading.Event] = None,
+            cache: Optional[ProbeCache] = None) -> Dict[str, ProbeResult]:
+        """Run all probes and return their results keyed by probe name
+
+        Probes listed in depends_on are started only after those probes have
+        finished and receive their values as positional arguments. A probe
+        that is still running when its timeout or the overall deadline
+        expires is reported as timed out; its worker thread is abandoned
+        rather than waited on. on_result is called from the calling thread
+        as soon as each result is known. Setting cancel_event reports every
+        unfinished probe as cancelled and returns promptly. Static probes
+        found in cache are answered without running, and static results
+        computed from successful dependencies are stored back into it. A
+        non-static probe whose dependents were all answered from cache is
+        skipped and reported as cached with its default value.
+        """
+        names = {probe.name for probe in probes}
+        for probe in probes:
+            missing = [dep for dep in probe.depends_on if dep not in names]
+            if missing:
+                raise ValueError(f"Probe '{probe.name}' depends on unknown probe(s): {', '.join(missing)}")
+
+        results: Dict[str, ProbeResult] = {}
+        waiting: Dict[str, Probe] = {probe.name: probe for probe in probes}
+        running: Dict[Future, Probe] = {}
+        started: Dict[str, float] = {}
+        deadline = time.monotonic() + self.deadline
+
+        def finish(result: ProbeResult):
+            results[result.name] = result
+            probe = probes_by_name[result.name]
+            # Only cache values computed from successful inputs
+            if (cache is not None and probe.static and result.ok and not result.cached
+                    and all(results[dep].ok for dep in probe.depends_on)):
+                cache.put(result.name, result.value)
+            if on_result:
+                on_result(result)
+
+        probes_by_name = {probe.name: probe for probe in probes}
+        if cache is not None:
+            for probe in probes:
+                value = cache.get(probe.name) if probe.static else None
+                if value is not None:
+                    del waiting[probe.name]
+                    finish(ProbeResult(probe.name, PROBE_OK, value, cached=True))
+            for probe in probes:
+                dependents = [other for other in probes if probe.name in other.depends_on]
+                if (probe.name in waiting and not probe.static and dependents
+                        and all(other.name in results and results[other.name].cached for other in dependents)):
+                    del waiting[probe.name]
+                    finish(ProbeResult(probe.name, PROBE_OK, probe.default, cached=True))
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="probe")
+        try:
+            while waiting or running:
+                # Start every probe whose dependencies are resolved
+                for name, probe in list(waiting.items()):
+                    if all(dep in results for dep in probe.depends_on):
+                        args = [results[dep].value for dep in probe.depends_on]
+                        del waiting[name]
+                        running[executor.submit(self._call, probe, args, started)] = probe
+
+                done, _ = wait(list(running), timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    probe = running.pop(future)
+                    succeeded, value, duration = future.result()
+                    if succeeded:
+                        finish(ProbeResult(probe.name, PROBE_OK, value, duration))
+                    else:
+                        finish(ProbeResult(probe.name, PROBE_ERROR, probe.default, duration,
+                                           str(value) or type(value).__name__))
+
+                now = time.monotonic()
+                past_deadline = now >= deadline
+                for future, probe in list(running.items()):
+                    begun = started.get(probe.name)
+                    elapsed = now - begun if begun is not None else 0.0
+                    if past_deadline or elapsed >= probe.timeout:
+                        future.cancel()
+                        del running[future]
+                        limit = "overall deadline" if past_deadline else f"{probe.timeout:g}s timeout"
+                        finish(ProbeResult(probe.name, PROBE_TIMEOUT, probe.default, elapsed,
+                                           f"exceeded {limit}"))
+
+                if past_deadline:
+                    for name, probe in list(waiting.items()):
+                        del waiting[name]
+                        finish(ProbeResult(name, PROBE_TIMEOUT, probe.default, 0.0,
+                                           "not started before overall deadline"))
+
+                if cancel_event is not None and cancel_event.is_set():
+                    for future, probe in list(running.items()):
+                        future.cancel()
+                        del running[future]
+                        begun = started.get(probe.name)
+                        elapsed = now - begun if begun is not None else 0.0
+                        finish(ProbeResult(probe.name, PROBE_CANCELLED, probe.default, elapsed,
+                                           "cancelled by user"))
+                    for name, probe in list(waiting.items()):
+                        del waiting[name]
+                        finish(ProbeResult(name, PROBE_CANCELLED, probe.default, 0.0,
+                                           "cancelled by user"))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return results
+
+    @staticmethod
+    def _call(probe: Probe, args: list, started: Dict[str, float]):
+        """Worker-thread wrapper that never raises into the executor"""
+        begun = time.monotonic()
+        started[probe.name] = begun
+        try:
+            value = probe.func(*args)
+            return True, value, time.monotonic() - begun
+        except Exception as e:
+            return False, e, time.monotonic() - begun
@@ -0,0 +1,183 @@
+"""Expected benchmark scores per laptop model and CPU
+
+benchmark_scores() flattens the performance test results into a few
+numbers (single-thread score, memory bandwidth, disk IOPS, ...) that are
+stored with the inspection. A reference table holds the same numbers as
+measured on a known-good unit, keyed by laptop model or by CPU model, and
+compare_to_reference() reports each score as a percentage of its
+reference, flagging those below UNDERPERFORMING_PERCENT.
+
+The scores come from this tool's own kernels, so references have to be
+measured with it: run the tests on a unit known to be healthy and save its
+scores as the reference for its model. The table is the JSON file
+reference_scores.json next to main.py (or the executable), whatever the
+working directory, and can be copied between inspection sticks to share
+references.
+"""
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+
+def application_dir() -> Path:
+    """Folder holding main.py, or the executable when frozen"""
+    if getattr(sys, 'frozen', False):
+        return Path(sys.executable).resolve().parent
+    return Path(__file__).resolve().parent.parent
+
+
+REFERENCE_FILE = application_dir() / "reference_scores.json"
+
+# Scores below this percentage of the reference are flagged
+UNDERPERFORMING_PERCENT = 70.0
+
+# Score name: (label, unit, higher is better)
+METRICS = {
+    'cpu_single_thread': ("CPU single-thread", "Mops/s", True),
+    'cpu_all_core': ("CPU all-core", "Mops/s", True),
+    'cpu_sustained': ("CPU sustained all-core", "Mops/s", True),
+    'memory_copy': ("Memory copy", "GB/s", True),
+    'memory_triad': ("Memory triad", "GB/s", True),
+    'memory_latency': ("Memory latency", "ns", False),
+    'disk_sequential_read': ("Disk sequential read", "MB/s", True),
+    'disk_sequential_write': ("Disk sequential write", "MB/s", True),
+    'disk_random_read_qd1': ("Disk 4K read QD1", "IOPS", True),
+    'disk_random_write_qd1': ("Disk 4K write QD1", "IOPS", True),
+}
+
+# Reference table sections, most specific first
+SECTION_LAPTOP_MODEL = 'laptop_model'
+SECTION_CPU = 'cpu'
+
+
+def _keyed(values: Dict, key: int) -> Optional[float]:
+    """Look up an int-keyed result field that may have been through JSON"""
+    return values.get(key, values.get(str(key)))
+
+
+def primary_disk(disks: Dict[str, Dict]) -> Dict:
+    """The first internal drive that was benchmarked, else the first drive"""
+    tested = [disk for disk in disks.values() if 'Error' not in disk]
+    internal = [disk for disk in tested if not disk.get('removable')]
+    return (internal or tested or [{}])[0]
+
+
+def benchmark_scores(results: Dict) -> Dict[str, float]:
+    """The METRICS numbers present in run_performance_tests() results
+
+    Disk scores come from the primary (first internal) drive.
+    """
+    cpu = results.get('CPU', {})
+    memory = results.get('Memory', {})
+    disk = primary_disk(results.get('Disk', {}))
+    throttling = results.get('Throttling', {})
+    scores = {
+        'cpu_single_thread': cpu.get('single_thread_score'),
+        'cpu_all_core': cpu.get('all_core_score'),
+        'cpu_sustained': throttling.get('steady_throughput_mops'),
+        'memory_copy': memory.get('bandwidth_gbs', {}).get('copy'),
+        'memory_triad': memory.get('bandwidth_gbs', {}).get('triad'),
+        'memory_latency': memory.get('latency_ns'),
+        'disk_sequential_read': disk.get('sequential_read_mbps'),
+        'disk_sequential_write': disk.get('sequential_write_mbps'),
+        'disk_random_read_qd1': _keyed(disk.get('random_read_iops', {}), 1),
+        'disk_random_write_qd1': _keyed(disk.get('random_write_iops', {}), 1),
+    }
+    return {name: round(value, 3) for name, value in scores.items() if value}
+
+
+def normalize_name(name: str) -> str:
+    """'Intel(R) Core(TM) i5-1235U' -> 'intel core i5-1235u'"""
+    name = re.sub(r'\((r|tm|c)\)', ' ', (name or '').lower())
+    return ' '.join(name.split())
+
+
+class ReferenceTable:
+    """Reference scores keyed by laptop model and by CPU model"""
+
+    def __init__(self, sections: Optional[Dict[str, Dict[str, Dict[str, float]]]] = None):
+        sections = sections or {}
+        self.sections = {section: dict(sections.get(section, {}))
+                         for section in (SECTION_LAPTOP_MODEL, SECTION_CPU)}
+
+    @classmethod
+    def load(cls, path: Union[str, Path] = REFERENCE_FILE) -> "ReferenceTable":
+        """Read the table; an empty one when the file does not exist"""
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        return cls(json.loads(path.read_text(encoding='utf-8')))
+
+    def save(self, path: Union[str, Path] = REFERENCE_FILE):
+        Path(path).write_text(json.dumps(self.sections, indent=2, sort_keys=True), encoding='utf-8')
+
+    def set_reference(self, section: str, name: str, scores: Dict[str, float]):
+        """Store scores as the reference for a laptop model or CPU, replacing any earlier one"""
+        self.sections[section][name.strip()] = {metric: value for metric, value in scores.items()
+                                                if metric in METRICS}
+
+    def lookup(self, laptop_model: str = "", cpu_name: str = "") -> Tuple[str, Dict[str, float]]:
+        """(description of the matched entry, its scores); ('', {}) without a match
+
+        The laptop model must match exactly (ignoring case and spacing); a CPU
+        entry matches when its name appears in the detected CPU name, the
+        longest such entry winning.
+        """
+        model = normalize_name(laptop_model)
+        for name, scores in self.sections[SECTION_LAPTOP_MODEL].items():
+            if model and normalize_name(name) == model:
+                return f"laptop model {name}", scores
+
+        cpu = normalize_name(cpu_name)
+        matches = [name for name in self.sections[SECTION_CPU] if cpu and normalize_name(name) in cpu]
+        if matches:
+            name = max(matches, key=len)
+            return f"CPU {name}", self.sections[SECTION_CPU][name]
+        return "", {}
+
+
+def compare_to_reference(scores: Dict[str, float], reference: Dict[str, float]) -> List[Dict]:
+    """One row per score that has a reference: value, reference, percent and flag"""
+    rows = []
+    for metric, (label, unit, higher_is_better) in METRICS.items():
+        value, expected = scores.get(metric), reference.get(metric)
+        if not value or not expected:
+            continue
+        percent = (value / expected if higher_is_better else expected / value) * 100
+        rows.append({
+            'metric': metric,
+            'label': label,
+            'unit': unit,
+            'value': value,
+            'reference': expected,
+            'percent': round(percent, 1),
+            'underperforming': percent < UNDERPERFORMING_PERCENT,
+        })
+    return rows
+
+
+def reference_summary(scores: Dict[str, float], table: ReferenceTable, laptop_model: str = "",
+                      cpu_name: str = "") -> Dict:
+    """Comparison stored with the inspection under performance_tests['Reference']"""
+    source, reference = table.lookup(laptop_model, cpu_name)
+    rows = compare_to_reference(scores, reference)
+    return {
+        'source': source,
+        'rows': rows,
+        'underperforming': any(row['underperforming'] for row in rows),
+    }
+
+
+def format_reference_summary(summary: Dict) -> List[str]:
+    if not summary.get('source'):
+        return ["Reference: no reference scores for this laptop model or CPU"]
+    lines = [f"Compared with reference for {summary['source']}"]
+    for row in summary['rows']:
+        flag = " - BELOW EXPECTED" if row['underperforming'] else ""
+        lines.append(f"  {row['label']}: {row['percent']:.0f}% of reference "
+                     f"({row['value']:,.1f} vs {row['reference']:,.1f} {row['unit']}){flag}")
+    if summary['underperforming']:
+        lines.append(f"  Unit performs below {UNDERPERFORMING_PERCENT:.0f}% of its reference")
+    return lines
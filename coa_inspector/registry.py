@@ -0,0 +1,132 @@
+"""Windows registry probes for CPU, BIOS and system identity
+
+The processor brand string and SMBIOS identity that Windows caches under
+HKLM\\HARDWARE\\DESCRIPTION can be read in microseconds through winreg,
+with no process spawn at all. platform.processor() only returns strings
+such as "Intel64 Family 6 Model 140", which defeats the i3/i5/i7 tier
+matching in validation, so the CPU name comes from here on Windows.
+
+Registry access goes through a small reader interface so recorded values
+can stand in for a real registry on other platforms.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from coa_inspector.cim import PLACEHOLDER_SERIALS
+
+CPU_KEY = r"HARDWARE\DESCRIPTION\System\CentralProcessor\0"
+BIOS_KEY = r"HARDWARE\DESCRIPTION\System\BIOS"
+
+
+class RegistryReader(ABC):
+    """Read all values stored directly under an HKEY_LOCAL_MACHINE key"""
+
+    @abstractmethod
+    def read_values(self, path: str) -> Dict[str, Any]:
+        """Value name -> data, empty when the key does not exist"""
+
+
+class WinRegReader(RegistryReader):
+    """Registry reader backed by the winreg module"""
+
+    def __init__(self):
+        import winreg  # Only available on Windows
+        self.winreg = winreg
+
+    def read_values(self, path: str) -> Dict[str, Any]:
+        values = {}
+        try:
+            with self.winreg.OpenKey(self.winreg.HKEY_LOCAL_MACHINE, path) as key:
+                index = 0
+                while True:
+                    try:
+                        name, data, _ = self.winreg.EnumValue(key, index)
+                    except OSError:
+                        break  # No more values
+                    values[name] = data
+                    index += 1
+        except OSError:
+            pass  # Key does not exist
+        return values
+
+
+class DictRegistryReader(RegistryReader):
+    """Registry reader over a {key path: {value name: data}} dictionary"""
+
+    def __init__(self, keys: Dict[str, Dict[str, Any]]):
+        self.keys = {path.lower(): values for path, values in keys.items()}
+
+    def read_values(self, path: str) -> Dict[str, Any]:
+        return dict(self.keys.get(path.lower(), {}))
+
+
+def _text(value: Any) -> str:
+    """Registry data as a single clean string (REG_MULTI_SZ is joined)"""
+    if value is None:
+        return ''
+    if isinstance(value, (list, tuple)):
+        value = ' '.join(str(v) for v in value if v)
+    return ' '.join(str(value).split())
+
+
+class RegistryProbes:
+    """CPU and firmware details read from the registry"""
+
+    def __init__(self, reader: Optional[RegistryReader] = None):
+        self._reader = reader
+
+    @property
+    def reader(self) -> RegistryReader:
+        if self._reader is None:
+            self._reader = WinRegReader()
+        return self._reader
+
+    def cpu_info(self) -> Dict:
+        """Processor brand string, vendor and rated clock"""
+        values = self.reader.read_values(CPU_KEY)
+        cpu_info = {}
+        if _text(values.get('ProcessorNameString')):
+            cpu_info['Name'] = _text(values['ProcessorNameString'])
+        if values.get('~MHz'):
+            cpu_info['Base Frequency'] = f"{values['~MHz']} MHz"
+        if _text(values.get('VendorIdentifier')):
+            cpu_info['Vendor'] = _text(values['VendorIdentifier'])
+        return cpu_info
+
+    def cpu_name(self) -> Optional[str]:
+        return self.cpu_info().get('Name')
+
+    def bios_info(self) -> Dict:
+        """BIOS version, vendor and release date (the serial is not in the registry)"""
+        values = self.reader.read_values(BIOS_KEY)
+        if not values:
+            return {}
+
+        release_date = _text(values.get('BIOSReleaseDate'))
+        if release_date.count('/') == 2:
+            month, day, year = release_date.split('/')
+            release_date = f"{year}-{month}-{day}"
+
+        bios_info = {
+            'Version': _text(values.get('BIOSVersion')),
+            'Manufacturer': _text(values.get('BIOSVendor')),
+            'Release Date': release_date,
+        }
+        return {key: value for key, value in bios_info.items() if value}
+
+    def system_info(self) -> Dict:
+        """System and baseboard identity from the SMBIOS cache, without OEM placeholders"""
+        values = self.reader.read_values(BIOS_KEY)
+        fields = {
+            'Manufacturer': 'SystemManufacturer',
+            'Model': 'SystemProductName',
+            'Family': 'SystemFamily',
+            'SKU': 'SystemSKU',
+            'Baseboard Manufacturer': 'BaseBoardManufacturer',
+            'Baseboard Product': 'BaseBoardProduct',
+        }
+        system_info = {}
+        for label, name in fields.items():
+            if _text(values.get(name)) not in PLACEHOLDER_SERIALS:
+                system_info[label] = _text(values[name])
+        return system_info
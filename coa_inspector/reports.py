@@ -0,0 +1,135 @@
+"""PDF and Excel reports of an inspection
+
+reportlab and pandas are imported inside the writers; loading them at
+startup cost seconds per launch and most sessions never export anything.
+"""
+from datetime import datetime
+
+from coa_inspector.model import Inspection
+from coa_inspector.reference import METRICS
+
+
+def report_filename(prefix: str, inspection: Inspection, extension: str) -> str:
+    """Name such as COA_Inspection_<serial>_20240101_120000.xlsx"""
+    return f"{prefix}_{inspection.serial_number}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+
+
+def overall_status_text(inspection: Inspection) -> str:
+    return inspection.overall_status if inspection.validation else 'Not Validated'
+
+
+def write_pdf_report(filename: str, inspection: Inspection):
+    """Write the inspection details and validation results as a PDF"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib import colors
+
+    doc = SimpleDocTemplate(filename, pagesize=A4)
+    styles = getSampleStyleSheet()
+    story = []
+
+    # Title
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=16,
+        spaceAfter=30,
+        alignment=1  # Center
+    )
+    title = Paragraph("COMMISSION ON AUDIT<br/>LAPTOP INSPECTION REPORT", title_style)
+    story.append(title)
+
+    # Inspection Details
+    details_data = [
+        ['Inspector:', inspection.inspector_name],
+        ['Agency:', inspection.agency_name],
+        ['PR Number:', inspection.pr_number],
+        ['Serial Number:', inspection.serial_number],
+        ['Model:', inspection.laptop_model],
+        ['Inspection Date:', inspection.inspection_date],
+        ['Overall Status:', overall_status_text(inspection)]
+    ]
+
+    details_table = Table(details_data, colWidths=[200, 300])
+    details_table.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+
+    story.append(details_table)
+    story.append(Spacer(1, 20))
+
+    # Add validation results table if available
+    if inspection.validation:
+        validation_data = [['Component', 'Status', 'Details']]
+        for result in inspection.validation:
+            validation_data.append([
+                result['component'],
+                result['status'],
+                result['details']
+            ])
+
+        validation_table = Table(validation_data, colWidths=[100, 80, 320])
+        validation_table.setStyle(TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+
+        story.append(Paragraph("Specification Validation Results", styles['Heading2']))
+        story.append(validation_table)
+        story.append(Spacer(1, 20))
+
+    doc.build(story)
+
+
+def write_excel_report(filename: str, inspection: Inspection):
+    """Write a Summary sheet plus Hardware_Specs and Benchmarks sheets when there is data for them"""
+    import pandas as pd
+
+    with pd.ExcelWriter(filename, engine='openpyxl') as writer:
+        # Summary sheet
+        summary_data = {
+            'Field': ['Inspector', 'Agency', 'PR Number', 'Serial Number', 'Model', 'Inspection Date', 'Overall Status'],
+            'Value': [
+                inspection.inspector_name,
+                inspection.agency_name,
+                inspection.pr_number,
+                inspection.serial_number,
+                inspection.laptop_model,
+                inspection.inspection_date,
+                overall_status_text(inspection)
+            ]
+        }
+        pd.DataFrame(summary_data).to_excel(writer, sheet_name='Summary', index=False)
+
+        # Hardware specs sheet
+        if inspection.detected_specs:
+            hardware_data = []
+            for category, specs in inspection.detected_specs.items():
+                if isinstance(specs, dict):
+                    for key, value in specs.items():
+                        hardware_data.append([category, key, str(value)])
+
+            pd.DataFrame(hardware_data, columns=['Category', 'Spec', 'Value']).to_excel(
+                writer, sheet_name='Hardware_Specs', index=False)
+
+        # Benchmark scores sheet
+        if inspection.benchmark_scores:
+            rows = {row['metric']: row for row in inspection.performance_tests.get('Reference', {}).get('rows', [])}
+            benchmark_data = []
+            for metric, value in inspection.benchmark_scores.items():
+                label, unit, _ = METRICS.get(metric, (metric, '', True))
+                row = rows.get(metric, {})
+                benchmark_data.append([label, value, unit, row.get('reference'), row.get('percent'),
+                                       'Below expected' if row.get('underperforming') else ''])
+
+            columns = ['Test', 'Score', 'Unit', 'Reference', '% of Reference', 'Flag']
+            pd.DataFrame(benchmark_data, columns=columns).to_excel(writer, sheet_name='Benchmarks', index=False)
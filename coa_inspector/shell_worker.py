@@ -0,0 +1,223 @@
+"""Long-lived shell worker reused across hardware detections
+
+Starting powershell.exe costs one to three seconds before a query even
+runs, so the app keeps a single worker process alive and sends it scripts
+over stdin/stdout using a line-delimited JSON protocol:
+
+    request:   {"id": 1, "script": "..."}
+    response:  {"id": 1, "ok": true, "output": "..."}
+               {"id": 1, "ok": false, "error": "..."}
+
+ShellWorker accepts any command that speaks this protocol, so the
+transport does not depend on PowerShell being present. The worker runs one
+script at a time, so requests from several threads take turns, and each
+request's timeout starts when its turn comes rather than while it waits
+behind a slow query. A worker that dies is restarted on the next request,
+and one that stops answering is killed and restarted when a request times
+out.
+"""
+import base64
+import itertools
+import json
+import subprocess
+import threading
+from typing import Dict, List, Optional
+
+# PowerShell side of the protocol: run each script and reply with its output
+POWERSHELL_WORKER_SCRIPT = r"""
+[Console]::InputEncoding = [System.Text.Encoding]::UTF8
+[Console]::OutputEncoding = New-Object System.Text.UTF8Encoding $false
+while ($true) {
+    $line = [Console]::In.ReadLine()
+    if ($null -eq $line) { break }
+    if (-not $line.Trim()) { continue }
+    $id = $null
+    try {
+        $request = $line | ConvertFrom-Json
+        $id = $request.id
+        $output = & ([scriptblock]::Create($request.script)) | Out-String
+        $response = @{ id = $id; ok = $true; output = $output }
+    } catch {
+        $response = @{ id = $id; ok = $false; error = $_.Exception.Message }
+    }
+    [Console]::Out.WriteLine(($response | ConvertTo-Json -Compress))
+    [Console]::Out.Flush()
+}
+"""
+
+
+class ShellWorkerError(Exception):
+    """Raised when the worker cannot run a request"""
+
+
+class ShellWorkerTimeout(ShellWorkerError):
+    """Raised when the worker does not answer within the request timeout"""
+
+
+class ShellWorkerExited(ShellWorkerError):
+    """Raised when the worker process goes away while a request is in flight"""
+
+
+def powershell_worker_command(executable: str = 'powershell') -> List[str]:
+    """Command line that starts a PowerShell process serving the worker protocol"""
+    encoded = base64.b64encode(POWERSHELL_WORKER_SCRIPT.encode('utf-16-le')).decode('ascii')
+    return [executable, '-NoLogo', '-NoProfile', '-NonInteractive', '-EncodedCommand', encoded]
+
+
+class _PendingRequest:
+    def __init__(self, process: subprocess.Popen):
+        self.process = process
+        self.done = threading.Event()
+        self.response: Optional[Dict] = None
+        self.error = ""
+
+
+class ShellWorker:
+    """Persistent worker process driven by the JSON line protocol
+
+    Instances are callable as (script, timeout) -> output, which makes them
+    a drop-in executor for collect_cim_snapshot.
+    """
+
+    def __init__(self, command: List[str], max_restarts: int = 3):
+        self.command = list(command)
+        self.max_restarts = max_restarts
+        self.restarts = 0
+        self._process: Optional[subprocess.Popen] = None
+        self._alive = False
+        self._pending: Dict[int, _PendingRequest] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        # Held for a whole request: the worker answers one script at a time
+        self._turn = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._alive and self._process.poll() is None
+
+    def start(self):
+        """Start the worker if it is not already running"""
+        with self._lock:
+            self._ensure_started()
+
+    def stop(self):
+        """Close the worker's stdin and terminate it"""
+        with self._lock:
+            process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=2)
+        except Exception:
+            process.kill()
+        self._fail_pending(process, "Worker was stopped before answering")
+
+    def request(self, script: str, timeout: float = 30) -> str:
+        """Run a script on the worker and return its output
+
+        Waits for requests from other threads to finish first; timeout
+        covers only this request's own run.
+        """
+        with self._turn:
+            try:
+                return self._request_once(script, timeout)
+            except ShellWorkerExited:
+                # The worker died mid-request; run the script again on a fresh one
+                return self._request_once(script, timeout)
+
+    def __call__(self, script: str, timeout: float) -> str:
+        return self.request(script, timeout)
+
+    def _request_once(self, script: str, timeout: float) -> str:
+        with self._lock:
+            process = self._ensure_started()
+            pending = _PendingRequest(process)
+            request_id = next(self._ids)
+            self._pending[request_id] = pending
+        # Written without the lock, which the reader thread needs to route responses
+        try:
+            process.stdin.write(json.dumps({'id': request_id, 'script': script}) + "\n")
+            process.stdin.flush()
+        except (OSError, ValueError) as e:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise ShellWorkerExited(f"Could not send request to worker: {e}") from e
+
+        if not pending.done.wait(timeout):
+            with self._lock:
+                self._pending.pop(request_id, None)
+            # A worker that stops answering would block every later request
+            self._kill(process)
+            raise ShellWorkerTimeout(f"Worker did not answer within {timeout:g}s")
+
+        response = pending.response
+        if response is None:
+            raise ShellWorkerExited(pending.error or "Worker exited before answering")
+        self.restarts = 0
+        if not response.get('ok'):
+            raise ShellWorkerError(response.get('error') or "Worker reported an error")
+        return response.get('output') or ''
+
+    def _ensure_started(self) -> subprocess.Popen:
+        """Start or restart the worker; caller must hold the lock"""
+        if self.running:
+            return self._process
+
+        if self._process is not None:
+            if self.restarts >= self.max_restarts:
+                raise ShellWorkerError(f"Worker keeps exiting (restarted {self.restarts} times)")
+            self.restarts += 1
+
+        try:
+            process = subprocess.Popen(
+                self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL, text=True, encoding='utf-8', errors='replace',
+                bufsize=1, creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+            )
+        except OSError as e:
+            raise ShellWorkerError(f"Could not start worker: {e}") from e
+
+        self._process = process
+        self._alive = True
+        threading.Thread(target=self._read_responses, args=(process,),
+                         name="shell-worker-reader", daemon=True).start()
+        return process
+
+    def _read_responses(self, process: subprocess.Popen):
+        """Route each response line to the request waiting for its id"""
+        for line in process.stdout:
+            line = line.strip().lstrip('\ufeff')
+            if not line:
+                continue
+            try:
+                response = json.loads(line)
+            except ValueError:
+                continue  # Stray output that is not part of the protocol
+            with self._lock:
+                pending = self._pending.pop(response.get('id'), None)
+            if pending:
+                pending.response = response
+                pending.done.set()
+        self._fail_pending(process, "Worker exited before answering")
+
+    def _fail_pending(self, process: subprocess.Popen, reason: str):
+        """Wake every request still waiting on a worker that has gone away"""
+        with self._lock:
+            if self._process is process:
+                self._alive = False
+            failed = [request_id for request_id, request in self._pending.items()
+                      if request.process is process]
+            requests = [self._pending.pop(request_id) for request_id in failed]
+        for request in requests:
+            request.error = reason
+            request.done.set()
+
+    def _kill(self, process: subprocess.Popen):
+        with self._lock:
+            if self._process is process:
+                self._alive = False
+        try:
+            process.kill()
+        except OSError:
+            pass
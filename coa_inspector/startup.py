@@ -0,0 +1,99 @@
+"""Startup timing: trace mode and the startup benchmark
+
+`main.py --startup-trace` prints how long each startup phase took (module
+imports, QApplication, init_database, setup_ui, ...) measured from the
+moment the process was created. `main.py startup-benchmark` launches the
+app several times with `--startup-probe`, which exits as soon as the login
+window is on screen, and fails when the median time to reach it is over
+budget, so slow imports are caught before a release goes out.
+"""
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Seconds allowed from process start to the login window
+DEFAULT_BUDGET = 3.0
+
+
+def _process_age() -> float:
+    """Seconds since this process was created (interpreter startup included)"""
+    try:
+        import psutil
+        return max(0.0, time.time() - psutil.Process().create_time())
+    except Exception:
+        return 0.0
+
+
+class StartupTrace:
+    """Durations of consecutive startup phases"""
+
+    def __init__(self):
+        self.offset = _process_age()
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.phases: List[Tuple[str, float]] = [("interpreter startup", self.offset)]
+
+    def mark(self, phase: str):
+        """Record that phase has just finished"""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def elapsed(self) -> float:
+        """Seconds from process creation until now"""
+        return self.offset + time.perf_counter() - self.started
+
+    def as_dict(self, event: str) -> Dict:
+        return {'event': event, 'elapsed': self.elapsed(), 'phases': dict(self.phases)}
+
+    def format(self, event: str) -> str:
+        text = "=== STARTUP TRACE ===\n"
+        for phase, duration in self.phases:
+            text += f"  {phase:<32}{duration:>8.3f}s\n"
+        text += f"  {event} after {self.elapsed():.3f}s\n"
+        return text
+
+    def report(self, event: str, log_path: str = "startup_trace.log"):
+        """Print the trace, or append it to log_path when there is no console"""
+        text = self.format(event)
+        if sys.stderr is not None:
+            sys.stderr.write(text)
+        else:
+            with open(log_path, 'a', encoding='utf-8') as log:
+                log.write(text)
+
+
+def app_command() -> List[str]:
+    """Command that starts the GUI, for the script or the frozen executable"""
+    if getattr(sys, 'frozen', False):
+        return [sys.executable]
+    return [sys.executable, str(Path(__file__).resolve().parent.parent / "main.py")]
+
+
+def run_startup_benchmark(runs: int = 5, budget: float = DEFAULT_BUDGET,
+                          command: Optional[List[str]] = None, timeout: float = 60) -> Dict:
+    """Start the app runs times and time how long the login window takes to appear"""
+    command = command or app_command()
+    times = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for run in range(runs):
+            out = Path(tmp) / f"probe_{run}.json"
+            subprocess.run(command + ['--startup-probe', str(out)], timeout=timeout,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if not out.exists():
+                raise RuntimeError(f"Run {run + 1} exited without reporting startup time")
+            times.append(json.loads(out.read_text(encoding='utf-8'))['elapsed'])
+
+    median = statistics.median(times)
+    return {
+        'runs': times,
+        'median': median,
+        'max': max(times),
+        'budget': budget,
+        'passed': median <= budget,
+    }
@@ -0,0 +1,121 @@
+"""Mount-safe volume usage for the storage probe
+
+psutil.disk_usage() on a mapped network drive, an empty card reader or an
+optical drive can block for a long time. Mounts are classified first:
+remote, optical and empty ones are skipped outright, and every remaining
+usage query runs on a daemon thread with a timeout so a stuck volume is
+reported instead of hanging detection. The volumes are then attached to
+the physical disk they live on by the platform probes.
+"""
+import threading
+from typing import Dict, List, Optional
+
+import psutil
+
+# Filesystems that live on another machine
+REMOTE_FILESYSTEMS = ('nfs', 'nfs4', 'cifs', 'smbfs', 'smb3', 'sshfs', 'fuse.sshfs',
+                      '9p', 'afs', 'davfs', 'fuse.rclone')
+
+# Filesystems used by optical media
+OPTICAL_FILESYSTEMS = ('cdfs', 'iso9660', 'udf')
+
+# Seconds to wait for usage of fixed and removable volumes
+FIXED_TIMEOUT = 5.0
+REMOVABLE_TIMEOUT = 1.0
+
+
+def mount_kind(partition) -> str:
+    """Classify a psutil partition as fixed, removable, remote, optical or empty"""
+    opts = partition.opts.lower().split(',')
+    fstype = partition.fstype.lower()
+    if 'remote' in opts or fstype in REMOTE_FILESYSTEMS:
+        return "remote"
+    if 'cdrom' in opts or fstype in OPTICAL_FILESYSTEMS:
+        return "optical"
+    if not fstype:
+        return "empty"  # Card reader or drive letter with no media
+    if 'removable' in opts:
+        return "removable"
+    return "fixed"
+
+
+def disk_usage_with_timeout(mountpoint: str, timeout: float):
+    """psutil.disk_usage() that gives up after timeout seconds
+
+    Returns None on timeout and raises OSError if the volume cannot be read.
+    """
+    outcome = {}
+
+    def query():
+        try:
+            outcome['usage'] = psutil.disk_usage(mountpoint)
+        except OSError as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=query, name="disk-usage", daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome.get('usage')
+
+
+def volume_usage(partitions: Optional[list] = None) -> List[Dict]:
+    """Usage of every local volume, skipping mounts that could hang"""
+    if partitions is None:
+        partitions = psutil.disk_partitions()
+
+    volumes = []
+    for partition in partitions:
+        kind = mount_kind(partition)
+        volume = {
+            'Mount': partition.mountpoint,
+            'Device': partition.device,
+            'FileSystem': partition.fstype,
+            'Kind': kind,
+        }
+        if kind in ("remote", "optical", "empty"):
+            volume['Skipped'] = f"{kind} volume"
+            volumes.append(volume)
+            continue
+
+        timeout = REMOVABLE_TIMEOUT if kind == "removable" else FIXED_TIMEOUT
+        try:
+            usage = disk_usage_with_timeout(partition.mountpoint, timeout)
+        except OSError as e:
+            volume['Skipped'] = e.strerror or type(e).__name__
+            volumes.append(volume)
+            continue
+        if usage is None:
+            volume['Skipped'] = f"no response within {timeout:g}s"
+        else:
+            volume['Total'] = usage.total
+            volume['Free'] = usage.free
+            volume['Used'] = usage.used
+        volumes.append(volume)
+    return volumes
+
+
+def describe_volume(volume: Dict) -> str:
+    """One-line summary such as 'C:\\ NTFS - 120 GB free of 475 GB'"""
+    if 'Skipped' in volume:
+        return f"{volume['Mount']} - skipped ({volume['Skipped']})"
+    return (f"{volume['Mount']} {volume['FileSystem']} - "
+            f"{volume['Free'] // (1024**3)} GB free of {volume['Total'] // (1024**3)} GB")
+
+
+def partition_storage_info(volumes: List[Dict]) -> Dict:
+    """Per-volume storage info for when physical disks cannot be enumerated"""
+    storage_info = {}
+    for volume in volumes:
+        if 'Skipped' in volume:
+            continue
+        storage_info[f'Drive_{len(storage_info) + 1}'] = {
+            'Device': volume['Device'],
+            'FileSystem': volume['FileSystem'],
+            'Removable': "Yes" if volume['Kind'] == "removable" else "No",
+            'Total': f"{volume['Total'] // (1024**3)} GB",
+            'Free': f"{volume['Free'] // (1024**3)} GB",
+            'Used': f"{volume['Used'] // (1024**3)} GB",
+        }
+    return storage_info
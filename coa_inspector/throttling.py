@@ -0,0 +1,240 @@
+"""Sustained-load throttling test
+
+Short benchmarks finish before a thin laptop heats up. This test keeps
+every logical processor busy with the CPU benchmark kernel for a set
+duration while a sampler thread records, once per interval, the clock of
+each CPU, total CPU load, the hottest temperature sensor and the fastest
+fan, together with the work the load processes completed in that interval.
+The load processes credit a shared counter after every small chunk of
+work, so each sample counts the work actually done inside its window.
+
+Throttling shows up as throughput and clock falling from their peak to a
+lower steady state. Both are medians over a third of the run: the peak is
+the best such window, the steady state the last one. A drop only counts
+as throttling when there are enough samples and it is well above the
+sample-to-sample spread of the run, so a noisy machine with a fixed clock
+is not flagged.
+
+psutil reports temperatures and fans on Linux only, and Windows exposes a
+single fixed clock, so on Windows the throughput series is what reveals
+throttling.
+"""
+import multiprocessing
+import statistics
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import psutil
+
+from coa_inspector.cpu_benchmark import compute_kernel
+
+DEFAULT_DURATION = 120
+SAMPLE_INTERVAL = 1.0
+
+# Iterations between credits to the shared counter; a few milliseconds of
+# work, so a sample's count is off by at most one chunk per worker
+CHUNK_ITERATIONS = 50_000
+
+# Fraction of peak throughput lost at steady state
+MODERATE_THROTTLING = 0.10
+HEAVY_THROTTLING = 0.25
+
+# Fewer samples than this (after the ramp-up sample) give no verdict
+MIN_SAMPLES = 9
+
+# A drop from peak to steady state smaller than this many times the
+# sample-to-sample spread is treated as noise (shared or virtual machines
+# drift by more than their per-second jitter)
+NOISE_MULTIPLE = 3.0
+
+_work_counter = None
+_stop_event = None
+
+
+def _init_load_worker(work_counter, stop_event):
+    global _work_counter, _stop_event
+    _work_counter, _stop_event = work_counter, stop_event
+
+
+def sustain_load(max_seconds: float, chunk_iterations: int = CHUNK_ITERATIONS) -> int:
+    """Load process: run the kernel until stopped, crediting the shared counter after each chunk"""
+    deadline = time.perf_counter() + max_seconds
+    iterations = 0
+    while not _stop_event.is_set() and time.perf_counter() < deadline:
+        compute_kernel(chunk_iterations)
+        iterations += chunk_iterations
+        with _work_counter.get_lock():
+            _work_counter.value += chunk_iterations
+    return iterations
+
+
+def _hottest(temperatures: Dict) -> Optional[float]:
+    readings = [sensor.current for sensors in temperatures.values() for sensor in sensors if sensor.current]
+    return max(readings) if readings else None
+
+
+def _fastest_fan(fans: Dict) -> Optional[int]:
+    readings = [fan.current for entries in fans.values() for fan in entries]
+    return max(readings) if readings else None
+
+
+class LoadSampler(threading.Thread):
+    """Records clocks, load, temperature, fans and throughput every interval"""
+
+    def __init__(self, read_work: Callable[[], int], interval: float = SAMPLE_INTERVAL):
+        super().__init__(name="throttle-sampler", daemon=True)
+        self.read_work = read_work  # iterations completed so far by all load processes
+        self.interval = interval
+        self.samples: List[Dict] = []
+        self.stop_event = threading.Event()
+
+    def take_sample(self, elapsed: float, iterations: int, seconds: float) -> Dict:
+        frequencies = [freq.current for freq in (psutil.cpu_freq(percpu=True) or [])]
+        sample = {
+            'time': round(elapsed, 2),
+            'frequency_mhz': statistics.mean(frequencies) if frequencies else None,
+            'frequency_per_cpu': frequencies,
+            'cpu_percent': psutil.cpu_percent(interval=None),
+            'temperature_c': None,
+            'fan_rpm': None,
+            'throughput_mops': iterations / seconds / 1e6,
+        }
+        if hasattr(psutil, 'sensors_temperatures'):
+            sample['temperature_c'] = _hottest(psutil.sensors_temperatures())
+        if hasattr(psutil, 'sensors_fans'):
+            sample['fan_rpm'] = _fastest_fan(psutil.sensors_fans())
+        return sample
+
+    def run(self):
+        psutil.cpu_percent(interval=None)  # Start the load measurement
+        started = last = time.perf_counter()
+        last_work = self.read_work()
+        while not self.stop_event.wait(self.interval):
+            now = time.perf_counter()
+            work = self.read_work()
+            self.samples.append(self.take_sample(now - started, work - last_work, now - last))
+            last, last_work = now, work
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+
+
+@dataclass
+class ThrottlingResult:
+    """Time series plus peak (best third) and steady-state (last third) medians"""
+    duration: float = 0.0
+    workers: int = 0
+    samples: List[Dict] = field(default_factory=list)
+    peak_frequency_mhz: Optional[float] = None
+    steady_frequency_mhz: Optional[float] = None
+    peak_throughput_mops: float = 0.0
+    steady_throughput_mops: float = 0.0
+    throughput_spread_mops: float = 0.0  # median change between consecutive samples
+    throttling_ratio: float = 0.0  # fraction of peak throughput lost at steady state
+    peak_temperature_c: Optional[float] = None
+    max_fan_rpm: Optional[int] = None
+    verdict: str = ""
+    cancelled: bool = False
+
+    def as_dict(self) -> Dict:
+        return asdict(self)
+
+
+def _peak_and_steady(values: List[Optional[float]]):
+    """Highest median over any third of the run, and the median of the last third"""
+    values = [value for value in values if value]
+    if not values:
+        return None, None
+    window = max(1, len(values) // 3)
+    medians = [statistics.median(values[i:i + window]) for i in range(len(values) - window + 1)]
+    return max(medians), medians[-1]
+
+
+def _spread(values: List[float]) -> float:
+    """Median absolute change between consecutive samples"""
+    changes = [abs(b - a) for a, b in zip(values, values[1:])]
+    return statistics.median(changes) if changes else 0.0
+
+
+def summarize_samples(result: ThrottlingResult):
+    """Fill in the peak, steady-state and verdict fields from result.samples"""
+    # The first sample includes the load ramping up
+    samples = result.samples[1:] or result.samples
+    result.peak_frequency_mhz, result.steady_frequency_mhz = _peak_and_steady(
+        [sample['frequency_mhz'] for sample in samples])
+    throughput = [sample['throughput_mops'] for sample in samples]
+    peak, steady = _peak_and_steady(throughput)
+    result.peak_throughput_mops, result.steady_throughput_mops = peak or 0.0, steady or 0.0
+    result.throughput_spread_mops = _spread(throughput)
+    result.throttling_ratio = max(0.0, 1 - steady / peak) if peak else 0.0
+    temperatures = [sample['temperature_c'] for sample in samples if sample['temperature_c'] is not None]
+    result.peak_temperature_c = max(temperatures) if temperatures else None
+    fans = [sample['fan_rpm'] for sample in samples if sample['fan_rpm'] is not None]
+    result.max_fan_rpm = max(fans) if fans else None
+
+    if len(samples) < MIN_SAMPLES:
+        result.verdict = "Too few samples to judge throttling"
+    elif result.peak_throughput_mops - result.steady_throughput_mops <= NOISE_MULTIPLE * result.throughput_spread_mops:
+        result.verdict = "No significant throttling"
+    elif result.throttling_ratio >= HEAVY_THROTTLING:
+        result.verdict = "Heavy throttling"
+    elif result.throttling_ratio >= MODERATE_THROTTLING:
+        result.verdict = "Moderate throttling"
+    else:
+        result.verdict = "No significant throttling"
+
+
+def run_throttling_test(duration: float = DEFAULT_DURATION, workers: Optional[int] = None,
+                        interval: float = SAMPLE_INTERVAL,
+                        on_progress: Optional[Callable[[str], None]] = None,
+                        cancel_event: Optional[threading.Event] = None) -> ThrottlingResult:
+    """Load every logical processor for duration seconds and sample how the laptop copes"""
+    workers = workers or psutil.cpu_count(logical=True) or 1
+    cancel_event = cancel_event or threading.Event()
+    result = ThrottlingResult(duration=duration, workers=workers)
+    context = multiprocessing.get_context('spawn')
+    work_counter, stop_event = context.Value('q', 0), context.Event()
+    sampler = LoadSampler(lambda: work_counter.value, interval)
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_load_worker,
+                             initargs=(work_counter, stop_event)) as pool:
+        # Start every process before the clock starts
+        wait([pool.submit(sustain_load, 0.1) for _ in range(workers)])
+        if on_progress is not None:
+            on_progress(f"Sustained load: {workers} workers for {duration:g}s")
+
+        sampler.start()
+        load = [pool.submit(sustain_load, duration + interval) for _ in range(workers)]
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline and not cancel_event.wait(min(interval, deadline - time.perf_counter())):
+            pass
+        result.cancelled = cancel_event.is_set()
+        sampler.stop()
+        stop_event.set()
+        wait(load)
+
+    result.samples = sampler.samples
+    summarize_samples(result)
+    return result
+
+
+def format_throttling_result(result: ThrottlingResult) -> List[str]:
+    lines = [f"Sustained Load Test ({result.duration:g}s, {result.workers} workers)"]
+    if result.peak_frequency_mhz:
+        lines.append(f"  Frequency: peak {result.peak_frequency_mhz:.0f} MHz, "
+                     f"steady {result.steady_frequency_mhz:.0f} MHz")
+    lines.append(f"  Throughput: peak {result.peak_throughput_mops:.1f} Mops/s, "
+                 f"steady {result.steady_throughput_mops:.1f} Mops/s "
+                 f"(samples vary by {result.throughput_spread_mops:.1f})")
+    lines.append(f"  Throttling: {result.throttling_ratio:.0%} below peak - {result.verdict}")
+    if result.peak_temperature_c is not None:
+        lines.append(f"  Peak temperature: {result.peak_temperature_c:.0f} °C")
+    if result.max_fan_rpm is not None:
+        lines.append(f"  Max fan speed: {result.max_fan_rpm} RPM")
+    if result.cancelled:
+        lines.append("  Cancelled - results are partial")
+    return lines
@@ -0,0 +1,212 @@
+"""LAN throughput test against a bench server
+
+The inspection network is isolated, so internet speed tests are of no use
+there. ThroughputServer is a small TCP sink and source that runs on a bench
+machine (`python main.py throughput-server`); run_throughput_test()
+opens several parallel streams to it and reports Mbps per stream and in
+aggregate, which shows whether a laptop's Ethernet or Wi-Fi adapter
+reaches its rated speed.
+
+Each stream is one connection that starts with a request line:
+
+    UPLOAD\\n             client sends until it shuts down its side; the
+                         server answers "<bytes received>\\n"
+    DOWNLOAD <seconds>\\n  server sends for that many seconds and closes
+
+Upload speed is computed from the bytes the server received, so data still
+sitting in the client's socket buffer is not counted. Cancelling shuts the
+stream sockets down, so a stream blocked on a stalled server returns at
+once instead of after the socket timeout.
+"""
+import socket
+import socketserver
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+DEFAULT_PORT = 5201
+DEFAULT_STREAMS = 4
+DEFAULT_DURATION = 10.0
+MAX_DURATION = 120.0
+
+CHUNK_SIZE = 128 * 1024
+CONNECT_TIMEOUT = 5.0
+# Seconds between checks of the cancel event while streams run
+CANCEL_POLL_INTERVAL = 0.1
+
+DIRECTION_DOWNLOAD = "download"
+DIRECTION_UPLOAD = "upload"
+
+
+class _StreamHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        try:
+            self.serve_stream()
+        except (OSError, ValueError):
+            pass  # Client went away or sent garbage; nothing to report on a bench server
+
+    def serve_stream(self):
+        self.request.settimeout(MAX_DURATION + CONNECT_TIMEOUT)
+        reader = self.request.makefile('rb')
+        command = reader.readline(64).decode('ascii', 'replace').split()
+        if command[:1] == ['UPLOAD']:
+            received = 0
+            while True:
+                chunk = reader.read1(CHUNK_SIZE)
+                if not chunk:
+                    break
+                received += len(chunk)
+            self.request.sendall(f"{received}\n".encode('ascii'))
+        elif command[:1] == ['DOWNLOAD'] and len(command) == 2:
+            payload = bytes(CHUNK_SIZE)
+            deadline = time.perf_counter() + min(float(command[1]), MAX_DURATION)
+            while time.perf_counter() < deadline:
+                self.request.sendall(payload)
+
+
+class ThroughputServer(socketserver.ThreadingTCPServer):
+    """Sink/source for run_throughput_test(); one thread per stream"""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "0.0.0.0", port: int = DEFAULT_PORT):
+        super().__init__((host, port), _StreamHandler)
+
+
+@dataclass
+class StreamResult:
+    direction: str
+    bytes: int = 0
+    seconds: float = 0.0
+    mbps: float = 0.0
+    error: str = ""
+
+
+@dataclass
+class ThroughputResult:
+    """Per-stream and aggregate Mbps for each direction tested"""
+    server: str = ""
+    streams: int = 0
+    duration: float = 0.0
+    streams_by_direction: Dict[str, List[Dict]] = field(default_factory=dict)
+    aggregate_mbps: Dict[str, float] = field(default_factory=dict)
+    cancelled: bool = False
+
+    def as_dict(self) -> Dict:
+        return asdict(self)
+
+
+def _connect(host: str, port: int, request: str, sockets: List[socket.socket]) -> socket.socket:
+    sock = socket.create_connection((host, port), timeout=CONNECT_TIMEOUT)
+    sockets.append(sock)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.settimeout(MAX_DURATION + CONNECT_TIMEOUT)
+    sock.sendall(request.encode('ascii'))
+    return sock
+
+
+def _download(host: str, port: int, duration: float, cancel_event: threading.Event,
+              sockets: List[socket.socket]) -> StreamResult:
+    result = StreamResult(DIRECTION_DOWNLOAD)
+    buffer = bytearray(CHUNK_SIZE)
+    with _connect(host, port, f"DOWNLOAD {duration}\n", sockets) as sock:
+        started = time.perf_counter()
+        while not cancel_event.is_set():
+            count = sock.recv_into(buffer)
+            if not count:
+                break
+            result.bytes += count
+        result.seconds = time.perf_counter() - started
+    return result
+
+
+def _upload(host: str, port: int, duration: float, cancel_event: threading.Event,
+            sockets: List[socket.socket]) -> StreamResult:
+    result = StreamResult(DIRECTION_UPLOAD)
+    payload = bytes(CHUNK_SIZE)
+    with _connect(host, port, "UPLOAD\n", sockets) as sock:
+        started = time.perf_counter()
+        deadline = started + duration
+        while time.perf_counter() < deadline and not cancel_event.is_set():
+            sock.sendall(payload)
+        sock.shutdown(socket.SHUT_WR)
+        reply = sock.makefile('rb').readline(32)
+        result.seconds = time.perf_counter() - started
+    result.bytes = int(reply or 0)
+    return result
+
+
+def _run_streams(host: str, port: int, streams: int, duration: float, direction: str,
+                 cancel_event: threading.Event) -> List[StreamResult]:
+    """Start every stream at once and wait for all of them"""
+    transfer = _download if direction == DIRECTION_DOWNLOAD else _upload
+    results = [StreamResult(direction) for _ in range(streams)]
+    sockets: List[socket.socket] = []
+    start = threading.Barrier(streams)
+
+    def stream(index: int):
+        try:
+            start.wait(CONNECT_TIMEOUT)
+            results[index] = transfer(host, port, duration, cancel_event, sockets)
+        except (OSError, ValueError, threading.BrokenBarrierError) as e:
+            results[index].error = str(e) or type(e).__name__
+
+    threads = [threading.Thread(target=stream, args=(index,), name=f"throughput-{index}", daemon=True)
+               for index in range(streams)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        while thread.is_alive():
+            if cancel_event.is_set():
+                # Wakes streams blocked in recv or send; repeated for streams still connecting
+                for sock in list(sockets):
+                    try:
+                        sock.shutdown(socket.SHUT_RDWR)
+                    except OSError:
+                        pass
+            thread.join(CANCEL_POLL_INTERVAL)
+    for result in results:
+        if result.seconds:
+            result.mbps = result.bytes * 8 / result.seconds / 1e6
+    return results
+
+
+def run_throughput_test(host: str, port: int = DEFAULT_PORT, streams: int = DEFAULT_STREAMS,
+                        duration: float = DEFAULT_DURATION,
+                        directions: Sequence[str] = (DIRECTION_DOWNLOAD, DIRECTION_UPLOAD),
+                        on_progress: Optional[Callable[[str], None]] = None,
+                        cancel_event: Optional[threading.Event] = None) -> ThroughputResult:
+    """Measure throughput to a ThroughputServer with parallel streams, one direction at a time
+
+    Aggregate Mbps is the bytes of all streams over the longest stream's time.
+    """
+    cancel_event = cancel_event or threading.Event()
+    duration = min(duration, MAX_DURATION)
+    result = ThroughputResult(server=f"{host}:{port}", streams=streams, duration=duration)
+    for direction in directions:
+        if cancel_event.is_set():
+            break
+        if on_progress is not None:
+            on_progress(f"Throughput: {direction}, {streams} stream{'s' if streams > 1 else ''} for {duration:g}s")
+        stream_results = _run_streams(host, port, streams, duration, direction, cancel_event)
+        result.streams_by_direction[direction] = [asdict(stream) for stream in stream_results]
+        seconds = max(stream.seconds for stream in stream_results)
+        total = sum(stream.bytes for stream in stream_results)
+        result.aggregate_mbps[direction] = total * 8 / seconds / 1e6 if seconds else 0.0
+    result.cancelled = cancel_event.is_set()
+    return result
+
+
+def format_throughput_result(result: ThroughputResult) -> List[str]:
+    lines = [f"LAN Throughput ({result.server}, {result.streams} streams, {result.duration:g}s)"]
+    for direction, streams in result.streams_by_direction.items():
+        lines.append(f"  {direction.capitalize()}: {result.aggregate_mbps[direction]:.1f} Mbps aggregate")
+        for index, stream in enumerate(streams, 1):
+            if stream['error']:
+                lines.append(f"    Stream {index}: failed - {stream['error']}")
+            else:
+                lines.append(f"    Stream {index}: {stream['mbps']:.1f} Mbps")
+    if result.cancelled:
+        lines.append("  Cancelled - results are partial")
+    return lines
@@ -0,0 +1,162 @@
+"""Purchase request validation of detected hardware specs
+
+Each validate_* function compares one PR requirement against the detected
+specs with "equal or better" logic and returns a result dict with
+component, status (PASS/FAIL/WARNING/CHECK) and details.
+"""
+import re
+from typing import Dict, List, Tuple
+
+
+def validate_specs(detected: Dict, pr_specs: Dict) -> Tuple[List[Dict], str]:
+    """Validate CPU, RAM and storage; returns the results and the overall status
+
+    pr_specs holds the PR text under 'cpu', 'ram' and 'storage'.
+    """
+    validation_results = [
+        validate_cpu(pr_specs.get('cpu', ''), detected['CPU']),
+        validate_ram(pr_specs.get('ram', ''), detected['RAM']),
+        validate_storage(pr_specs.get('storage', ''), detected['Storage']),
+    ]
+    overall_status = "FAIL" if any(result['status'] == "FAIL" for result in validation_results) else "PASS"
+    return validation_results, overall_status
+
+
+def validate_cpu(pr_cpu: str, actual_cpu: Dict) -> Dict:
+    """Validate CPU specifications with 'equal or better' logic"""
+    if not pr_cpu:
+        return {'component': 'CPU', 'status': 'PASS', 'details': 'No PR specification provided'}
+
+    actual_name = actual_cpu['Name'].upper()
+    pr_upper = pr_cpu.upper()
+
+    # CPU tier comparison (higher is better)
+    cpu_tiers = {
+        'I9': 9, 'RYZEN 9': 9,
+        'I7': 7, 'RYZEN 7': 7, 'CORE I7': 7,
+        'I5': 5, 'RYZEN 5': 5, 'CORE I5': 5,
+        'I3': 3, 'RYZEN 3': 3, 'CORE I3': 3
+    }
+
+    pr_tier = None
+    actual_tier = None
+
+    for cpu_name, tier_value in cpu_tiers.items():
+        if cpu_name in pr_upper:
+            pr_tier = tier_value
+        if cpu_name in actual_name:
+            actual_tier = tier_value
+
+    # If we can compare tiers
+    if pr_tier and actual_tier:
+        if actual_tier >= pr_tier:
+            return {
+                'component': 'CPU',
+                'status': 'PASS',
+                'details': f"✓ Actual CPU (tier {actual_tier}) meets or exceeds PR requirement (tier {pr_tier})"
+            }
+        else:
+            return {
+                'component': 'CPU',
+                'status': 'FAIL',
+                'details': f"✗ Actual CPU (tier {actual_tier}) is below PR requirement (tier {pr_tier})"
+            }
+
+    # Fallback to string matching
+    if pr_upper in actual_name:
+        return {'component': 'CPU', 'status': 'PASS', 'details': f"✓ Exact match: {actual_name}"}
+    else:
+        return {
+            'component': 'CPU',
+            'status': 'WARNING',
+            'details': f"⚠ Cannot verify: PR: {pr_cpu}, Actual: {actual_name}"
+        }
+
+
+def validate_ram(pr_ram: str, actual_ram: Dict) -> Dict:
+    """Validate RAM specifications with 'equal or better' logic"""
+    if not pr_ram:
+        return {'component': 'RAM', 'status': 'PASS', 'details': 'No PR specification provided'}
+
+    try:
+        # Extract numbers from strings
+        pr_gb = extract_gb(pr_ram)
+        actual_gb = extract_gb(actual_ram['Total'])
+
+        if pr_gb and actual_gb:
+            if actual_gb >= pr_gb:
+                status_icon = "✓" if actual_gb == pr_gb else "✓✓"
+                extra = f" (exceeds by {actual_gb - pr_gb}GB)" if actual_gb > pr_gb else ""
+                return {
+                    'component': 'RAM',
+                    'status': 'PASS',
+                    'details': f"{status_icon} Actual ({actual_gb}GB) meets or exceeds PR requirement ({pr_gb}GB){extra}"
+                }
+            else:
+                return {
+                    'component': 'RAM',
+                    'status': 'FAIL',
+                    'details': f"✗ Actual ({actual_gb}GB) is {pr_gb - actual_gb}GB less than PR requirement ({pr_gb}GB)"
+                }
+    except:
+        pass
+
+    return {
+        'component': 'RAM',
+        'status': 'WARNING',
+        'details': f"⚠ Could not validate: PR: {pr_ram}, Actual: {actual_ram['Total']}"
+    }
+
+
+def validate_storage(pr_storage: str, actual_storage: Dict) -> Dict:
+    """Validate storage specifications"""
+    if not pr_storage:
+        return {'component': 'Storage', 'status': 'PASS', 'details': 'No PR specification provided'}
+
+    try:
+        pr_gb = extract_gb(pr_storage)
+        if not pr_gb:
+            return {'component': 'Storage', 'status': 'CHECK', 'details': 'Could not parse PR storage spec'}
+
+        total_actual_gb = internal_storage_gb(actual_storage)
+
+        if total_actual_gb >= pr_gb:
+            return {
+                'component': 'Storage',
+                'status': 'PASS',
+                'details': f"Actual ({total_actual_gb}GB) meets PR requirement ({pr_gb}GB)"
+            }
+        else:
+            return {
+                'component': 'Storage',
+                'status': 'FAIL',
+                'details': f"Actual ({total_actual_gb}GB) less than PR requirement ({pr_gb}GB)"
+            }
+
+    except Exception as e:
+        return {
+            'component': 'Storage',
+            'status': 'CHECK',
+            'details': f"Validation error: {str(e)}"
+        }
+
+
+def internal_storage_gb(actual_storage: Dict) -> int:
+    """Total size of the laptop's own disks, leaving out USB sticks and SD cards"""
+    drives = [info for info in actual_storage.values() if isinstance(info, dict) and 'Total' in info]
+    internal = [info for info in drives
+                if info.get('Removable') != "Yes" and info.get('Bus') not in ("USB", "SD", "MMC")]
+    total_gb = 0
+    for info in internal or drives:
+        drive_gb = extract_gb(info['Total'])
+        if drive_gb:
+            total_gb += drive_gb
+    return total_gb
+
+
+def extract_gb(text: str) -> int:
+    """Extract GB number from text"""
+    if not text:
+        return None
+    match = re.search(r'(\d+)\s*GB?', text.upper())
+    return int(match.group(1)) if match else None
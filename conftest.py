@@ -0,0 +1 @@
+# Lets pytest import coa_inspector from the repository root without installing it
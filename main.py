@@ -1,33 +1,67 @@
 import sys
+import multiprocessing
+
+# Worker processes of the CPU benchmark start here in the frozen executable
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+
+# Created before anything heavy is imported; see --startup-trace
+from coa_inspector.startup import StartupTrace
+STARTUP_TRACE = StartupTrace()
+
 import platform
 import psutil
 import sqlite3
 import json
 from datetime import datetime
 from pathlib import Path
-import subprocess
-import re
 import time
 import random
 import hashlib
 import base64
+import threading
+import html
 from typing import Dict, List, Tuple, Optional
+STARTUP_TRACE.mark("import standard library, psutil")
+
+# Headless commands (main.py detect / inspect / startup-benchmark / throughput-server / check-db) never load Qt
+if __name__ == "__main__" and len(sys.argv) > 1 and sys.argv[1] in ('detect', 'inspect', 'startup-benchmark',
+                                                                    'throughput-server', 'check-db'):
+    from coa_inspector.cli import main as cli_main
+    sys.exit(cli_main(sys.argv[1:]))
+
 from PySide6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
                               QWidget, QPushButton, QLabel, QTabWidget, QTextEdit, 
                               QTableWidget, QTableWidgetItem, QGroupBox, QLineEdit,
                               QComboBox, QSpinBox, QDoubleSpinBox, QCheckBox,
                               QDateEdit, QFormLayout, QMessageBox, QSplitter,
                               QHeaderView, QProgressBar, QListWidget, QListWidgetItem,
-                              QDialog, QDialogButtonBox, QTextBrowser, QFileDialog)
-from PySide6.QtCore import Qt, QDate, QTimer
+                              QDialog, QDialogButtonBox, QTextBrowser, QFileDialog, QInputDialog)
+from PySide6.QtCore import Qt, QDate, QTimer, QObject, QThread, Signal
 from PySide6.QtGui import QFont, QPixmap, QPainter
-import pandas as pd
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+STARTUP_TRACE.mark("import PySide6")
+# pandas, reportlab and NumPy (coa_inspector.performance) are imported on
+# first use; loading them here cost seconds per launch
+from coa_inspector.probes import PROBE_OK, PROBE_ERROR, PROBE_CANCELLED
+from coa_inspector.metrics import summarize_metrics, format_metrics_report
+from coa_inspector.detection import HardwareDetector, SPEC_CATEGORIES, format_specs
+from coa_inspector.validation import validate_specs
+from coa_inspector.comparison import compare_inspection, status_counts
+from coa_inspector.model import Inspection
+from coa_inspector.database import InspectionDatabase
+from coa_inspector.reports import report_filename, write_pdf_report, write_excel_report
+from coa_inspector.disk_benchmark import DEFAULT_FILE_SIZE, benchmark_targets
+from coa_inspector.throughput import (DEFAULT_PORT as THROUGHPUT_PORT, DEFAULT_STREAMS as THROUGHPUT_STREAMS,
+                                      DEFAULT_DURATION as THROUGHPUT_DURATION,
+                                      MAX_DURATION as THROUGHPUT_MAX_DURATION, DIRECTION_DOWNLOAD,
+                                      DIRECTION_UPLOAD, run_throughput_test, format_throughput_result)
+from coa_inspector.latency import (DEFAULT_ROUNDS as LATENCY_ROUNDS, load_probe_targets, run_latency_probes,
+                                   format_latency_report)
+from coa_inspector.throttling import DEFAULT_DURATION as DEFAULT_THROTTLING_DURATION
+from coa_inspector.harness import BenchmarkHarness, DEFAULT_REPETITIONS
+from coa_inspector.reference import (REFERENCE_FILE, SECTION_CPU, SECTION_LAPTOP_MODEL, ReferenceTable,
+                                     reference_summary)
+STARTUP_TRACE.mark("import coa_inspector")
 
 class LoginDialog(QDialog):
     """Simple login dialog with encrypted password storage"""
@@ -204,7 +238,7 @@ class LoginDialog(QDialog):
             creds_file.write_text(encoded)
             return True
         except Exception as e:
-            print(f"Error saving credentials: {e}")
+            print(f"Error saving credentials: {e}", file=sys.stderr)
             return False
     
     def verify_credentials(self, username: str, password: str) -> bool:
@@ -220,7 +254,7 @@ class LoginDialog(QDialog):
             return (credentials['username'] == username and 
                     credentials['password'] == self.hash_password(password))
         except Exception as e:
-            print(f"Error verifying credentials: {e}")
+            print(f"Error verifying credentials: {e}", file=sys.stderr)
             return False
 
 class DigitalSignatureDialog(QDialog):
@@ -556,15 +590,85 @@ class PendingInspectionDialog(QDialog):
             'pr_notes': self.pr_notes.text().strip()
         }
 
+class ThroughputWorker(QObject):
+    """Runs the LAN throughput test off the GUI thread"""
+    progress = Signal(str)
+    finished = Signal(object)
+    failed = Signal(str)
+    
+    def __init__(self, host: str, port: int, streams: int, duration: float, directions: List[str]):
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.streams = streams
+        self.duration = duration
+        self.directions = directions
+        self.cancel_event = threading.Event()
+    
+    def run(self):
+        try:
+            result = run_throughput_test(self.host, self.port, self.streams, self.duration, self.directions,
+                                         on_progress=self.progress.emit, cancel_event=self.cancel_event)
+            self.finished.emit(result)
+        except Exception as e:
+            self.failed.emit(str(e))
+    
+    def cancel(self):
+        self.cancel_event.set()
+
+class LatencyWorker(QObject):
+    """Runs the latency probe suite off the GUI thread, streaming each target's statistics"""
+    update = Signal(object)
+    finished = Signal(object)
+    failed = Signal(str)
+    
+    def __init__(self, tcp_targets: List[Tuple[str, int]], dns_names: List[str],
+                 dns_servers: List[Tuple[str, int]], rounds: int):
+        super().__init__()
+        self.tcp_targets = tcp_targets
+        self.dns_names = dns_names
+        self.dns_servers = dns_servers
+        self.rounds = rounds
+        self.cancel_event = threading.Event()
+    
+    def run(self):
+        try:
+            report = run_latency_probes(self.tcp_targets, self.dns_names, self.dns_servers, self.rounds,
+                                        on_update=self.update.emit, cancel_event=self.cancel_event)
+            self.finished.emit(report)
+        except Exception as e:
+            self.failed.emit(str(e))
+    
+    def cancel(self):
+        self.cancel_event.set()
+
 class NetworkTestDialog(QDialog):
-    def __init__(self, parent=None):
+    LATENCY_COLUMNS = ["Target", "Sent", "Loss", "Min ms", "Avg ms", "p95 ms", "Jitter ms"]
+    
+    def __init__(self, parent=None, targets_path: Optional[Path] = None):
         super().__init__(parent)
         self.setWindowTitle("Network Connectivity Test")
         self.setModal(True)
-        self.setFixedSize(500, 400)
+        self.setFixedSize(640, 720)
+        self.targets_path = targets_path or Path("connectivity_targets.json")
+        self.throughput_thread = None
+        self.throughput_worker = None
+        self.throughput_result = None
+        self.latency_thread = None
+        self.latency_worker = None
+        self.latency_report = None
+        self.latency_rows = {}
         
         layout = QVBoxLayout()
         
+        # One row per probed target, updated after each of its attempts
+        self.latency_table = QTableWidget(0, len(self.LATENCY_COLUMNS))
+        self.latency_table.setHorizontalHeaderLabels(self.LATENCY_COLUMNS)
+        self.latency_table.horizontalHeader().setStretchLastSection(True)
+        self.latency_table.verticalHeader().hide()
+        self.latency_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.latency_table)
+        
         self.results_text = QTextEdit()
         self.results_text.setReadOnly(True)
         layout.addWidget(self.results_text)
@@ -572,51 +676,253 @@ class NetworkTestDialog(QDialog):
         self.progress_bar = QProgressBar()
         layout.addWidget(self.progress_bar)
         
+        probe_layout = QHBoxLayout()
+        probe_layout.addWidget(QLabel("Attempts per target:"))
+        self.latency_rounds = QSpinBox()
+        self.latency_rounds.setRange(1, 100)
+        self.latency_rounds.setValue(LATENCY_ROUNDS)
+        probe_layout.addWidget(self.latency_rounds)
+        probe_layout.addStretch()
+        layout.addLayout(probe_layout)
+        
         self.test_button = QPushButton("Run Comprehensive Network Tests")
         self.test_button.clicked.connect(self.run_network_tests)
         layout.addWidget(self.test_button)
         
+        # LAN throughput against a bench machine running `main.py throughput-server`
+        throughput_group = QGroupBox("LAN Throughput")
+        throughput_layout = QFormLayout()
+        throughput_group.setLayout(throughput_layout)
+        
+        self.throughput_host = QLineEdit()
+        self.throughput_host.setPlaceholderText("Bench server address, e.g. 192.168.1.10")
+        throughput_layout.addRow("Server:", self.throughput_host)
+        self.throughput_port = QSpinBox()
+        self.throughput_port.setRange(1, 65535)
+        self.throughput_port.setValue(THROUGHPUT_PORT)
+        throughput_layout.addRow("Port:", self.throughput_port)
+        self.throughput_streams = QSpinBox()
+        self.throughput_streams.setRange(1, 16)
+        self.throughput_streams.setValue(THROUGHPUT_STREAMS)
+        throughput_layout.addRow("Parallel streams:", self.throughput_streams)
+        self.throughput_duration = QSpinBox()
+        self.throughput_duration.setRange(2, int(THROUGHPUT_MAX_DURATION))
+        self.throughput_duration.setValue(int(THROUGHPUT_DURATION))
+        self.throughput_duration.setSuffix(" s")
+        throughput_layout.addRow("Duration:", self.throughput_duration)
+        self.throughput_direction = QComboBox()
+        self.throughput_direction.addItems(["Download and upload", "Download", "Upload"])
+        throughput_layout.addRow("Direction:", self.throughput_direction)
+        self.throughput_button = QPushButton("Run Throughput Test")
+        self.throughput_button.clicked.connect(self.run_throughput_test)
+        throughput_layout.addRow(self.throughput_button)
+        layout.addWidget(throughput_group)
+        
         buttons = QDialogButtonBox(QDialogButtonBox.Close)
         buttons.rejected.connect(self.reject)
         layout.addWidget(buttons)
         
         self.setLayout(layout)
     
+    def run_throughput_test(self):
+        """Start the throughput test on a background thread"""
+        host = self.throughput_host.text().strip()
+        if not host:
+            QMessageBox.warning(self, "Server Required", "Enter the address of the bench throughput server.")
+            return
+        directions = {
+            "Download": [DIRECTION_DOWNLOAD],
+            "Upload": [DIRECTION_UPLOAD],
+        }.get(self.throughput_direction.currentText(), [DIRECTION_DOWNLOAD, DIRECTION_UPLOAD])
+        
+        self.throughput_button.setEnabled(False)
+        self.results_text.append(f"\nTesting throughput to {host}...")
+        self.throughput_thread = QThread(self)
+        self.throughput_worker = ThroughputWorker(host, self.throughput_port.value(), self.throughput_streams.value(),
+                                                  self.throughput_duration.value(), directions)
+        self.throughput_worker.moveToThread(self.throughput_thread)
+        self.throughput_thread.started.connect(self.throughput_worker.run)
+        self.throughput_worker.progress.connect(self.results_text.append)
+        self.throughput_worker.finished.connect(self.on_throughput_finished)
+        self.throughput_worker.failed.connect(self.on_throughput_failed)
+        self.throughput_thread.start()
+    
+    def on_throughput_finished(self, result):
+        self.finish_throughput_test()
+        self.throughput_result = result
+        self.results_text.append("\n".join(format_throughput_result(result)))
+    
+    def on_throughput_failed(self, error: str):
+        self.finish_throughput_test()
+        self.results_text.append(f"✗ Throughput test error: {error}")
+    
+    def finish_throughput_test(self):
+        self.throughput_thread.quit()
+        self.throughput_thread.wait()
+        self.throughput_worker.deleteLater()
+        self.throughput_thread.deleteLater()
+        self.throughput_thread = None
+        self.throughput_worker = None
+        self.throughput_button.setEnabled(True)
+    
+    def done(self, result: int):
+        """Stop running tests before the dialog closes"""
+        # Cancelling shuts the throughput sockets down and stops the latency
+        # probes after their current attempt, so the threads end within
+        # these waits even when a server has stalled
+        for thread, worker, wait_ms in ((self.throughput_thread, self.throughput_worker, 2000),
+                                        (self.latency_thread, self.latency_worker, 3000)):
+            if thread is not None:
+                worker.cancel()
+                thread.quit()
+                thread.wait(wait_ms)
+        super().done(result)
+    
     def run_network_tests(self):
-        self.results_text.setText("Running network tests...\n")
-        self.progress_bar.setValue(25)
-        QApplication.processEvents()
+        """List the interfaces, then start the latency probes on a background thread"""
+        self.results_text.setText("=== Network Interfaces ===")
+        interfaces = psutil.net_if_addrs()
+        stats = psutil.net_if_stats()
+        for interface, addrs in interfaces.items():
+            status = "UP" if interface in stats and stats[interface].isup else "DOWN"
+            self.results_text.append(f"{interface}: {status}")
+            for addr in addrs:
+                if addr.family == 2:  # IPv4
+                    self.results_text.append(f"  IPv4: {addr.address}")
         
         try:
-            # Test basic connectivity
-            result = subprocess.run(['ping', '-n', '4', '8.8.8.8'], 
-                                  capture_output=True, text=True, shell=True, timeout=30)
-            self.results_text.append("✓ Basic connectivity test completed")
-            self.progress_bar.setValue(50)
-            
-            # Test DNS resolution
-            result = subprocess.run(['nslookup', 'google.com'], 
-                                  capture_output=True, text=True, shell=True, timeout=10)
-            self.results_text.append("✓ DNS resolution test completed")
-            self.progress_bar.setValue(75)
-            
-            # Get detailed network info
-            interfaces = psutil.net_if_addrs()
-            stats = psutil.net_if_stats()
-            
-            self.results_text.append("\n=== Network Interfaces ===")
-            for interface, addrs in interfaces.items():
-                status = "UP" if interface in stats and stats[interface].isup else "DOWN"
-                self.results_text.append(f"{interface}: {status}")
-                for addr in addrs:
-                    if addr.family == 2:  # IPv4
-                        self.results_text.append(f"  IPv4: {addr.address}")
-            
-            self.progress_bar.setValue(100)
-            self.results_text.append("\n✓ All network tests completed successfully")
-            
+            tcp_targets, dns_names, dns_servers = load_probe_targets(self.targets_path)
+        except (OSError, ValueError) as e:
+            self.results_text.append(f"\n✗ Cannot read {self.targets_path.name}: {e}")
+            return
+        probes = len(tcp_targets) + len(dns_names) * max(1, len(dns_servers))
+        if not probes:
+            self.results_text.append(f"\n✗ No targets listed in {self.targets_path.name}")
+            return
+        
+        self.latency_rows = {}
+        self.latency_table.setRowCount(0)
+        self.progress_bar.setRange(0, probes * self.latency_rounds.value())
+        self.progress_bar.setValue(0)
+        self.test_button.setEnabled(False)
+        self.results_text.append(f"\nProbing {probes} target{'s' if probes > 1 else ''}...")
+        self.latency_thread = QThread(self)
+        self.latency_worker = LatencyWorker(tcp_targets, dns_names, dns_servers, self.latency_rounds.value())
+        self.latency_worker.moveToThread(self.latency_thread)
+        self.latency_thread.started.connect(self.latency_worker.run)
+        self.latency_worker.update.connect(self.on_latency_update)
+        self.latency_worker.finished.connect(self.on_latency_finished)
+        self.latency_worker.failed.connect(self.on_latency_failed)
+        self.latency_thread.start()
+    
+    def on_latency_update(self, stats):
+        """Show a target's statistics after one more attempt"""
+        row = self.latency_rows.get(stats.label)
+        if row is None:
+            row = self.latency_rows[stats.label] = self.latency_table.rowCount()
+            self.latency_table.insertRow(row)
+        
+        def ms(value):
+            return "-" if value is None else f"{value:.1f}"
+        
+        cells = [stats.label, str(stats.sent), f"{stats.loss_percent:.0f}%", ms(stats.min_ms), ms(stats.avg_ms),
+                 ms(stats.p95_ms), ms(stats.jitter_ms)]
+        for column, text in enumerate(cells):
+            self.latency_table.setItem(row, column, QTableWidgetItem(text))
+        if stats.last_error:
+            self.latency_table.item(row, 0).setToolTip(f"Last error: {stats.last_error}")
+        self.progress_bar.setValue(self.progress_bar.value() + 1)
+    
+    def on_latency_finished(self, report):
+        self.finish_latency_test()
+        self.latency_report = report
+        self.latency_table.resizeColumnsToContents()
+        self.progress_bar.setValue(self.progress_bar.maximum())
+        self.results_text.append("\n".join(format_latency_report(report)))
+    
+    def on_latency_failed(self, error: str):
+        self.finish_latency_test()
+        self.results_text.append(f"✗ Network test error: {error}")
+    
+    def finish_latency_test(self):
+        self.latency_thread.quit()
+        self.latency_thread.wait()
+        self.latency_worker.deleteLater()
+        self.latency_thread.deleteLater()
+        self.latency_thread = None
+        self.latency_worker = None
+        self.test_button.setEnabled(True)
+
+class DetectionWorker(QObject):
+    """Runs hardware detection off the GUI thread and streams each category"""
+    category_ready = Signal(str, object)
+    progress = Signal(int, int, str)
+    finished = Signal(object)
+    failed = Signal(str)
+    
+    def __init__(self, app, force_full: bool = False, laptop_model: str = ""):
+        super().__init__()
+        self.app = app
+        self.force_full = force_full
+        self.laptop_model = laptop_model
+        self.cancel_event = threading.Event()
+    
+    def run(self):
+        try:
+            specs = self.app.detector.collect_specs(
+                on_category=self.category_ready.emit,
+                on_progress=self.progress.emit,
+                cancel_event=self.cancel_event,
+                force_full=self.force_full,
+                laptop_model=self.laptop_model
+            )
+            self.finished.emit(specs)
         except Exception as e:
-            self.results_text.append(f"✗ Network test error: {str(e)}")
+            self.failed.emit(str(e))
+        finally:
+            # Detection records its probe timings from this QThread
+            self.app.database.release()
+    
+    def cancel(self):
+        self.cancel_event.set()
+
+class PerformanceWorker(QObject):
+    """Runs the performance tests off the GUI thread"""
+    progress = Signal(str)
+    finished = Signal(object)
+    failed = Signal(str)
+    
+    def __init__(self, disk_file_size: int, detected_specs: Optional[Dict] = None,
+                 throttling_duration: Optional[int] = None, harness: Optional[BenchmarkHarness] = None,
+                 disk_targets: Optional[List[Dict]] = None, disk_concurrent: bool = False):
+        super().__init__()
+        self.disk_file_size = disk_file_size
+        self.disk_targets = disk_targets
+        self.disk_concurrent = disk_concurrent
+        self.detected_specs = detected_specs or {}
+        self.throttling_duration = throttling_duration
+        self.harness = harness
+        self.cancel_event = threading.Event()
+    
+    def run(self):
+        try:
+            from coa_inspector.performance import run_performance_tests
+            results = run_performance_tests(disk_targets=self.disk_targets,
+                                            disk_file_size=self.disk_file_size,
+                                            disk_concurrent=self.disk_concurrent,
+                                            detected_cpu=self.detected_specs.get('CPU'),
+                                            detected_ram=self.detected_specs.get('RAM'),
+                                            detected_storage=self.detected_specs.get('Storage'),
+                                            throttling_duration=self.throttling_duration,
+                                            harness=self.harness,
+                                            on_progress=self.progress.emit,
+                                            cancel_event=self.cancel_event)
+            self.finished.emit(results)
+        except Exception as e:
+            self.failed.emit(str(e))
+    
+    def cancel(self):
+        self.cancel_event.set()
 
 class LaptopInspectorApp(QMainWindow):
     def __init__(self, user_info: Dict):
@@ -627,109 +933,69 @@ class LaptopInspectorApp(QMainWindow):
         # User information
         self.user_info = user_info
         
-        # Initialize database
         self.db_path = Path("coa_inspections.db")
+        self.database = InspectionDatabase(self.db_path)
+        
+        # Hardware probes; the PowerShell worker warms up while the form is filled in
+        self.detector = HardwareDetector(self.db_path.parent, record_metrics=self.record_metrics)
+        self.detector.start()
+        STARTUP_TRACE.mark("start hardware detector")
+        
+        # Initialize database
         self.init_database()
+        STARTUP_TRACE.mark("init_database")
         
         self.setup_ui()
+        STARTUP_TRACE.mark("setup_ui")
         self.current_inspection = {}
         self.inspection_results = {}
         self.current_pending_id = None  # Track if inspection is from pending queue
+        self.detection_thread = None
+        self.detection_worker = None
+        self.performance_thread = None
+        self.performance_worker = None
         
         # Set default inspector name
         QTimer.singleShot(100, lambda: self.inspector_name.setText(user_info['username']))
     
+    def closeEvent(self, event):
+        """Shut down background helpers when the window closes"""
+        if self.detection_thread is not None:
+            self.detection_worker.cancel()
+            self.detection_thread.quit()
+            self.detection_thread.wait(2000)
+        if self.performance_thread is not None:
+            self.performance_worker.cancel()
+            self.performance_thread.quit()
+            self.performance_thread.wait(5000)
+        self.detector.stop()
+        self.database.close()
+        super().closeEvent(event)
+    
     def init_database(self):
         """Initialize SQLite database for storing inspections"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS inspections (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                inspection_date TEXT,
-                inspector_name TEXT,
-                inspector_signature TEXT,
-                inspector_id TEXT,
-                approver_signature TEXT,
-                approver_id TEXT,
-                certificate_id TEXT,
-                signature_timestamp TEXT,
-                agency_name TEXT,
-                pr_number TEXT,
-                serial_number TEXT,
-                laptop_model TEXT,
-                inspection_data TEXT,
-                overall_status TEXT,
-                created_at TEXT,
-                created_by TEXT
-            )
-        ''')
-        
-        # Create audit log table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS audit_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                action TEXT,
-                username TEXT,
-                details TEXT,
-                timestamp TEXT
-            )
-        ''')
-        
-        # Create PR templates table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS pr_templates (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                template_name TEXT UNIQUE,
-                agency_name TEXT,
-                pr_cpu TEXT,
-                pr_ram TEXT,
-                pr_storage TEXT,
-                pr_graphics TEXT,
-                pr_wifi TEXT,
-                pr_notes TEXT,
-                created_by TEXT,
-                created_at TEXT
-            )
-        ''')
-        
-        # Create pending inspections table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS pending_inspections (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                agency_name TEXT,
-                pr_number TEXT,
-                laptop_model TEXT,
-                expected_serial TEXT,
-                pr_cpu TEXT,
-                pr_ram TEXT,
-                pr_storage TEXT,
-                pr_graphics TEXT,
-                pr_wifi TEXT,
-                pr_notes TEXT,
-                status TEXT DEFAULT 'pending',
-                created_by TEXT,
-                created_at TEXT
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        self.database.init_schema()
     
     def log_action(self, action: str, details: str = ""):
         """Log user actions for audit trail"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO audit_log (action, username, details, timestamp)
-                VALUES (?, ?, ?, ?)
-            ''', (action, self.user_info['username'], details, datetime.now().isoformat()))
-            conn.commit()
-            conn.close()
+            self.database.log_action(action, self.user_info['username'], details)
         except Exception as e:
-            print(f"Error logging action: {e}")
+            print(f"Error logging action: {e}", file=sys.stderr)
+
+    def record_metrics(self, metrics: List[Tuple[str, float, str, bool]], laptop_model: str = ""):
+        """Store (probe, duration, outcome, timed_out) timings; safe to call from any thread"""
+        try:
+            self.database.record_metrics(metrics, laptop_model, self.user_info['username'])
+        except Exception as e:
+            print(f"Error recording metrics: {e}", file=sys.stderr)
+
+    def record_operation(self, operation: str, started: float, outcome: str = PROBE_OK):
+        """Record how long an inspection operation took since time.perf_counter() was started"""
+        laptop_model = self.laptop_model.text().strip()
+        if not laptop_model:
+            laptop_model = self.current_inspection.get('detected_specs', {}).get('Warranty', {}).get('Model', '')
+        self.record_metrics([(operation, time.perf_counter() - started, outcome, False)], laptop_model)
 
     def setup_ui(self):
         # Create menu bar
@@ -758,6 +1024,9 @@ class LaptopInspectorApp(QMainWindow):
         audit_log_action = tools_menu.addAction('📋 View Audit Log')
         audit_log_action.triggered.connect(self.view_audit_log)
         
+        reference_action = tools_menu.addAction('📏 Save Benchmark Reference')
+        reference_action.triggered.connect(self.save_benchmark_reference)
+        
         tools_menu.addSeparator()
         
         change_password_action = tools_menu.addAction('🔑 Change Password')
@@ -860,8 +1129,23 @@ class LaptopInspectorApp(QMainWindow):
         
         detect_button_layout.addWidget(self.detect_button)
         detect_button_layout.addWidget(self.network_test_button)
+        self.force_detect_check = QCheckBox("Force full re-detect")
+        self.force_detect_check.setToolTip("Ignore cached BIOS, serial, memory and GPU results")
+        detect_button_layout.addWidget(self.force_detect_check)
         auto_layout.addLayout(detect_button_layout)
         
+        # Detection progress, shown only while a detection is running
+        detect_progress_layout = QHBoxLayout()
+        self.detect_progress = QProgressBar()
+        self.detect_progress.setFormat("%v/%m probes")
+        self.detect_progress.hide()
+        self.cancel_detect_button = QPushButton("Cancel")
+        self.cancel_detect_button.clicked.connect(self.cancel_detection)
+        self.cancel_detect_button.hide()
+        detect_progress_layout.addWidget(self.detect_progress)
+        detect_progress_layout.addWidget(self.cancel_detect_button)
+        auto_layout.addLayout(detect_progress_layout)
+        
         self.specs_display = QTextEdit()
         self.specs_display.setReadOnly(True)
         auto_layout.addWidget(self.specs_display)
@@ -873,9 +1157,58 @@ class LaptopInspectorApp(QMainWindow):
         perf_layout = QVBoxLayout()
         perf_group.setLayout(perf_layout)
         
+        perf_button_layout = QHBoxLayout()
         self.test_perf_button = QPushButton("Run Comprehensive Performance Tests")
         self.test_perf_button.clicked.connect(self.run_comprehensive_performance_tests)
-        perf_layout.addWidget(self.test_perf_button)
+        perf_button_layout.addWidget(self.test_perf_button)
+        perf_button_layout.addWidget(QLabel("Disk test file:"))
+        self.disk_test_size = QSpinBox()
+        self.disk_test_size.setRange(16, 16384)
+        self.disk_test_size.setSingleStep(64)
+        self.disk_test_size.setValue(DEFAULT_FILE_SIZE // 1024**2)
+        self.disk_test_size.setSuffix(" MB")
+        self.disk_test_size.setToolTip("Larger files take longer but are less affected by drive caches")
+        perf_button_layout.addWidget(self.disk_test_size)
+        perf_layout.addLayout(perf_button_layout)
+        
+        # Volumes for the disk test; filled after hardware detection or on refresh
+        disk_targets_layout = QHBoxLayout()
+        self.disk_targets_list = QListWidget()
+        self.disk_targets_list.setMaximumHeight(70)
+        self.disk_targets_list.setToolTip("Drives to benchmark; by default one volume on each internal drive")
+        disk_targets_layout.addWidget(self.disk_targets_list)
+        disk_targets_buttons = QVBoxLayout()
+        refresh_targets_button = QPushButton("↻ Drives")
+        refresh_targets_button.clicked.connect(self.refresh_disk_targets)
+        disk_targets_buttons.addWidget(refresh_targets_button)
+        self.disk_concurrent_check = QCheckBox("Test drives at once")
+        self.disk_concurrent_check.setToolTip("Benchmark the selected drives concurrently instead of one by one")
+        disk_targets_buttons.addWidget(self.disk_concurrent_check)
+        disk_targets_layout.addLayout(disk_targets_buttons)
+        perf_layout.addLayout(disk_targets_layout)
+        
+        throttling_layout = QHBoxLayout()
+        self.throttling_check = QCheckBox("Sustained load test")
+        self.throttling_check.setToolTip("Load every core afterwards and record clocks, temperature and fans "
+                                         "to reveal thermal throttling")
+        throttling_layout.addWidget(self.throttling_check)
+        self.throttling_duration = QSpinBox()
+        self.throttling_duration.setRange(30, 1800)
+        self.throttling_duration.setSingleStep(30)
+        self.throttling_duration.setValue(DEFAULT_THROTTLING_DURATION)
+        self.throttling_duration.setSuffix(" s")
+        throttling_layout.addWidget(self.throttling_duration)
+        throttling_layout.addWidget(QLabel("Repetitions:"))
+        self.benchmark_repetitions = QSpinBox()
+        self.benchmark_repetitions.setRange(1, 20)
+        self.benchmark_repetitions.setValue(DEFAULT_REPETITIONS)
+        self.benchmark_repetitions.setToolTip("Timed runs per test after a warmup run; results show the median")
+        throttling_layout.addWidget(self.benchmark_repetitions)
+        self.pin_benchmarks_check = QCheckBox("Pin to one core, high priority")
+        self.pin_benchmarks_check.setToolTip("Reduces run-to-run variation from scheduling and background tasks")
+        throttling_layout.addWidget(self.pin_benchmarks_check)
+        throttling_layout.addStretch()
+        perf_layout.addLayout(throttling_layout)
         
         self.perf_results = QTextEdit()
         self.perf_results.setReadOnly(True)
@@ -1138,6 +1471,10 @@ class LaptopInspectorApp(QMainWindow):
         self.generate_analytics_button.clicked.connect(self.generate_analytics)
         analytics_layout.addWidget(self.generate_analytics_button)
         
+        self.probe_timings_button = QPushButton("Show Probe Timings")
+        self.probe_timings_button.clicked.connect(self.show_probe_timings)
+        analytics_layout.addWidget(self.probe_timings_button)
+        
         layout.addWidget(analytics_group)
         
         return widget
@@ -1145,531 +1482,174 @@ class LaptopInspectorApp(QMainWindow):
     # === HARDWARE DETECTION METHODS ===
     
     def detect_hardware(self):
-        """Enhanced hardware detection with comprehensive system information"""
-        try:
-            self.specs_display.setText("Detecting hardware specifications...\n")
-            QApplication.processEvents()
-            
-            specs = {}
-            
-            # CPU Information
-            cpu_freq = psutil.cpu_freq()
-            specs['CPU'] = {
-                'Name': platform.processor(),
-                'Cores': psutil.cpu_count(logical=False),
-                'Threads': psutil.cpu_count(logical=True),
-                'Max Frequency': f"{cpu_freq.max:.2f} MHz" if cpu_freq else "N/A",
-                'Current Frequency': f"{cpu_freq.current:.2f} MHz" if cpu_freq else "N/A"
-            }
-            
-            # RAM Information with details
-            memory = psutil.virtual_memory()
-            specs['RAM'] = {
-                'Total': f"{memory.total // (1024**3)} GB",
-                'Available': f"{memory.available // (1024**3)} GB",
-                'Used': f"{memory.used // (1024**3)} GB",
-                'Usage Percent': f"{memory.percent}%"
-            }
-            specs['RAM'].update(self.get_ram_details())
-            
-            # Storage Information
-            specs['Storage'] = self.get_storage_info()
-            
-            # Graphics Information
-            specs['Graphics'] = self.get_graphics_info()
-            
-            # Display Information (NEW)
-            specs['Display'] = self.get_display_info()
-            
-            # Network Information with connectivity test
-            specs['Network'] = self.get_network_info()
-            specs['Network']['Connectivity_Test'] = self.test_network_connectivity()
-            
-            # Peripheral Devices (NEW)
-            specs['Peripherals'] = self.get_peripheral_devices()
-            
-            # Battery Information (if available)
-            specs['Battery'] = self.get_battery_info()
-            
-            # System Information
-            specs['System'] = {
-                'OS': f"{platform.system()} {platform.version()}",
-                'Architecture': platform.architecture()[0],
-                'Hostname': platform.node(),
-                'System Serial': self.get_system_serial_number()
-            }
-            
-            # BIOS/Firmware Information
-            specs['BIOS'] = self.get_bios_info()
-            
-            # Warranty Information (NEW)
-            specs['Warranty'] = self.get_warranty_info(specs['System']['System Serial'])
-            
-            self.display_specs(specs)
-            self.current_inspection['detected_specs'] = specs
-            
-            self.log_action("Hardware Detection", f"Serial: {specs['System']['System Serial']}")
+        """Start hardware detection on a background thread"""
+        if self.detection_thread is not None:
+            return  # A detection is already running
+        
+        self.detected_categories = {}
+        self.current_inspection['detected_specs'] = {}
+        self.specs_display.setText("Detecting hardware specifications...\n")
+        self.detect_button.setEnabled(False)
+        self.detect_progress.setRange(0, 0)  # Busy until the probe count is known
+        self.detect_progress.show()
+        self.cancel_detect_button.setEnabled(True)
+        self.cancel_detect_button.show()
+        
+        self.detection_thread = QThread(self)
+        self.detection_worker = DetectionWorker(self, self.force_detect_check.isChecked(),
+                                                self.laptop_model.text().strip())
+        self.detection_worker.moveToThread(self.detection_thread)
+        self.detection_thread.started.connect(self.detection_worker.run)
+        self.detection_worker.category_ready.connect(self.on_category_detected)
+        self.detection_worker.progress.connect(self.on_detection_progress)
+        self.detection_worker.finished.connect(self.on_detection_finished)
+        self.detection_worker.failed.connect(self.on_detection_failed)
+        self.detection_thread.start()
+    
+    def cancel_detection(self):
+        """Stop waiting on the remaining probes and keep what was detected so far"""
+        if self.detection_worker is not None:
+            self.detection_worker.cancel()
+            self.cancel_detect_button.setEnabled(False)
+    
+    def on_category_detected(self, category: str, details):
+        """Show each category as soon as its probes finish"""
+        self.detected_categories[category] = details
+        specs = {name: self.detected_categories[name] for name in SPEC_CATEGORIES
+                 if name in self.detected_categories}
+        self.current_inspection['detected_specs'] = specs
+        self.display_specs(specs)
+    
+    def on_detection_progress(self, done: int, total: int, probe_name: str):
+        self.detect_progress.setRange(0, total)
+        self.detect_progress.setValue(done)
+        self.detect_progress.setFormat(f"%v/%m probes - {probe_name}")
+    
+    def on_detection_finished(self, specs: Dict):
+        self.finish_detection()
+        self.display_specs(specs)
+        self.current_inspection['detected_specs'] = specs
+        self.refresh_disk_targets()
+        
+        cancelled = [name for name, status in specs.get('Detection', {}).items()
+                     if status.startswith(PROBE_CANCELLED)]
+        self.log_action("Hardware Detection", f"Serial: {specs['System']['System Serial']}")
+        if cancelled:
+            QMessageBox.information(self, "Detection Cancelled",
+                                    f"Hardware detection was cancelled.\n\nNot detected: {', '.join(cancelled)}")
+        else:
             QMessageBox.information(self, "Success", "Hardware detection completed successfully!")
-            
-        except Exception as e:
-            error_msg = f"Error detecting hardware: {str(e)}"
-            self.specs_display.setText(error_msg)
-            QMessageBox.critical(self, "Detection Error", error_msg)
-
-    def get_storage_info(self):
-        """Get storage device information"""
-        storage_info = {}
-        partitions = psutil.disk_partitions()
-        
-        for i, partition in enumerate(partitions):
-            try:
-                usage = psutil.disk_usage(partition.mountpoint)
-                storage_info[f'Drive_{i+1}'] = {
-                    'Device': partition.device,
-                    'FileSystem': partition.fstype,
-                    'Total': f"{usage.total // (1024**3)} GB",
-                    'Free': f"{usage.free // (1024**3)} GB",
-                    'Used': f"{usage.used // (1024**3)} GB"
-                }
-            except PermissionError:
-                continue
-        
-        return storage_info
-
-    def get_graphics_info(self):
-        """Get graphics card information"""
-        graphics_info = {}
-        
-        try:
-            if platform.system() == "Windows":
-                # Windows WMI query for graphics cards
-                result = subprocess.run([
-                    'wmic', 'path', 'win32_VideoController', 'get', 'name'
-                ], capture_output=True, text=True, shell=True)
-                
-                cards = [line.strip() for line in result.stdout.split('\n') 
-                        if line.strip() and line.strip() != 'Name']
-                graphics_info['Cards'] = cards if cards else ["Unable to detect graphics cards"]
-            else:
-                graphics_info['Cards'] = ["Graphics detection available on Windows only"]
-                
-        except Exception as e:
-            graphics_info['Error'] = f"Could not detect graphics cards: {str(e)}"
-        
-        return graphics_info
-
-    def get_network_info(self):
-        """Get network adapter information"""
-        network_info = {}
-        addrs = psutil.net_if_addrs()
-        stats = psutil.net_if_stats()
-        
-        for interface, addresses in addrs.items():
-            for addr in addresses:
-                if addr.family == 2:  # IPv4
-                    network_info[interface] = {
-                        'IP Address': addr.address,
-                        'Netmask': addr.netmask,
-                        'Status': 'Up' if interface in stats and stats[interface].isup else 'Down'
-                    }
-                    break  # Only show first IPv4 address per interface
-        
-        return network_info
-
-    def get_battery_info(self):
-        """Get battery information if available"""
-        try:
-            battery = psutil.sensors_battery()
-            if battery:
-                return {
-                    'Percent': f"{battery.percent}%",
-                    'Power Plugged': "Yes" if battery.power_plugged else "No",
-                    'Time Left': f"{battery.secsleft // 3600}h {(battery.secsleft % 3600) // 60}m" if battery.secsleft != psutil.POWER_TIME_UNLIMITED else "Unknown"
-                }
-            else:
-                return {'Status': 'No battery detected'}
-        except:
-            return {'Status': 'Battery info unavailable'}
-
-    def get_bios_info(self):
-        """Get comprehensive BIOS information"""
-        try:
-            if platform.system() == "Windows":
-                # First try the WMI method
-                bios_info = {}
-                
-                # Get BIOS Serial Number
-                result = subprocess.run([
-                    'wmic', 'bios', 'get', 'serialnumber'
-                ], capture_output=True, text=True, shell=True)
-                
-                lines = [line.strip() for line in result.stdout.split('\n') 
-                        if line.strip() and 'SerialNumber' not in line]
-                bios_serial = lines[0] if lines else None
-                
-                # Get BIOS Version
-                result = subprocess.run([
-                    'wmic', 'bios', 'get', 'version'
-                ], capture_output=True, text=True, shell=True)
-                
-                lines = [line.strip() for line in result.stdout.split('\n') 
-                        if line.strip() and 'Version' not in line]
-                bios_version = lines[0] if lines else None
-                
-                # If WMI failed, try PowerShell
-                if not bios_serial or bios_serial in ['', '0', 'None', 'To be filled by O.E.M.']:
-                    ps_bios_info = self.get_bios_info_powershell()
-                    if 'Serial Number' in ps_bios_info and ps_bios_info['Serial Number'] not in ['Not available', '']:
-                        return ps_bios_info
-                
-                # Continue with WMI data if we have valid info
-                bios_info['Serial Number'] = bios_serial if bios_serial and bios_serial not in ['', '0', 'None', 'To be filled by O.E.M.'] else "Not available"
-                bios_info['Version'] = bios_version if bios_version else "Not available"
-                
-                # Get BIOS Manufacturer
-                result = subprocess.run([
-                    'wmic', 'bios', 'get', 'manufacturer'
-                ], capture_output=True, text=True, shell=True)
-                
-                lines = [line.strip() for line in result.stdout.split('\n') 
-                        if line.strip() and 'Manufacturer' not in line]
-                bios_info['Manufacturer'] = lines[0] if lines else "Not available"
-                
-                # Get BIOS Release Date
-                result = subprocess.run([
-                    'wmic', 'bios', 'get', 'releasedate'
-                ], capture_output=True, text=True, shell=True)
-                
-                lines = [line.strip() for line in result.stdout.split('\n') 
-                        if line.strip() and 'ReleaseDate' not in line]
-                if lines and lines[0]:
-                    # Format date from YYYYMMDD to YYYY-MM-DD
-                    date_str = lines[0]
-                    if len(date_str) >= 8:
-                        formatted_date = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
-                        bios_info['Release Date'] = formatted_date
-                    else:
-                        bios_info['Release Date'] = lines[0]
-                else:
-                    bios_info['Release Date'] = "Not available"
-                
-                return bios_info
-            else:
-                return {'Info': 'BIOS info available on Windows only'}
-        except Exception as e:
-            # If WMI fails, try PowerShell as fallback
-            try:
-                return self.get_bios_info_powershell()
-            except:
-                return {'Error': f'Could not retrieve BIOS info: {str(e)}'}
-
-    def get_bios_info_powershell(self):
-        """Get BIOS information using PowerShell (more reliable on some systems)"""
-        try:
-            if platform.system() == "Windows":
-                # Use PowerShell to get BIOS information
-                ps_script = """
-                Get-CimInstance -ClassName Win32_BIOS | Select-Object SerialNumber, Version, Manufacturer, ReleaseDate | ConvertTo-Json
-                """
-                
-                result = subprocess.run([
-                    'powershell', '-Command', ps_script
-                ], capture_output=True, text=True, shell=True)
-                
-                if result.returncode == 0 and result.stdout.strip():
-                    bios_data = json.loads(result.stdout)
-                    bios_info = {
-                        'Serial Number': bios_data.get('SerialNumber', 'Not available'),
-                        'Version': bios_data.get('Version', 'Not available'),
-                        'Manufacturer': bios_data.get('Manufacturer', 'Not available'),
-                        'Release Date': bios_data.get('ReleaseDate', 'Not available')
-                    }
-                    return bios_info
-                
-            return {'Info': 'BIOS info available on Windows only'}
-        except Exception as e:
-            return {'Error': f'Could not retrieve BIOS info: {str(e)}'}
-
-    def get_system_serial_number(self):
-        """Get system serial number using multiple methods for better compatibility"""
-        try:
-            if platform.system() == "Windows":
-                # Try multiple WMI queries to get serial number
-                wmi_queries = [
-                    ['wmic', 'bios', 'get', 'serialnumber'],
-                    ['wmic', 'csproduct', 'get', 'identifyingnumber'],
-                    ['wmic', 'systemenclosure', 'get', 'serialnumber']
-                ]
-                
-                for query in wmi_queries:
-                    result = subprocess.run(query, capture_output=True, text=True, shell=True)
-                    lines = [line.strip() for line in result.stdout.split('\n') 
-                            if line.strip() and not any(keyword in line.lower() for keyword in ['serialnumber', 'identifyingnumber'])]
-                    
-                    if lines and lines[0] and lines[0] not in ['', '0', 'None', 'To be filled by O.E.M.']:
-                        return lines[0]
-                
-                return "Not available"
-            return "Windows only"
-        except:
-            return "Error retrieving"
-
-    def test_network_connectivity(self):
-        """Test basic network connectivity"""
-        try:
-            # Test internet connectivity
-            result = subprocess.run(['ping', '-n', '1', '8.8.8.8'], 
-                                  capture_output=True, text=True, timeout=10, shell=True)
-            return "Internet: Connected" if result.returncode == 0 else "Internet: No Connection"
-        except:
-            return "Internet: Test Failed"
-    
-    def get_ram_details(self) -> Dict:
-        """Get detailed RAM information including type and speed"""
-        ram_details = {}
-        try:
-            if platform.system() == "Windows":
-                # Get RAM type and speed
-                result = subprocess.run([
-                    'wmic', 'memorychip', 'get', 'capacity,speed,memorytype'
-                ], capture_output=True, text=True, shell=True)
-                
-                lines = [line.strip() for line in result.stdout.split('\n') 
-                        if line.strip() and 'Capacity' not in line]
-                
-                if lines:
-                    # Parse RAM details
-                    total_modules = len(lines)
-                    speeds = []
-                    types = []
-                    
-                    for line in lines:
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            speeds.append(parts[1] if len(parts) > 1 else "Unknown")
-                            types.append(self.get_memory_type_name(parts[2] if len(parts) > 2 else "0"))
-                    
-                    ram_details['Modules'] = total_modules
-                    ram_details['Speed'] = f"{speeds[0]} MHz" if speeds else "Unknown"
-                    ram_details['Type'] = types[0] if types else "Unknown"
-        except Exception as e:
-            ram_details['Details'] = f"Could not retrieve RAM details: {str(e)}"
-        
-        return ram_details
-    
-    def get_memory_type_name(self, type_code: str) -> str:
-        """Convert memory type code to name"""
-        memory_types = {
-            "20": "DDR",
-            "21": "DDR2",
-            "24": "DDR3",
-            "26": "DDR4",
-            "34": "DDR5"
-        }
-        return memory_types.get(type_code, f"Type {type_code}")
     
-    def get_display_info(self) -> Dict:
-        """Get display/monitor information"""
-        display_info = {}
-        try:
-            if platform.system() == "Windows":
-                # Get monitor information
-                result = subprocess.run([
-                    'wmic', 'path', 'Win32_DesktopMonitor', 'get', 'ScreenHeight,ScreenWidth,Name'
-                ], capture_output=True, text=True, shell=True)
-                
-                lines = [line.strip() for line in result.stdout.split('\n') 
-                        if line.strip() and 'Name' not in line and 'ScreenHeight' not in line]
-                
-                if lines and lines[0]:
-                    parts = lines[0].split()
-                    if len(parts) >= 2:
-                        display_info['Resolution'] = f"{parts[1]}x{parts[0]}" if parts[0].isdigit() else "Unable to detect"
-                        display_info['Name'] = ' '.join(parts[2:]) if len(parts) > 2 else "Built-in Display"
-                else:
-                    display_info['Resolution'] = "Unable to detect"
-                    display_info['Name'] = "Built-in Display"
-                
-                # Try to get more details using PowerShell
-                ps_script = """
-                Add-Type -AssemblyName System.Windows.Forms
-                [System.Windows.Forms.Screen]::PrimaryScreen | Select-Object -ExpandProperty Bounds | ConvertTo-Json
-                """
-                result = subprocess.run([
-                    'powershell', '-Command', ps_script
-                ], capture_output=True, text=True, shell=True, timeout=5)
-                
-                if result.returncode == 0 and result.stdout.strip():
-                    try:
-                        screen_data = json.loads(result.stdout)
-                        display_info['Resolution'] = f"{screen_data.get('Width', 0)}x{screen_data.get('Height', 0)}"
-                    except:
-                        pass
-                        
-        except Exception as e:
-            display_info['Error'] = f"Could not detect display: {str(e)}"
-        
-        return display_info if display_info else {'Info': 'Display detection unavailable'}
+    def on_detection_failed(self, error: str):
+        self.finish_detection()
+        error_msg = f"Error detecting hardware: {error}"
+        self.specs_display.setText(error_msg)
+        QMessageBox.critical(self, "Detection Error", error_msg)
     
-    def get_peripheral_devices(self) -> Dict:
-        """Detect peripheral devices (webcam, audio, USB devices)"""
-        peripherals = {}
-        try:
-            if platform.system() == "Windows":
-                # Detect webcams
-                result = subprocess.run([
-                    'wmic', 'path', 'Win32_PnPEntity', 'where', '"Name like \'%camera%\'"', 'get', 'Name'
-                ], capture_output=True, text=True, shell=True, timeout=10)
-                
-                cameras = [line.strip() for line in result.stdout.split('\n') 
-                          if line.strip() and 'Name' not in line]
-                peripherals['Webcam'] = cameras[0] if cameras else "No webcam detected"
-                
-                # Detect audio devices
-                result = subprocess.run([
-                    'wmic', 'sounddev', 'get', 'name'
-                ], capture_output=True, text=True, shell=True, timeout=10)
-                
-                audio = [line.strip() for line in result.stdout.split('\n') 
-                        if line.strip() and 'Name' not in line]
-                peripherals['Audio Devices'] = audio[:2] if audio else ["No audio devices"]
-                
-                # Detect USB devices
-                result = subprocess.run([
-                    'wmic', 'path', 'Win32_USBControllerDevice', 'get', 'Dependent'
-                ], capture_output=True, text=True, shell=True, timeout=10)
-                
-                usb_count = len([line for line in result.stdout.split('\n') 
-                               if 'USB' in line.upper()])
-                peripherals['USB Devices'] = f"{usb_count} USB devices connected"
-                
-                # Detect Bluetooth
-                result = subprocess.run([
-                    'wmic', 'path', 'Win32_PnPEntity', 'where', '"Name like \'%bluetooth%\'"', 'get', 'Name'
-                ], capture_output=True, text=True, shell=True, timeout=10)
-                
-                bluetooth = [line.strip() for line in result.stdout.split('\n') 
-                           if line.strip() and 'Name' not in line]
-                peripherals['Bluetooth'] = "Available" if bluetooth else "Not detected"
-                
-        except Exception as e:
-            peripherals['Error'] = f"Could not detect peripherals: {str(e)}"
-        
-        return peripherals if peripherals else {'Info': 'Peripheral detection unavailable'}
+    def finish_detection(self):
+        """Tear down the detection thread and restore the buttons"""
+        self.detection_thread.quit()
+        self.detection_thread.wait()
+        self.detection_worker.deleteLater()
+        self.detection_thread.deleteLater()
+        self.detection_thread = None
+        self.detection_worker = None
+        self.detect_progress.hide()
+        self.cancel_detect_button.hide()
+        self.detect_button.setEnabled(True)
     
-    def get_warranty_info(self, serial_number: str) -> Dict:
-        """Get warranty information (basic implementation)"""
-        warranty_info = {}
-        try:
-            if platform.system() == "Windows":
-                # Get system manufacturer
-                result = subprocess.run([
-                    'wmic', 'computersystem', 'get', 'manufacturer,model'
-                ], capture_output=True, text=True, shell=True)
-                
-                lines = [line.strip() for line in result.stdout.split('\n') 
-                        if line.strip() and 'Manufacturer' not in line]
-                
-                if lines and lines[0]:
-                    parts = lines[0].split(maxsplit=1)
-                    warranty_info['Manufacturer'] = parts[0] if parts else "Unknown"
-                    warranty_info['Model'] = parts[1] if len(parts) > 1 else "Unknown"
-                
-                warranty_info['Serial Number'] = serial_number
-                warranty_info['Note'] = "Check manufacturer website for warranty details"
-                
-        except Exception as e:
-            warranty_info['Error'] = f"Could not retrieve warranty info: {str(e)}"
-        
-        return warranty_info if warranty_info else {'Info': 'Warranty info unavailable'}
-
     def display_specs(self, specs):
         """Display the collected specifications"""
-        display_text = "=== LAPTOP HARDWARE SPECIFICATIONS ===\n\n"
-        
-        for category, details in specs.items():
-            display_text += f"{category}:\n"
-            if isinstance(details, dict):
-                for key, value in details.items():
-                    if isinstance(value, (list, dict)):
-                        display_text += f"  {key}:\n"
-                        if isinstance(value, list):
-                            for item in value:
-                                display_text += f"    - {item}\n"
-                        else:
-                            for subkey, subvalue in value.items():
-                                display_text += f"    {subkey}: {subvalue}\n"
-                    else:
-                        display_text += f"  {key}: {value}\n"
-            display_text += "\n"
-        
-        self.specs_display.setText(display_text)
+        self.specs_display.setText(format_specs(specs))
 
     # === PERFORMANCE TESTING METHODS ===
 
     def run_comprehensive_performance_tests(self):
-        """Run comprehensive performance tests"""
-        self.perf_results.setText("Running comprehensive performance tests...\n")
-        QApplication.processEvents()
+        """Run comprehensive performance tests on a background thread"""
+        if self.performance_thread is not None:
+            return  # Tests are already running
         
+        self.perf_results.setText("Running comprehensive performance tests...\n")
+        self.test_perf_button.setEnabled(False)
+        self.performance_started = time.perf_counter()
+        
+        self.performance_thread = QThread(self)
+        throttling_duration = self.throttling_duration.value() if self.throttling_check.isChecked() else None
+        pinned = self.pin_benchmarks_check.isChecked()
+        harness = BenchmarkHarness(repetitions=self.benchmark_repetitions.value(),
+                                   cpu_affinity=[0] if pinned else None, high_priority=pinned)
+        self.performance_worker = PerformanceWorker(self.disk_test_size.value() * 1024**2,
+                                                    self.current_inspection.get('detected_specs'),
+                                                    throttling_duration, harness, self.selected_disk_targets(),
+                                                    self.disk_concurrent_check.isChecked())
+        self.performance_worker.moveToThread(self.performance_thread)
+        self.performance_thread.started.connect(self.performance_worker.run)
+        self.performance_worker.progress.connect(self.on_performance_progress)
+        self.performance_worker.finished.connect(self.on_performance_finished)
+        self.performance_worker.failed.connect(self.on_performance_failed)
+        self.performance_thread.start()
+    
+    def refresh_disk_targets(self):
+        """List the writable local volumes, checking the default ones"""
+        storage = self.current_inspection.get('detected_specs', {}).get('Storage')
+        self.disk_targets_list.clear()
+        for target in benchmark_targets(storage):
+            label = target['Label'] + (" - removable" if target['Removable'] else "")
+            item = QListWidgetItem(label)
+            item.setData(Qt.UserRole, target)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked if target['Default'] else Qt.Unchecked)
+            self.disk_targets_list.addItem(item)
+    
+    def selected_disk_targets(self) -> Optional[List[Dict]]:
+        """Checked volumes, or None to test the defaults when the list was never filled"""
+        if not self.disk_targets_list.count():
+            return None
+        items = [self.disk_targets_list.item(row) for row in range(self.disk_targets_list.count())]
+        return [item.data(Qt.UserRole) for item in items if item.checkState() == Qt.Checked]
+    
+    def on_performance_progress(self, message: str):
+        self.perf_results.append(f"{message}...")
+    
+    def on_performance_finished(self, results: Dict):
+        from coa_inspector.performance import format_performance_results
+        self.finish_performance_tests()
+        cpu_name = self.current_inspection.get('detected_specs', {}).get('CPU', {}).get('Name', '')
         try:
-            # CPU Performance Test
-            start_time = time.time()
-            # Simple CPU-intensive calculation
-            for i in range(1000000):
-                _ = i * i * i
-            cpu_time = time.time() - start_time
-            
-            # Memory Performance Test
-            start_time = time.time()
-            test_list = [random.random() for _ in range(100000)]
-            sorted_list = sorted(test_list)
-            memory_time = time.time() - start_time
-            
-            # Disk Performance Test
-            start_time = time.time()
-            test_file = Path("temp_perf_test.dat")
-            try:
-                with open(test_file, 'wb') as f:
-                    f.write(b"0" * 5000000)  # Write 5MB
-                disk_write_time = time.time() - start_time
-                
-                start_time = time.time()
-                with open(test_file, 'rb') as f:
-                    data = f.read()
-                disk_read_time = time.time() - start_time
-                
-                test_file.unlink()  # Cleanup
-            except Exception as e:
-                disk_write_time = float('inf')
-                disk_read_time = float('inf')
-            
-            # Assessment
-            cpu_assessment = 'Excellent' if cpu_time < 0.5 else 'Good' if cpu_time < 2.0 else 'Poor'
-            memory_assessment = 'Excellent' if memory_time < 0.5 else 'Good' if memory_time < 2.0 else 'Poor'
-            disk_assessment = 'Excellent' if disk_write_time < 1.0 else 'Good' if disk_write_time < 3.0 else 'Poor'
-            
-            results = f"""Performance Test Results:
-            
-CPU Test (1M calculations): {cpu_time:.3f} seconds - {cpu_assessment}
-Memory Test (100K sort): {memory_time:.3f} seconds - {memory_assessment}
-Disk Write Test (5MB): {disk_write_time:.3f} seconds - {disk_assessment}
-Disk Read Test (5MB): {disk_read_time:.3f} seconds
-
-Overall Performance: {cpu_assessment}
-"""
-            self.perf_results.setText(results)
-            self.current_inspection['performance_tests'] = results
-            
-        except Exception as e:
-            self.perf_results.setText(f"Performance test error: {str(e)}")
+            table = ReferenceTable.load(REFERENCE_FILE)
+            results['Reference'] = reference_summary(results['Scores'], table, self.laptop_model.text(), cpu_name)
+            report = format_performance_results(results)
+        except (OSError, ValueError) as e:
+            report = format_performance_results(results) + f"Reference: could not read {REFERENCE_FILE} - {e}\n"
+        self.perf_results.setText(report)
+        self.current_inspection['performance_tests'] = results
+        self.record_operation("Performance Tests", self.performance_started)
+    
+    def on_performance_failed(self, error: str):
+        self.finish_performance_tests()
+        self.perf_results.setText(f"Performance test error: {error}")
+        self.record_operation("Performance Tests", self.performance_started, PROBE_ERROR)
+    
+    def finish_performance_tests(self):
+        """Tear down the performance test thread and restore the button"""
+        self.performance_thread.quit()
+        self.performance_thread.wait()
+        self.performance_worker.deleteLater()
+        self.performance_thread.deleteLater()
+        self.performance_thread = None
+        self.performance_worker = None
+        self.test_perf_button.setEnabled(True)
 
     # === VALIDATION AND COMPARISON METHODS ===
 
     def show_network_test_dialog(self):
         """Show network testing dialog"""
-        dialog = NetworkTestDialog(self)
+        dialog = NetworkTestDialog(self, self.detector.connectivity_targets)
         dialog.exec()
+        if dialog.latency_report is not None:
+            self.current_inspection['network_latency'] = dialog.latency_report.as_dict()
+        if dialog.throughput_result is not None:
+            self.current_inspection['network_throughput'] = dialog.throughput_result.as_dict()
 
     def add_digital_signatures(self):
         """Add digital signatures and certificate to inspection"""
@@ -1692,6 +1672,9 @@ Overall Performance: {cpu_assessment}
 
     def validate_specifications(self):
         """Comprehensive specification validation with pass/fail"""
+        if self.detection_thread is not None:
+            QMessageBox.warning(self, "Detection Running", "Please wait for hardware detection to finish.")
+            return
         if not self.current_inspection.get('detected_specs'):
             QMessageBox.warning(self, "No Data", "Please detect hardware specs first.")
             return
@@ -1705,161 +1688,13 @@ Overall Performance: {cpu_assessment}
             'wifi': self.pr_wifi.text().upper()
         }
         
-        validation_results = []
-        overall_status = "PASS"
-        
-        # CPU Validation
-        cpu_result = self.validate_cpu(pr_specs['cpu'], detected['CPU'])
-        validation_results.append(cpu_result)
-        if cpu_result['status'] == "FAIL":
-            overall_status = "FAIL"
-        
-        # RAM Validation
-        ram_result = self.validate_ram(pr_specs['ram'], detected['RAM'])
-        validation_results.append(ram_result)
-        if ram_result['status'] == "FAIL":
-            overall_status = "FAIL"
-        
-        # Storage Validation
-        storage_result = self.validate_storage(pr_specs['storage'], detected['Storage'])
-        validation_results.append(storage_result)
-        if storage_result['status'] == "FAIL":
-            overall_status = "FAIL"
+        validation_results, overall_status = validate_specs(detected, pr_specs)
         
         # Display results
         self.display_validation_results(validation_results, overall_status)
         self.inspection_results['validation'] = validation_results
         self.inspection_results['overall_status'] = overall_status
 
-    def validate_cpu(self, pr_cpu: str, actual_cpu: Dict) -> Dict:
-        """Validate CPU specifications with 'equal or better' logic"""
-        if not pr_cpu:
-            return {'component': 'CPU', 'status': 'PASS', 'details': 'No PR specification provided'}
-        
-        actual_name = actual_cpu['Name'].upper()
-        pr_upper = pr_cpu.upper()
-        
-        # CPU tier comparison (higher is better)
-        cpu_tiers = {
-            'I9': 9, 'RYZEN 9': 9,
-            'I7': 7, 'RYZEN 7': 7, 'CORE I7': 7,
-            'I5': 5, 'RYZEN 5': 5, 'CORE I5': 5,
-            'I3': 3, 'RYZEN 3': 3, 'CORE I3': 3
-        }
-        
-        pr_tier = None
-        actual_tier = None
-        
-        for cpu_name, tier_value in cpu_tiers.items():
-            if cpu_name in pr_upper:
-                pr_tier = tier_value
-            if cpu_name in actual_name:
-                actual_tier = tier_value
-        
-        # If we can compare tiers
-        if pr_tier and actual_tier:
-            if actual_tier >= pr_tier:
-                return {
-                    'component': 'CPU',
-                    'status': 'PASS',
-                    'details': f"✓ Actual CPU (tier {actual_tier}) meets or exceeds PR requirement (tier {pr_tier})"
-                }
-            else:
-                return {
-                    'component': 'CPU',
-                    'status': 'FAIL',
-                    'details': f"✗ Actual CPU (tier {actual_tier}) is below PR requirement (tier {pr_tier})"
-                }
-        
-        # Fallback to string matching
-        if pr_upper in actual_name:
-            return {'component': 'CPU', 'status': 'PASS', 'details': f"✓ Exact match: {actual_name}"}
-        else:
-            return {
-                'component': 'CPU',
-                'status': 'WARNING',
-                'details': f"⚠ Cannot verify: PR: {pr_cpu}, Actual: {actual_name}"
-            }
-
-    def validate_ram(self, pr_ram: str, actual_ram: Dict) -> Dict:
-        """Validate RAM specifications with 'equal or better' logic"""
-        if not pr_ram:
-            return {'component': 'RAM', 'status': 'PASS', 'details': 'No PR specification provided'}
-        
-        try:
-            # Extract numbers from strings
-            pr_gb = self.extract_gb(pr_ram)
-            actual_gb = self.extract_gb(actual_ram['Total'])
-            
-            if pr_gb and actual_gb:
-                if actual_gb >= pr_gb:
-                    status_icon = "✓" if actual_gb == pr_gb else "✓✓"
-                    extra = f" (exceeds by {actual_gb - pr_gb}GB)" if actual_gb > pr_gb else ""
-                    return {
-                        'component': 'RAM',
-                        'status': 'PASS',
-                        'details': f"{status_icon} Actual ({actual_gb}GB) meets or exceeds PR requirement ({pr_gb}GB){extra}"
-                    }
-                else:
-                    return {
-                        'component': 'RAM',
-                        'status': 'FAIL',
-                        'details': f"✗ Actual ({actual_gb}GB) is {pr_gb - actual_gb}GB less than PR requirement ({pr_gb}GB)"
-                    }
-        except:
-            pass
-        
-        return {
-            'component': 'RAM',
-            'status': 'WARNING',
-            'details': f"⚠ Could not validate: PR: {pr_ram}, Actual: {actual_ram['Total']}"
-        }
-
-    def validate_storage(self, pr_storage: str, actual_storage: Dict) -> Dict:
-        """Validate storage specifications"""
-        if not pr_storage:
-            return {'component': 'Storage', 'status': 'PASS', 'details': 'No PR specification provided'}
-        
-        try:
-            pr_gb = self.extract_gb(pr_storage)
-            if not pr_gb:
-                return {'component': 'Storage', 'status': 'CHECK', 'details': 'Could not parse PR storage spec'}
-            
-            # Calculate total actual storage
-            total_actual_gb = 0
-            for drive, info in actual_storage.items():
-                if 'Total' in info:
-                    drive_gb = self.extract_gb(info['Total'])
-                    if drive_gb:
-                        total_actual_gb += drive_gb
-            
-            if total_actual_gb >= pr_gb:
-                return {
-                    'component': 'Storage', 
-                    'status': 'PASS', 
-                    'details': f"Actual ({total_actual_gb}GB) meets PR requirement ({pr_gb}GB)"
-                }
-            else:
-                return {
-                    'component': 'Storage', 
-                    'status': 'FAIL', 
-                    'details': f"Actual ({total_actual_gb}GB) less than PR requirement ({pr_gb}GB)"
-                }
-                
-        except Exception as e:
-            return {
-                'component': 'Storage', 
-                'status': 'CHECK', 
-                'details': f"Validation error: {str(e)}"
-            }
-
-    def extract_gb(self, text: str) -> int:
-        """Extract GB number from text"""
-        if not text:
-            return None
-        match = re.search(r'(\d+)\s*GB?', text.upper())
-        return int(match.group(1)) if match else None
-
     def display_validation_results(self, results: List[Dict], overall_status: str):
         """Display validation results"""
         result_text = f"=== SPECIFICATION VALIDATION RESULTS ===\n"
@@ -1874,14 +1709,22 @@ Overall Performance: {cpu_assessment}
 
     # === DATA MANAGEMENT METHODS ===
 
-    def save_inspection(self):
-        """Save inspection to database"""
-        try:
-            if not all([self.inspector_name.text(), self.serial_number.text()]):
-                QMessageBox.warning(self, "Missing Data", "Please fill in required fields.")
-                return
-            
-            inspection_data = {
+    def build_inspection(self) -> Inspection:
+        """Inspection record from the current form, detected specs and validation"""
+        return Inspection(
+            inspection_date=self.inspection_date.date().toString("yyyy-MM-dd"),
+            inspector_name=self.inspector_name.text(),
+            inspector_signature=self.current_inspection.get('inspector_signature', ''),
+            inspector_id=self.current_inspection.get('inspector_id', ''),
+            approver_signature=self.current_inspection.get('approver_signature', ''),
+            approver_id=self.current_inspection.get('approver_id', ''),
+            certificate_id=self.current_inspection.get('certificate_id', ''),
+            signature_timestamp=self.current_inspection.get('signature_timestamp', ''),
+            agency_name=self.agency_name.text(),
+            pr_number=self.pr_number.text(),
+            serial_number=self.serial_number.text(),
+            laptop_model=self.laptop_model.text(),
+            inspection_data={
                 'detected_specs': self.current_inspection.get('detected_specs', {}),
                 'physical_condition': {
                     'chassis': self.chassis_condition.currentText(),
@@ -1898,63 +1741,43 @@ Overall Performance: {cpu_assessment}
                     'wifi': self.pr_wifi.text(),
                     'notes': self.pr_notes.text()
                 },
-                'performance_tests': self.current_inspection.get('performance_tests', ''),
+                'performance_tests': self.current_inspection.get('performance_tests', {}),
+                'network_throughput': self.current_inspection.get('network_throughput', {}),
+                'network_latency': self.current_inspection.get('network_latency', {}),
                 'validation_results': self.inspection_results
-            }
-            
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO inspections 
-                (inspection_date, inspector_name, inspector_signature, inspector_id,
-                 approver_signature, approver_id, certificate_id, signature_timestamp,
-                 agency_name, pr_number, serial_number, laptop_model, inspection_data, 
-                 overall_status, created_at, created_by)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                self.inspection_date.date().toString("yyyy-MM-dd"),
-                self.inspector_name.text(),
-                self.current_inspection.get('inspector_signature', ''),
-                self.current_inspection.get('inspector_id', ''),
-                self.current_inspection.get('approver_signature', ''),
-                self.current_inspection.get('approver_id', ''),
-                self.current_inspection.get('certificate_id', ''),
-                self.current_inspection.get('signature_timestamp', ''),
-                self.agency_name.text(),
-                self.pr_number.text(),
-                self.serial_number.text(),
-                self.laptop_model.text(),
-                json.dumps(inspection_data),
-                self.inspection_results.get('overall_status', 'NOT_VALIDATED'),
-                datetime.now().isoformat(),
-                self.user_info['username']
-            ))
-            
-            conn.commit()
-            conn.close()
-            
+            },
+            overall_status=self.inspection_results.get('overall_status', 'NOT_VALIDATED'),
+            created_by=self.user_info['username']
+        )
+    
+    def save_inspection(self):
+        """Save inspection to database"""
+        if self.detection_thread is not None:
+            QMessageBox.warning(self, "Detection Running", "Please wait for hardware detection to finish.")
+            return
+        started = time.perf_counter()
+        try:
+            if not all([self.inspector_name.text(), self.serial_number.text()]):
+                QMessageBox.warning(self, "Missing Data", "Please fill in required fields.")
+                return
+        
+            self.database.save_inspection(self.build_inspection())
+        
             # Mark pending inspection as completed if it was loaded from pending
-            if hasattr(self, 'current_pending_id') and self.current_pending_id:
+            if self.current_pending_id:
                 try:
-                    conn = sqlite3.connect(self.db_path)
-                    cursor = conn.cursor()
-                    cursor.execute('''
-                        UPDATE pending_inspections 
-                        SET status = 'completed' 
-                        WHERE id = ?
-                    ''', (self.current_pending_id,))
-                    conn.commit()
-                    conn.close()
+                    self.database.complete_pending(self.current_pending_id)
                     self.current_pending_id = None
                     self.load_pending_inspections()  # Refresh pending list
-                except:
+                except Exception:
                     pass  # Don't fail the save if pending update fails
-            
+        
             self.log_action("Save Inspection", f"S/N: {self.serial_number.text()}, PR: {self.pr_number.text()}")
+            self.record_operation("Save Inspection", started)
             QMessageBox.information(self, "Success", "Inspection saved successfully!")
-            
+        
         except Exception as e:
+            self.record_operation("Save Inspection", started, PROBE_ERROR)
             QMessageBox.critical(self, "Save Error", f"Error saving inspection: {str(e)}")
 
     def load_inspections(self):
@@ -1962,26 +1785,12 @@ Overall Performance: {cpu_assessment}
         self.inspections_list.clear()
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            search_term = f"%{self.search_field.text()}%"
-            cursor.execute('''
-                SELECT id, inspection_date, inspector_name, agency_name, 
-                       pr_number, serial_number, laptop_model, overall_status
-                FROM inspections 
-                WHERE serial_number LIKE ? OR pr_number LIKE ? OR agency_name LIKE ?
-                ORDER BY inspection_date DESC
-            ''', (search_term, search_term, search_term))
-            
-            for row in cursor.fetchall():
+            for row in self.database.search_inspections(self.search_field.text()):
                 status_icon = "✅" if row[7] == "PASS" else "❌" if row[7] == "FAIL" else "⚠️"
                 item_text = f"{status_icon} {row[1]} | {row[3]} | PR: {row[4]} | S/N: {row[5]}"
                 item = QListWidgetItem(item_text)
                 item.setData(Qt.UserRole, row[0])  # Store ID
                 self.inspections_list.addItem(item)
-            
-            conn.close()
         except Exception as e:
             QMessageBox.critical(self, "Load Error", f"Error loading inspections: {str(e)}")
 
@@ -1990,40 +1799,32 @@ Overall Performance: {cpu_assessment}
         inspection_id = item.data(Qt.UserRole)
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM inspections WHERE id = ?', (inspection_id,))
-            inspection = cursor.fetchone()
-            conn.close()
-            
+            inspection = self.database.get_inspection(inspection_id)
             if inspection:
                 self.show_inspection_dialog(inspection)
-                
+        
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error loading inspection: {str(e)}")
 
-    def show_inspection_dialog(self, inspection):
+    def show_inspection_dialog(self, inspection: Inspection):
         """Show inspection details in a dialog"""
         dialog = QMessageBox(self)
         dialog.setWindowTitle("Inspection Details")
         
-        # Parse inspection data
-        inspection_data = json.loads(inspection[9])  # inspection_data field
-        
         details_text = f"""
-        Inspection ID: {inspection[0]}
-        Date: {inspection[1]}
-        Inspector: {inspection[2]}
-        Agency: {inspection[4]}
-        PR Number: {inspection[5]}
-        Serial Number: {inspection[6]}
-        Overall Status: {inspection[10]}
+        Inspection ID: {inspection.id}
+        Date: {inspection.inspection_date}
+        Inspector: {inspection.inspector_name}
+        Agency: {inspection.agency_name}
+        PR Number: {inspection.pr_number}
+        Serial Number: {inspection.serial_number}
+        Overall Status: {inspection.overall_status}
         """
         
         dialog.setText(details_text)
         
         # Show detailed data
-        detailed_text = f"Full inspection data:\n{json.dumps(inspection_data, indent=2)}"
+        detailed_text = f"Full inspection data:\n{json.dumps(inspection.inspection_data, indent=2)}"
         dialog.setDetailedText(detailed_text)
         dialog.exec()
 
@@ -2031,78 +1832,20 @@ Overall Performance: {cpu_assessment}
 
     def generate_comprehensive_pdf_report(self):
         """Generate comprehensive PDF report with all details"""
+        started = time.perf_counter()
         try:
             if not self.serial_number.text():
                 QMessageBox.warning(self, "Missing Data", "Please enter serial number first.")
                 return
-                
-            filename = f"COA_Comprehensive_Inspection_{self.serial_number.text()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            doc = SimpleDocTemplate(filename, pagesize=A4)
-            styles = getSampleStyleSheet()
-            story = []
-            
-            # Title
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=16,
-                spaceAfter=30,
-                alignment=1  # Center
-            )
-            title = Paragraph("COMMISSION ON AUDIT<br/>LAPTOP INSPECTION REPORT", title_style)
-            story.append(title)
-            
-            # Inspection Details
-            details_data = [
-                ['Inspector:', self.inspector_name.text()],
-                ['Agency:', self.agency_name.text()],
-                ['PR Number:', self.pr_number.text()],
-                ['Serial Number:', self.serial_number.text()],
-                ['Model:', self.laptop_model.text()],
-                ['Inspection Date:', self.inspection_date.date().toString("yyyy-MM-dd")],
-                ['Overall Status:', self.inspection_results.get('overall_status', 'Not Validated')]
-            ]
-            
-            details_table = Table(details_data, colWidths=[200, 300])
-            details_table.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            
-            story.append(details_table)
-            story.append(Spacer(1, 20))
-            
-            # Add validation results table if available
-            if self.inspection_results.get('validation'):
-                validation_data = [['Component', 'Status', 'Details']]
-                for result in self.inspection_results['validation']:
-                    validation_data.append([
-                        result['component'],
-                        result['status'],
-                        result['details']
-                    ])
-                
-                validation_table = Table(validation_data, colWidths=[100, 80, 320])
-                validation_table.setStyle(TableStyle([
-                    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 9),
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
-                
-                story.append(Paragraph("Specification Validation Results", styles['Heading2']))
-                story.append(validation_table)
-                story.append(Spacer(1, 20))
-            
-            doc.build(story)
+        
+            inspection = self.build_inspection()
+            filename = report_filename("COA_Comprehensive_Inspection", inspection, "pdf")
+            write_pdf_report(filename, inspection)
+            self.record_operation("PDF Report", started)
             QMessageBox.information(self, "PDF Generated", f"Comprehensive report saved as {filename}")
-            
+        
         except Exception as e:
+            self.record_operation("PDF Report", started, PROBE_ERROR)
             QMessageBox.critical(self, "PDF Error", f"Error generating PDF: {str(e)}")
 
     def export_to_excel(self):
@@ -2111,69 +1854,48 @@ Overall Performance: {cpu_assessment}
             if not self.serial_number.text():
                 QMessageBox.warning(self, "Missing Data", "Please enter serial number first.")
                 return
-                
-            filename = f"COA_Inspection_{self.serial_number.text()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            
-            # Create Excel file with inspection data
-            with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-                # Summary sheet
-                summary_data = {
-                    'Field': ['Inspector', 'Agency', 'PR Number', 'Serial Number', 'Model', 'Inspection Date', 'Overall Status'],
-                    'Value': [
-                        self.inspector_name.text(),
-                        self.agency_name.text(),
-                        self.pr_number.text(),
-                        self.serial_number.text(),
-                        self.laptop_model.text(),
-                        self.inspection_date.date().toString("yyyy-MM-dd"),
-                        self.inspection_results.get('overall_status', 'Not Validated')
-                    ]
-                }
-                pd.DataFrame(summary_data).to_excel(writer, sheet_name='Summary', index=False)
-                
-                # Hardware specs sheet
-                if self.current_inspection.get('detected_specs'):
-                    hardware_data = []
-                    for category, specs in self.current_inspection['detected_specs'].items():
-                        if isinstance(specs, dict):
-                            for key, value in specs.items():
-                                hardware_data.append([category, key, str(value)])
-                    
-                    pd.DataFrame(hardware_data, columns=['Category', 'Spec', 'Value']).to_excel(
-                        writer, sheet_name='Hardware_Specs', index=False)
-                
+        
+            inspection = self.build_inspection()
+            filename = report_filename("COA_Inspection", inspection, "xlsx")
+            write_excel_report(filename, inspection)
             QMessageBox.information(self, "Excel Export", f"Data exported to {filename}")
-            
+        
         except Exception as e:
             QMessageBox.critical(self, "Export Error", f"Error exporting to Excel: {str(e)}")
 
     def generate_analytics(self):
         """Generate analytics from historical data"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            
-            # Get basic statistics
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM inspections")
-            total_inspections = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT overall_status, COUNT(*) FROM inspections GROUP BY overall_status")
-            status_counts = cursor.fetchall()
-            
+            total_inspections, status_counts = self.database.status_counts()
+        
             analytics_text = f"=== INSPECTION ANALYTICS ===\n\n"
             analytics_text += f"Total Inspections: {total_inspections}\n\n"
             analytics_text += "Status Distribution:\n"
-            
+        
             for status, count in status_counts:
                 percentage = (count / total_inspections * 100) if total_inspections > 0 else 0
                 analytics_text += f"  {status}: {count} ({percentage:.1f}%)\n"
-            
+        
+            benchmark_counts = self.database.benchmark_counts()
+            if benchmark_counts:
+                analytics_text += "\nBenchmarked Units Below Reference:\n"
+                for laptop_model, benchmarked, underperforming in benchmark_counts:
+                    analytics_text += f"  {laptop_model or 'Unknown model'}: {underperforming} of {benchmarked}\n"
+        
             self.analytics_text.setText(analytics_text)
-            conn.close()
-            
+        
         except Exception as e:
             self.analytics_text.setText(f"Error generating analytics: {str(e)}")
     
+    def show_probe_timings(self):
+        """Show p50/p95/max duration of every probe per laptop model"""
+        try:
+            report = format_metrics_report(summarize_metrics(self.database.probe_metrics()))
+            self.analytics_text.setHtml(f"<pre>{html.escape(report)}</pre>")
+        
+        except Exception as e:
+            self.analytics_text.setText(f"Error loading probe timings: {str(e)}")
+    
     def export_database(self):
         """Export database to a file"""
         try:
@@ -2185,8 +1907,7 @@ Overall Performance: {cpu_assessment}
             )
             
             if filename:
-                import shutil
-                shutil.copy2(self.db_path, filename)
+                self.database.backup(filename)
                 self.log_action("Export Database", f"Exported to: {filename}")
                 QMessageBox.information(self, "Success", f"Database exported successfully to:\n{filename}")
         except Exception as e:
@@ -2212,13 +1933,13 @@ Overall Performance: {cpu_assessment}
                 )
                 
                 if filename:
-                    import shutil
                     # Create backup before import
                     backup_name = f"coa_inspections_backup_before_import_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
-                    shutil.copy2(self.db_path, backup_name)
+                    self.database.backup(backup_name)
                     
-                    # Import new database
-                    shutil.copy2(filename, self.db_path)
+                    # Import new database; copied through the open connection so its WAL stays consistent
+                    self.database.restore(filename)
+                    self.database.init_schema()
                     
                     self.log_action("Import Database", f"Imported from: {filename}")
                     QMessageBox.information(
@@ -2236,8 +1957,7 @@ Overall Performance: {cpu_assessment}
         """Create a backup of the database"""
         try:
             backup_name = f"coa_inspections_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
-            import shutil
-            shutil.copy2(self.db_path, backup_name)
+            self.database.backup(backup_name)
             
             self.log_action("Backup Database", f"Backup created: {backup_name}")
             QMessageBox.information(
@@ -2248,20 +1968,43 @@ Overall Performance: {cpu_assessment}
         except Exception as e:
             QMessageBox.critical(self, "Backup Error", f"Error creating backup: {str(e)}")
     
+    def save_benchmark_reference(self):
+        """Save the current performance scores as the reference for this laptop model or CPU"""
+        scores = self.current_inspection.get('performance_tests', {}).get('Scores')
+        if not scores:
+            QMessageBox.warning(self, "No Results", "Run the performance tests on a known-good unit first.")
+            return
+        
+        laptop_model = self.laptop_model.text().strip()
+        cpu_name = self.current_inspection.get('detected_specs', {}).get('CPU', {}).get('Name', '').strip()
+        choices = {}
+        if laptop_model:
+            choices[f"Laptop model: {laptop_model}"] = (SECTION_LAPTOP_MODEL, laptop_model)
+        if cpu_name:
+            choices[f"CPU: {cpu_name}"] = (SECTION_CPU, cpu_name)
+        if not choices:
+            QMessageBox.warning(self, "No Model", "Enter the laptop model or detect the hardware first.")
+            return
+        
+        choice, ok = QInputDialog.getItem(self, "Save Benchmark Reference",
+                                          "Use these scores as the expected level for:", list(choices), 0, False)
+        if not ok:
+            return
+        
+        section, name = choices[choice]
+        try:
+            table = ReferenceTable.load(REFERENCE_FILE)
+            table.set_reference(section, name, scores)
+            table.save(REFERENCE_FILE)
+            self.log_action("Save Benchmark Reference", choice)
+            QMessageBox.information(self, "Reference Saved", f"Benchmark reference saved for {choice}")
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Reference Error", f"Error saving benchmark reference: {str(e)}")
+    
     def view_audit_log(self):
         """View audit log of all actions"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT timestamp, username, action, details 
-                FROM audit_log 
-                ORDER BY timestamp DESC 
-                LIMIT 100
-            ''')
-            
-            logs = cursor.fetchall()
-            conn.close()
+            logs = self.database.audit_log(100)
             
             # Create dialog to display logs
             dialog = QDialog(self)
@@ -2416,15 +2159,7 @@ Overall Performance: {cpu_assessment}
     def load_templates(self):
         """Load all PR templates from database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT id, template_name, agency_name, pr_cpu, pr_ram, pr_storage
-                FROM pr_templates
-                ORDER BY template_name
-            ''')
-            templates = cursor.fetchall()
-            conn.close()
+            templates = self.database.list_templates()
             
             self.templates_table.setRowCount(len(templates))
             
@@ -2477,33 +2212,14 @@ Overall Performance: {cpu_assessment}
         dialog = PRTemplateDialog(self)
         if dialog.exec():
             template_data = dialog.get_template_data()
-            
+        
             try:
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO pr_templates 
-                    (template_name, agency_name, pr_cpu, pr_ram, pr_storage, pr_graphics, pr_wifi, pr_notes, created_by, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    template_data['template_name'],
-                    template_data['agency_name'],
-                    template_data['pr_cpu'],
-                    template_data['pr_ram'],
-                    template_data['pr_storage'],
-                    template_data['pr_graphics'],
-                    template_data['pr_wifi'],
-                    template_data['pr_notes'],
-                    self.user_info['username'],
-                    datetime.now().isoformat()
-                ))
-                conn.commit()
-                conn.close()
-                
+                self.database.create_template(template_data, self.user_info['username'])
+        
                 self.log_action("Create Template", f"Template: {template_data['template_name']}")
                 QMessageBox.information(self, "Success", "Template created successfully!")
                 self.load_templates()
-                
+        
             except sqlite3.IntegrityError:
                 QMessageBox.warning(self, "Duplicate", "A template with this name already exists.")
             except Exception as e:
@@ -2512,53 +2228,18 @@ Overall Performance: {cpu_assessment}
     def edit_template(self, template_id):
         """Edit an existing template"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM pr_templates WHERE id = ?', (template_id,))
-            template = cursor.fetchone()
-            conn.close()
-            
+            template = self.database.get_template(template_id)
+        
             if template:
-                template_data = {
-                    'template_name': template[1],
-                    'agency_name': template[2],
-                    'pr_cpu': template[3],
-                    'pr_ram': template[4],
-                    'pr_storage': template[5],
-                    'pr_graphics': template[6],
-                    'pr_wifi': template[7],
-                    'pr_notes': template[8]
-                }
-                
-                dialog = PRTemplateDialog(self, template_data)
+                dialog = PRTemplateDialog(self, template)
                 if dialog.exec():
                     updated_data = dialog.get_template_data()
-                    
-                    conn = sqlite3.connect(self.db_path)
-                    cursor = conn.cursor()
-                    cursor.execute('''
-                        UPDATE pr_templates 
-                        SET template_name=?, agency_name=?, pr_cpu=?, pr_ram=?, pr_storage=?, 
-                            pr_graphics=?, pr_wifi=?, pr_notes=?
-                        WHERE id=?
-                    ''', (
-                        updated_data['template_name'],
-                        updated_data['agency_name'],
-                        updated_data['pr_cpu'],
-                        updated_data['pr_ram'],
-                        updated_data['pr_storage'],
-                        updated_data['pr_graphics'],
-                        updated_data['pr_wifi'],
-                        updated_data['pr_notes'],
-                        template_id
-                    ))
-                    conn.commit()
-                    conn.close()
-                    
+                    self.database.update_template(template_id, updated_data)
+        
                     self.log_action("Edit Template", f"Template: {updated_data['template_name']}")
                     QMessageBox.information(self, "Success", "Template updated successfully!")
                     self.load_templates()
-                    
+        
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error editing template: {str(e)}")
     
@@ -2574,11 +2255,7 @@ Overall Performance: {cpu_assessment}
         
         if reply == QMessageBox.Yes:
             try:
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                cursor.execute('DELETE FROM pr_templates WHERE id = ?', (template_id,))
-                conn.commit()
-                conn.close()
+                self.database.delete_template(template_id)
                 
                 self.log_action("Delete Template", f"Template ID: {template_id}")
                 QMessageBox.information(self, "Success", "Template deleted successfully!")
@@ -2590,28 +2267,24 @@ Overall Performance: {cpu_assessment}
     def use_template(self, template_id):
         """Load template specs into new inspection tab"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM pr_templates WHERE id = ?', (template_id,))
-            template = cursor.fetchone()
-            conn.close()
-            
+            template = self.database.get_template(template_id)
+        
             if template:
-                self.agency_name.setText(template[2] or "")
-                self.pr_cpu.setText(template[3])
-                self.pr_ram.setText(template[4])
-                self.pr_storage.setText(template[5])
-                self.pr_graphics.setText(template[6] or "")
-                self.pr_wifi.setText(template[7] or "")
-                self.pr_notes.setText(template[8] or "")
-                
+                self.agency_name.setText(template['agency_name'] or "")
+                self.pr_cpu.setText(template['pr_cpu'])
+                self.pr_ram.setText(template['pr_ram'])
+                self.pr_storage.setText(template['pr_storage'])
+                self.pr_graphics.setText(template['pr_graphics'] or "")
+                self.pr_wifi.setText(template['pr_wifi'] or "")
+                self.pr_notes.setText(template['pr_notes'] or "")
+        
                 # Switch to inspection tab
                 tabs = self.centralWidget().findChild(QTabWidget)
                 if tabs:
                     tabs.setCurrentIndex(0)
-                
-                QMessageBox.information(self, "Template Loaded", f"Template '{template[1]}' loaded successfully!\nFill in PR Number and Serial Number to continue.")
-                
+        
+                QMessageBox.information(self, "Template Loaded", f"Template '{template['template_name']}' loaded successfully!\nFill in PR Number and Serial Number to continue.")
+        
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error using template: {str(e)}")
     
@@ -2620,16 +2293,7 @@ Overall Performance: {cpu_assessment}
     def load_pending_inspections(self):
         """Load all pending inspections from database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT id, pr_number, agency_name, laptop_model, pr_cpu, pr_ram, pr_storage, status
-                FROM pending_inspections
-                WHERE status = 'pending'
-                ORDER BY created_at DESC
-            ''')
-            pending = cursor.fetchall()
-            conn.close()
+            pending = self.database.list_pending()
             
             self.pending_table.setRowCount(len(pending))
             
@@ -2684,107 +2348,34 @@ Overall Performance: {cpu_assessment}
     
     def create_new_pending(self):
         """Create a new pending inspection"""
-        # Get templates for dropdown
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('SELECT id, template_name, agency_name, pr_cpu, pr_ram, pr_storage, pr_graphics, pr_wifi, pr_notes FROM pr_templates')
-            templates = [dict(zip(['id', 'template_name', 'agency_name', 'pr_cpu', 'pr_ram', 'pr_storage', 'pr_graphics', 'pr_wifi', 'pr_notes'], row)) for row in cursor.fetchall()]
-            conn.close()
-            
-            dialog = PendingInspectionDialog(self, templates)
+            dialog = PendingInspectionDialog(self, self.database.templates())
             if dialog.exec():
                 pending_data = dialog.get_pending_data()
-                
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO pending_inspections 
-                    (agency_name, pr_number, laptop_model, expected_serial, pr_cpu, pr_ram, pr_storage, 
-                     pr_graphics, pr_wifi, pr_notes, status, created_by, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'pending', ?, ?)
-                ''', (
-                    pending_data['agency_name'],
-                    pending_data['pr_number'],
-                    pending_data['laptop_model'],
-                    pending_data['expected_serial'],
-                    pending_data['pr_cpu'],
-                    pending_data['pr_ram'],
-                    pending_data['pr_storage'],
-                    pending_data['pr_graphics'],
-                    pending_data['pr_wifi'],
-                    pending_data['pr_notes'],
-                    self.user_info['username'],
-                    datetime.now().isoformat()
-                ))
-                conn.commit()
-                conn.close()
-                
+                self.database.create_pending(pending_data, self.user_info['username'])
+        
                 self.log_action("Create Pending Inspection", f"PR: {pending_data['pr_number']}")
                 QMessageBox.information(self, "Success", "Pending inspection created successfully!")
                 self.load_pending_inspections()
-                
+        
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error creating pending inspection: {str(e)}")
     
     def edit_pending(self, pending_id):
         """Edit a pending inspection"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM pending_inspections WHERE id = ?', (pending_id,))
-            pending = cursor.fetchone()
-            
-            # Get templates
-            cursor.execute('SELECT id, template_name, agency_name, pr_cpu, pr_ram, pr_storage, pr_graphics, pr_wifi, pr_notes FROM pr_templates')
-            templates = [dict(zip(['id', 'template_name', 'agency_name', 'pr_cpu', 'pr_ram', 'pr_storage', 'pr_graphics', 'pr_wifi', 'pr_notes'], row)) for row in cursor.fetchall()]
-            conn.close()
-            
+            pending = self.database.get_pending(pending_id)
+        
             if pending:
-                pending_data = {
-                    'agency_name': pending[1],
-                    'pr_number': pending[2],
-                    'laptop_model': pending[3],
-                    'expected_serial': pending[4],
-                    'pr_cpu': pending[5],
-                    'pr_ram': pending[6],
-                    'pr_storage': pending[7],
-                    'pr_graphics': pending[8],
-                    'pr_wifi': pending[9],
-                    'pr_notes': pending[10]
-                }
-                
-                dialog = PendingInspectionDialog(self, templates, pending_data)
+                dialog = PendingInspectionDialog(self, self.database.templates(), pending)
                 if dialog.exec():
                     updated_data = dialog.get_pending_data()
-                    
-                    conn = sqlite3.connect(self.db_path)
-                    cursor = conn.cursor()
-                    cursor.execute('''
-                        UPDATE pending_inspections 
-                        SET agency_name=?, pr_number=?, laptop_model=?, expected_serial=?, 
-                            pr_cpu=?, pr_ram=?, pr_storage=?, pr_graphics=?, pr_wifi=?, pr_notes=?
-                        WHERE id=?
-                    ''', (
-                        updated_data['agency_name'],
-                        updated_data['pr_number'],
-                        updated_data['laptop_model'],
-                        updated_data['expected_serial'],
-                        updated_data['pr_cpu'],
-                        updated_data['pr_ram'],
-                        updated_data['pr_storage'],
-                        updated_data['pr_graphics'],
-                        updated_data['pr_wifi'],
-                        updated_data['pr_notes'],
-                        pending_id
-                    ))
-                    conn.commit()
-                    conn.close()
-                    
+                    self.database.update_pending(pending_id, updated_data)
+        
                     self.log_action("Edit Pending Inspection", f"Pending ID: {pending_id}")
                     QMessageBox.information(self, "Success", "Pending inspection updated successfully!")
                     self.load_pending_inspections()
-                    
+        
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error editing pending inspection: {str(e)}")
     
@@ -2800,11 +2391,7 @@ Overall Performance: {cpu_assessment}
         
         if reply == QMessageBox.Yes:
             try:
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                cursor.execute('DELETE FROM pending_inspections WHERE id = ?', (pending_id,))
-                conn.commit()
-                conn.close()
+                self.database.delete_pending(pending_id)
                 
                 self.log_action("Delete Pending Inspection", f"Pending ID: {pending_id}")
                 QMessageBox.information(self, "Success", "Pending inspection deleted successfully!")
@@ -2816,55 +2403,42 @@ Overall Performance: {cpu_assessment}
     def start_pending_inspection(self, pending_id):
         """Start a pending inspection - load data into inspection tab"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM pending_inspections WHERE id = ?', (pending_id,))
-            pending = cursor.fetchone()
-            conn.close()
-            
+            pending = self.database.get_pending(pending_id)
+        
             if pending:
                 # Load data into inspection form
-                self.agency_name.setText(pending[1])
-                self.pr_number.setText(pending[2])
-                self.laptop_model.setText(pending[3] or "")
-                self.serial_number.setText(pending[4] or "")
-                self.pr_cpu.setText(pending[5])
-                self.pr_ram.setText(pending[6])
-                self.pr_storage.setText(pending[7])
-                self.pr_graphics.setText(pending[8] or "")
-                self.pr_wifi.setText(pending[9] or "")
-                self.pr_notes.setText(pending[10] or "")
-                
+                self.agency_name.setText(pending['agency_name'])
+                self.pr_number.setText(pending['pr_number'])
+                self.laptop_model.setText(pending['laptop_model'] or "")
+                self.serial_number.setText(pending['expected_serial'] or "")
+                self.pr_cpu.setText(pending['pr_cpu'])
+                self.pr_ram.setText(pending['pr_ram'])
+                self.pr_storage.setText(pending['pr_storage'])
+                self.pr_graphics.setText(pending['pr_graphics'] or "")
+                self.pr_wifi.setText(pending['pr_wifi'] or "")
+                self.pr_notes.setText(pending['pr_notes'] or "")
+        
                 # Store pending ID for later marking as completed
                 self.current_pending_id = pending_id
-                
+        
                 # Switch to inspection tab
                 tabs = self.centralWidget().findChild(QTabWidget)
                 if tabs:
                     tabs.setCurrentIndex(0)
-                
+        
                 QMessageBox.information(
                     self,
                     "Inspection Started",
-                    f"Pending inspection loaded!\n\nPR: {pending[2]}\nAgency: {pending[1]}\n\nNext steps:\n1. Fill in Serial Number (if not yet entered)\n2. Auto-Detect Hardware\n3. Validate & Complete"
+                    f"Pending inspection loaded!\n\nPR: {pending['pr_number']}\nAgency: {pending['agency_name']}\n\nNext steps:\n1. Fill in Serial Number (if not yet entered)\n2. Auto-Detect Hardware\n3. Validate & Complete"
                 )
-                
+        
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error starting inspection: {str(e)}")
     
     def quick_load_pending(self):
         """Quick load from pending inspections"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT id, pr_number, agency_name 
-                FROM pending_inspections 
-                WHERE status = 'pending'
-                ORDER BY created_at DESC
-            ''')
-            pending_list = cursor.fetchall()
-            conn.close()
+            pending_list = self.database.pending_choices()
             
             if not pending_list:
                 QMessageBox.information(self, "No Pending", "No pending inspections found.\n\nGo to 'Pending Inspections' tab to create some!")
@@ -2907,11 +2481,7 @@ Overall Performance: {cpu_assessment}
     def quick_load_template(self):
         """Quick load from templates"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('SELECT id, template_name, agency_name FROM pr_templates ORDER BY template_name')
-            templates_list = cursor.fetchall()
-            conn.close()
+            templates_list = self.database.template_choices()
             
             if not templates_list:
                 QMessageBox.information(self, "No Templates", "No templates found.\n\nGo to 'PR Templates' tab to create some!")
@@ -3017,19 +2587,9 @@ Overall Performance: {cpu_assessment}
         self.inspection_combo.clear()
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT id, inspection_date, agency_name, pr_number, serial_number, laptop_model 
-                FROM inspections 
-                ORDER BY inspection_date DESC
-            ''')
-            
-            for row in cursor.fetchall():
+            for row in self.database.inspection_choices():
                 display_text = f"{row[1]} - {row[2]} - PR:{row[3]} - S/N:{row[4]}"
                 self.inspection_combo.addItem(display_text, row[0])  # Store ID as user data
-            
-            conn.close()
         except Exception as e:
             QMessageBox.critical(self, "Load Error", f"Error loading inspections: {str(e)}")
 
@@ -3040,15 +2600,9 @@ Overall Performance: {cpu_assessment}
             return
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('SELECT inspection_data FROM inspections WHERE id = ?', (inspection_id,))
-            result = cursor.fetchone()
-            conn.close()
-            
-            if result:
-                inspection_data = json.loads(result[0])
-                self.display_comparison_results(inspection_data)
+            inspection = self.database.get_inspection(inspection_id)
+            if inspection:
+                self.display_comparison_results(inspection.inspection_data)
         
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error loading inspection: {str(e)}")
@@ -3081,366 +2635,10 @@ Overall Performance: {cpu_assessment}
 
     def display_comparison_results(self, inspection_data):
         """Display comprehensive comparison results in the table"""
-        detected_specs = inspection_data.get('detected_specs', {})
-        pr_specs = inspection_data.get('purchase_request_specs', {})
-        physical_condition = inspection_data.get('physical_condition', {})
-        
-        # Prepare comparison data
-        comparison_data = []
-        
-        # === HARDWARE COMPARISON ===
-        
-        # CPU Comparison
-        cpu_result = self.compare_cpu_specs(pr_specs.get('cpu', ''), detected_specs.get('CPU', {}))
-        comparison_data.append(cpu_result)
-        
-        # RAM Comparison
-        ram_result = self.compare_ram_specs(pr_specs.get('ram', ''), detected_specs.get('RAM', {}))
-        comparison_data.append(ram_result)
-        
-        # Storage Comparison
-        storage_result = self.compare_storage_specs(pr_specs.get('storage', ''), detected_specs.get('Storage', {}))
-        comparison_data.append(storage_result)
-        
-        # Graphics Comparison
-        graphics_result = self.compare_graphics_specs(pr_specs.get('graphics', ''), detected_specs.get('Graphics', {}))
-        comparison_data.append(graphics_result)
-        
-        # Network/WiFi Comparison
-        wifi_result = self.compare_wifi_specs(pr_specs.get('wifi', ''), detected_specs.get('Network', {}))
-        comparison_data.append(wifi_result)
-        
-        # === PHYSICAL CONDITION ASSESSMENT ===
-        
-        # Chassis Condition
-        chassis_result = self.assess_physical_condition("Chassis", physical_condition.get('chassis', ''))
-        comparison_data.append(chassis_result)
-        
-        # Screen Condition
-        screen_result = self.assess_physical_condition("Screen", physical_condition.get('screen', ''))
-        comparison_data.append(screen_result)
-        
-        # Keyboard Condition
-        keyboard_result = self.assess_physical_condition("Keyboard", physical_condition.get('keyboard', ''))
-        comparison_data.append(keyboard_result)
-        
-        # Ports Condition
-        ports_result = self.assess_physical_condition("Ports", physical_condition.get('ports', ''))
-        comparison_data.append(ports_result)
-        
-        # === SYSTEM INFORMATION ===
-        
-        # OS Information
-        if 'System' in detected_specs:
-            os_info = detected_specs['System'].get('OS', 'Unknown')
-            comparison_data.append({
-                'component': 'Operating System',
-                'pr_spec': 'N/A',
-                'actual_spec': os_info,
-                'status': 'INFO',
-                'notes': 'Detected operating system'
-            })
-        
-        # Battery Information
-        if 'Battery' in detected_specs:
-            battery_info = detected_specs['Battery']
-            battery_status = f"{battery_info.get('Percent', 'N/A')} - {battery_info.get('Power Plugged', 'N/A')}"
-            comparison_data.append({
-                'component': 'Battery',
-                'pr_spec': 'N/A',
-                'actual_spec': battery_status,
-                'status': 'INFO',
-                'notes': 'Battery status'
-            })
-        
-        # Populate the table
+        comparison_data = compare_inspection(inspection_data)
         self.populate_comparison_table(comparison_data)
         self.update_comparison_summary(comparison_data)
 
-    def compare_cpu_specs(self, pr_cpu: str, actual_cpu: dict) -> dict:
-        """Compare CPU specifications"""
-        actual_name = actual_cpu.get('Name', 'Not detected')
-        actual_cores = actual_cpu.get('Cores', 'N/A')
-        actual_threads = actual_cpu.get('Threads', 'N/A')
-        
-        if not pr_cpu:
-            return {
-                'component': 'CPU',
-                'pr_spec': 'Not specified',
-                'actual_spec': f"{actual_name} ({actual_cores} cores, {actual_threads} threads)",
-                'status': 'INFO',
-                'notes': 'No PR specification provided'
-            }
-        
-        # Enhanced CPU matching
-        pr_upper = pr_cpu.upper()
-        actual_upper = actual_name.upper()
-        
-        # Check for model number matches (e.g., i7, i5, Ryzen 7, etc.)
-        common_indicators = ['I7', 'I5', 'I3', 'RYZEN 7', 'RYZEN 5', 'RYZEN 3', 'CORE I7', 'CORE I5', 'CORE I3']
-        
-        pr_indicator = next((ind for ind in common_indicators if ind in pr_upper), None)
-        actual_indicator = next((ind for ind in common_indicators if ind in actual_upper), None)
-        
-        if pr_indicator and actual_indicator and pr_indicator == actual_indicator:
-            return {
-                'component': 'CPU',
-                'pr_spec': pr_cpu,
-                'actual_spec': f"{actual_name} ({actual_cores} cores, {actual_threads} threads)",
-                'status': 'PASS',
-                'notes': f'CPU tier matches: {pr_indicator}'
-            }
-        elif pr_upper in actual_upper:
-            return {
-                'component': 'CPU',
-                'pr_spec': pr_cpu,
-                'actual_spec': f"{actual_name} ({actual_cores} cores, {actual_threads} threads)",
-                'status': 'PASS',
-                'notes': 'Exact CPU model match'
-            }
-        else:
-            return {
-                'component': 'CPU',
-                'pr_spec': pr_cpu,
-                'actual_spec': f"{actual_name} ({actual_cores} cores, {actual_threads} threads)",
-                'status': 'FAIL',
-                'notes': 'CPU specification does not match PR requirements'
-            }
-
-    def compare_ram_specs(self, pr_ram: str, actual_ram: dict) -> dict:
-        """Compare RAM specifications"""
-        actual_total = actual_ram.get('Total', 'Not detected')
-        
-        if not pr_ram:
-            return {
-                'component': 'RAM',
-                'pr_spec': 'Not specified',
-                'actual_spec': actual_total,
-                'status': 'INFO',
-                'notes': 'No PR specification provided'
-            }
-        
-        pr_gb = self.extract_gb(pr_ram)
-        actual_gb = self.extract_gb(actual_total)
-        
-        if pr_gb and actual_gb:
-            if actual_gb >= pr_gb:
-                return {
-                    'component': 'RAM',
-                    'pr_spec': pr_ram,
-                    'actual_spec': actual_total,
-                    'status': 'PASS',
-                    'notes': f'RAM capacity meets requirement ({actual_gb}GB >= {pr_gb}GB)'
-                }
-            else:
-                return {
-                    'component': 'RAM',
-                    'pr_spec': pr_ram,
-                    'actual_spec': actual_total,
-                    'status': 'FAIL',
-                    'notes': f'RAM capacity insufficient ({actual_gb}GB < {pr_gb}GB)'
-                }
-        
-        return {
-            'component': 'RAM',
-            'pr_spec': pr_ram,
-            'actual_spec': actual_total,
-            'status': 'WARNING',
-            'notes': 'Could not parse RAM specifications for comparison'
-        }
-
-    def compare_storage_specs(self, pr_storage: str, actual_storage: dict) -> dict:
-        """Compare storage specifications"""
-        if not pr_storage:
-            return {
-                'component': 'Storage',
-                'pr_spec': 'Not specified',
-                'actual_spec': self.format_storage_info(actual_storage),
-                'status': 'INFO',
-                'notes': 'No PR specification provided'
-            }
-        
-        pr_gb = self.extract_gb(pr_storage)
-        total_actual_gb = 0
-        
-        # Calculate total storage from all drives
-        for drive, info in actual_storage.items():
-            if 'Total' in info:
-                drive_gb = self.extract_gb(info['Total'])
-                if drive_gb:
-                    total_actual_gb += drive_gb
-        
-        if pr_gb and total_actual_gb > 0:
-            if total_actual_gb >= pr_gb:
-                return {
-                    'component': 'Storage',
-                    'pr_spec': pr_storage,
-                    'actual_spec': self.format_storage_info(actual_storage),
-                    'status': 'PASS',
-                    'notes': f'Total storage meets requirement ({total_actual_gb}GB >= {pr_gb}GB)'
-                }
-            else:
-                return {
-                    'component': 'Storage',
-                    'pr_spec': pr_storage,
-                    'actual_spec': self.format_storage_info(actual_storage),
-                    'status': 'FAIL',
-                    'notes': f'Total storage insufficient ({total_actual_gb}GB < {pr_gb}GB)'
-                }
-        
-        return {
-            'component': 'Storage',
-            'pr_spec': pr_storage,
-            'actual_spec': self.format_storage_info(actual_storage),
-            'status': 'WARNING',
-            'notes': 'Could not parse storage specifications'
-        }
-
-    def compare_graphics_specs(self, pr_graphics: str, actual_graphics: dict) -> dict:
-        """Compare graphics specifications"""
-        actual_cards = actual_graphics.get('Cards', ['Not detected'])
-        actual_display = ", ".join(actual_cards) if isinstance(actual_cards, list) else str(actual_cards)
-        
-        if not pr_graphics:
-            return {
-                'component': 'Graphics',
-                'pr_spec': 'Not specified',
-                'actual_spec': actual_display,
-                'status': 'INFO',
-                'notes': 'No PR specification provided'
-            }
-        
-        pr_upper = pr_graphics.upper()
-        actual_upper = actual_display.upper()
-        
-        # Check for graphics card family matches
-        common_families = ['GEFORCE', 'RADEON', 'INTEL HD', 'INTEL UHD', 'IRIS XE']
-        
-        pr_family = next((fam for fam in common_families if fam in pr_upper), None)
-        actual_family = next((fam for fam in common_families if fam in actual_upper), None)
-        
-        if pr_family and actual_family:
-            if pr_family in actual_family or actual_family in pr_family:
-                return {
-                    'component': 'Graphics',
-                    'pr_spec': pr_graphics,
-                    'actual_spec': actual_display,
-                    'status': 'PASS',
-                    'notes': f'Graphics family matches: {pr_family}'
-                }
-        
-        if pr_upper in actual_upper:
-            return {
-                'component': 'Graphics',
-                'pr_spec': pr_graphics,
-                'actual_spec': actual_display,
-                'status': 'PASS',
-                'notes': 'Exact graphics card match'
-            }
-        
-        return {
-            'component': 'Graphics',
-            'pr_spec': pr_graphics,
-            'actual_spec': actual_display,
-            'status': 'FAIL',
-            'notes': 'Graphics specification does not match PR requirements'
-        }
-
-    def compare_wifi_specs(self, pr_wifi: str, actual_network: dict) -> dict:
-        """Compare WiFi specifications"""
-        # Extract WiFi adapters from network info
-        wifi_adapters = []
-        for interface, info in actual_network.items():
-            if any(wifi_keyword in interface.upper() for wifi_keyword in ['WIFI', 'WIRELESS', '802.11']):
-                wifi_adapters.append(interface)
-        
-        actual_display = ", ".join(wifi_adapters) if wifi_adapters else "No WiFi adapters detected"
-        
-        if not pr_wifi:
-            return {
-                'component': 'WiFi',
-                'pr_spec': 'Not specified',
-                'actual_spec': actual_display,
-                'status': 'INFO',
-                'notes': 'No PR specification provided'
-            }
-        
-        # Basic WiFi standard checking
-        wifi_standards = ['802.11AX', 'WIFI 6', '802.11AC', 'WIFI 5', '802.11N', 'WIFI 4']
-        
-        pr_upper = pr_wifi.upper()
-        actual_upper = actual_display.upper()
-        
-        pr_standard = next((std for std in wifi_standards if std in pr_upper), None)
-        actual_standard = next((std for std in wifi_standards if std in actual_upper), None)
-        
-        if pr_standard and actual_standard:
-            # Compare WiFi standards (higher is better)
-            pr_index = wifi_standards.index(pr_standard)
-            actual_index = wifi_standards.index(actual_standard)
-            
-            if actual_index <= pr_index:  # Lower index means better standard
-                return {
-                    'component': 'WiFi',
-                    'pr_spec': pr_wifi,
-                    'actual_spec': actual_display,
-                    'status': 'PASS',
-                    'notes': f'WiFi standard meets requirement: {actual_standard}'
-                }
-            else:
-                return {
-                    'component': 'WiFi',
-                    'pr_spec': pr_wifi,
-                    'actual_spec': actual_display,
-                    'status': 'FAIL',
-                    'notes': f'WiFi standard insufficient: {actual_standard} vs required {pr_standard}'
-                }
-        
-        return {
-            'component': 'WiFi',
-            'pr_spec': pr_wifi,
-            'actual_spec': actual_display,
-            'status': 'WARNING',
-            'notes': 'Could not verify WiFi specifications'
-        }
-
-    def assess_physical_condition(self, component: str, condition: str) -> dict:
-        """Assess physical condition and return comparison result"""
-        condition_map = {
-            'Excellent': 'PASS',
-            'Good': 'PASS', 
-            'Fair': 'WARNING',
-            'Poor': 'FAIL',
-            'Damaged': 'FAIL',
-            'Cracked': 'FAIL',
-            'Non-functional': 'FAIL',
-            'All Working': 'PASS',
-            'Some Issues': 'WARNING',
-            'Major Issues': 'FAIL'
-        }
-        
-        status = condition_map.get(condition, 'INFO')
-        
-        return {
-            'component': f'Physical {component}',
-            'pr_spec': 'Good Condition',
-            'actual_spec': condition,
-            'status': status,
-            'notes': f'Physical condition assessment: {condition}'
-        }
-
-    def format_storage_info(self, storage_info: dict) -> str:
-        """Format storage information for display"""
-        if not storage_info:
-            return "No storage devices detected"
-        
-        drives = []
-        for drive, info in storage_info.items():
-            if 'Total' in info:
-                drives.append(f"{info.get('Device', drive)}: {info['Total']}")
-        
-        return " | ".join(drives) if drives else "Storage info unavailable"
-
     def populate_comparison_table(self, comparison_data):
         """Populate the comparison table with data"""
         self.comparison_table.setRowCount(len(comparison_data))
@@ -3479,10 +2677,11 @@ Overall Performance: {cpu_assessment}
     def update_comparison_summary(self, comparison_data):
         """Update the comparison summary text"""
         total_components = len(comparison_data)
-        pass_count = sum(1 for item in comparison_data if item['status'] == 'PASS')
-        fail_count = sum(1 for item in comparison_data if item['status'] == 'FAIL')
-        warning_count = sum(1 for item in comparison_data if item['status'] == 'WARNING')
-        info_count = sum(1 for item in comparison_data if item['status'] == 'INFO')
+        counts = status_counts(comparison_data)
+        pass_count = counts['PASS']
+        fail_count = counts['FAIL']
+        warning_count = counts['WARNING']
+        info_count = counts['INFO']
         
         pass_percentage = (pass_count / total_components * 100) if total_components > 0 else 0
         
@@ -3505,15 +2704,34 @@ Overall Performance: {cpu_assessment}
         self.summary_text.setText(summary_text.strip())
 
 def main():
+    trace = '--startup-trace' in sys.argv
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
+    STARTUP_TRACE.mark("QApplication")
     
     # Show login dialog first
     login_dialog = LoginDialog()
+    STARTUP_TRACE.mark("LoginDialog")
+    
+    if '--startup-probe' in sys.argv:
+        # Used by the startup benchmark: record the time to the login window and quit
+        probe_out = Path(sys.argv[sys.argv.index('--startup-probe') + 1])
+        def report_and_quit():
+            probe_out.write_text(json.dumps(STARTUP_TRACE.as_dict("login window shown")), encoding='utf-8')
+            login_dialog.reject()
+        QTimer.singleShot(0, report_and_quit)
+        login_dialog.exec()
+        sys.exit(0)
+    
+    if trace:
+        QTimer.singleShot(0, lambda: STARTUP_TRACE.report("login window shown"))
     if login_dialog.exec():
         if login_dialog.authenticated:
+            STARTUP_TRACE.mark("login (waiting for user)")
             window = LaptopInspectorApp(login_dialog.user_info)
             window.show()
+            if trace:
+                QTimer.singleShot(0, lambda: STARTUP_TRACE.report("main window shown"))
             sys.exit(app.exec())
     else:
         sys.exit(0)
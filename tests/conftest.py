@@ -0,0 +1,19 @@
+import socket
+
+import pytest
+
+
+@pytest.fixture
+def tcp_listener():
+    """Loopback port accepting connections (the kernel completes them from the backlog)"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+        server.bind(('127.0.0.1', 0))
+        server.listen(64)
+        yield server.getsockname()
+
+
+@pytest.fixture
+def closed_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()
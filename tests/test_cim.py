@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import pytest
+
+from coa_inspector.cim import (CimError, CimSnapshot, collect_cim_snapshot, parse_bios_info, parse_display_info,
+                               parse_graphics_info, parse_peripheral_devices, parse_ram_details,
+                               parse_storage_info, parse_system_serial, parse_warranty_info)
+
+# Output of the batched CIM script on a ThinkPad T490, serials changed
+RECORDED = (Path(__file__).parent / 'data' / 'cim_snapshot.json').read_text(encoding='utf-8')
+
+
+@pytest.fixture
+def cim():
+    return collect_cim_snapshot(lambda script, timeout: '\ufeff' + RECORDED + '\r\n')
+
+
+def test_single_instances_are_read_as_one_row(cim):
+    assert cim.rows('Win32_BIOS') == [cim.first('Win32_BIOS')]
+    assert len(cim.rows('Win32_PhysicalMemory')) == 2
+    assert cim.rows('Win32_Missing') == []
+
+
+def test_bios_and_serial_skip_placeholders(cim):
+    bios = parse_bios_info(cim)
+    assert bios['Serial Number'] == "Not available"
+    assert bios['Version'] == "N2IET98W (1.76 )"
+    assert parse_system_serial(cim) == "PF1ABCDE"
+    warranty = parse_warranty_info(cim, "PF1ABCDE")
+    assert (warranty['Manufacturer'], warranty['Model']) == ("LENOVO", "20N2S0K800")
+
+
+def test_ram_graphics_and_display(cim):
+    assert parse_ram_details(cim) == {'Modules': 2, 'Speed': "2400 MHz", 'Type': "DDR4"}
+    assert parse_graphics_info(cim)['Cards'] == ["Intel(R) UHD Graphics 620", "NVIDIA GeForce MX250"]
+    # The primary screen bounds win over the WMI monitor resolution
+    assert parse_display_info(cim) == {'Resolution': "1920x1080", 'Name': "Generic PnP Monitor"}
+
+
+def test_storage_maps_volumes_to_disks(cim):
+    volumes = [{'Device': "C:\\", 'Mount': "C:\\", 'FileSystem': "NTFS",
+                'Free': 120 * 1024**3, 'Total': 475 * 1024**3}]
+    drive = parse_storage_info(cim, volumes)['Drive_1']
+    assert drive['Media'] == "NVMe SSD" and drive['Total'] == "512 GB" and drive['Removable'] == "No"
+    assert drive['Volumes'] == ["C:\\ NTFS - 120 GB free of 475 GB"]
+
+
+def test_peripherals_are_classified(cim):
+    peripherals = parse_peripheral_devices(cim)
+    assert peripherals['Webcam'] == "Integrated Camera"
+    assert peripherals['Audio Devices'] == ["Realtek Audio"]
+    assert peripherals['Fingerprint Reader'] == "Available"
+    assert peripherals['Bluetooth'] == "Available"
+    # Camera, fingerprint sensor and Bluetooth; the root hub is not counted
+    assert peripherals['USB Devices'] == "3 USB devices connected"
+    assert peripherals['Inventory']['Security'] == ["Trusted Platform Module 2.0"]
+
+
+def test_empty_snapshot_falls_back():
+    cim = CimSnapshot({})
+    assert parse_bios_info(cim) == {'Error': 'Could not retrieve BIOS info'}
+    assert parse_ram_details(cim) == {}
+    assert parse_graphics_info(cim)['Cards'] == ["Unable to detect graphics cards"]
+
+
+@pytest.mark.parametrize('output', ["", "not json", "[1, 2]"])
+def test_bad_output_raises_cim_error(output):
+    with pytest.raises(CimError):
+        CimSnapshot.from_json(output)
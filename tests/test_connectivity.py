@@ -0,0 +1,14 @@
+from coa_inspector.connectivity import check_connectivity
+
+
+def test_connectivity_reaches_a_local_listener(tcp_listener, closed_port):
+    report = check_connectivity([tcp_listener, closed_port], ['localhost'], budget=2)
+    assert report.connected and report.dns_ok
+    assert report.status() == "Internet: Connected"
+    results = {result.target: result for result in report.results}
+    assert not results[f"127.0.0.1:{closed_port[1]}"].ok
+
+
+def test_connectivity_without_reachable_targets(closed_port):
+    report = check_connectivity([closed_port], [], budget=2)
+    assert report.status() == "Internet: No Connection"
@@ -0,0 +1,14 @@
+from coa_inspector.cpu_benchmark import run_cpu_benchmark, worker_counts
+from coa_inspector.harness import BenchmarkHarness
+
+# Small sizes: these check the shape and units of the results, not the hardware
+QUICK = BenchmarkHarness(warmup=0, repetitions=2)
+
+
+def test_cpu_benchmark_reports_scores_per_worker_count():
+    result = run_cpu_benchmark(physical_cores=1, logical_threads=2, units_per_worker=1, iterations=20_000,
+                               harness=QUICK)
+    assert sorted(result.scores) == worker_counts(2) == [1, 2]
+    assert result.single_thread_score > 0 and result.all_core_score > 0
+    assert result.score_stats[1]['unit'] == "Mops/s" and len(result.score_stats[1]['values']) == 2
+    assert result.verdict and not result.cancelled
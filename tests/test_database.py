@@ -0,0 +1,120 @@
+import _thread
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from coa_inspector import database as database_module
+from coa_inspector.database import HOT_QUERIES, SCHEMA, SCHEMA_VERSION, InspectionDatabase
+from coa_inspector.model import Inspection
+
+
+@pytest.fixture
+def database(tmp_path):
+    with InspectionDatabase(tmp_path / "inspections.db") as database:
+        database.init_schema()
+        yield database
+
+
+def test_new_database_is_at_current_version(database):
+    assert database.schema_version() == SCHEMA_VERSION
+    assert database.init_schema() == SCHEMA_VERSION
+
+
+def test_hot_queries_use_indexes(database):
+    plans = database.query_plans()
+    assert set(plans) == set(HOT_QUERIES)
+    assert database.unindexed_queries() == [], plans
+
+
+def test_unversioned_database_is_migrated(tmp_path):
+    # A database written before versioning: the tables, no indexes, user_version 0
+    path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(path)
+    for statement in SCHEMA:
+        conn.execute(statement)
+    conn.execute("INSERT INTO audit_log (action, username, details, timestamp) VALUES ('Login', 'old', '', '2025')")
+    conn.commit()
+    conn.close()
+
+    with InspectionDatabase(path) as database:
+        assert database.schema_version() == 0
+        assert database.unindexed_queries()
+        assert database.init_schema() == SCHEMA_VERSION
+        assert database.schema_version() == SCHEMA_VERSION
+        assert database.unindexed_queries() == []
+        assert database.audit_log() == [('2025', 'old', 'Login', '')]
+
+
+def test_benchmark_counts_skip_inspections_without_benchmarks(database):
+    # The window always stores performance_tests, as {} when no test was run
+    database.save_inspection(Inspection(laptop_model="Model A", inspection_data={'performance_tests': {}}))
+    database.save_inspection(Inspection(laptop_model="Model B"))
+    assert database.benchmark_counts() == []
+
+
+def test_benchmark_counts_count_flagged_units(database):
+    for underperforming in (True, False):
+        performance_tests = {'Scores': {'cpu_all_core': 100.0},
+                             'Reference': {'source': "CPU x", 'rows': [], 'underperforming': underperforming}}
+        database.save_inspection(Inspection(laptop_model="Model A",
+                                            inspection_data={'performance_tests': performance_tests}))
+    database.save_inspection(Inspection(laptop_model="Model B",
+                                        inspection_data={'performance_tests': {'Scores': {}}}))
+    assert database.benchmark_counts() == [("Model A", 2, 1), ("Model B", 1, 0)]
+
+
+def test_connections_are_tuned(database):
+    conn = database.connect()
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    assert conn.execute('PRAGMA busy_timeout').fetchone()[0] == database_module.BUSY_TIMEOUT_MS
+    assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1  # NORMAL
+
+
+def test_each_thread_gets_its_own_connection(database):
+    connections = []
+    thread = threading.Thread(target=lambda: connections.append(database.connect()))
+    thread.start()
+    thread.join()
+    assert connections[0] is not database.connect()
+
+
+def test_release_closes_connections_of_threads_python_did_not_start(database):
+    # _thread threads show up as a _DummyThread, as QThreads do, and never report dead
+    done = threading.Event()
+
+    def worker():
+        database.log_action("Hardware Detection", "tester")
+        database.release()
+        done.set()
+
+    _thread.start_new_thread(worker, ())
+    assert done.wait(5)
+    assert list(database._connections) == [threading.main_thread()]
+
+
+@pytest.fixture
+def locked(database, monkeypatch):
+    """Another connection holding the write lock; SQLite itself does not wait for it"""
+    monkeypatch.setattr(database_module, 'BUSY_TIMEOUT_MS', 0)
+    monkeypatch.setattr(database_module, 'LOCK_BACKOFF', 0.05)
+    database.close()
+    other = sqlite3.connect(database.db_path, isolation_level=None, check_same_thread=False)
+    other.execute('BEGIN IMMEDIATE')
+    yield other
+    other.close()
+
+
+def test_locked_write_is_retried_with_backoff(database, locked):
+    # Retries wait 0.05, 0.1, 0.2 and 0.4 s; the lock goes away after 0.2 s
+    threading.Timer(0.2, locked.rollback).start()
+    database.log_action("Save Inspection", "tester")
+    assert [row[2] for row in database.audit_log()] == ["Save Inspection"]
+
+
+def test_locked_write_gives_up_after_the_retries(database, locked):
+    started = time.perf_counter()
+    with pytest.raises(sqlite3.OperationalError, match="locked"):
+        database.log_action("Save Inspection", "tester")
+    assert time.perf_counter() - started >= 0.05 * (2 ** database_module.LOCK_RETRIES - 1)
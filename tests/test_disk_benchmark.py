@@ -0,0 +1,14 @@
+from coa_inspector.disk_benchmark import TEST_FILE_NAME, run_disk_benchmark
+from coa_inspector.harness import BenchmarkHarness
+
+# Small sizes: these check the shape and units of the results, not the hardware
+QUICK = BenchmarkHarness(warmup=0, repetitions=2)
+
+
+def test_disk_benchmark_reports_throughput_and_iops(tmp_path):
+    result = run_disk_benchmark(tmp_path, file_size=4 * 1024**2, queue_depths=(1, 4), duration=0.2, harness=QUICK)
+    assert result.sequential_write_mbps > 0 and result.sequential_read_mbps > 0
+    assert result.sequential_read_stats['unit'] == "MB/s"
+    assert sorted(result.random_read_iops) == sorted(result.random_write_iops) == [1, 4]
+    assert result.random_read_stats[1]['unit'] == "IOPS"
+    assert not (tmp_path / TEST_FILE_NAME).exists()
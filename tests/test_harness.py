@@ -0,0 +1,55 @@
+import threading
+
+import pytest
+
+from coa_inspector import harness
+from coa_inspector.harness import BenchmarkHarness
+
+
+@pytest.fixture
+def process_settings(monkeypatch):
+    """Fake process-wide affinity and priority, starting at all CPUs and normal priority"""
+    settings = {'affinity': [0, 1, 2, 3], 'priority': 0}
+    monkeypatch.setattr(harness, 'PROCESS_WIDE_PINNING', True)
+    monkeypatch.setattr(harness, '_get_affinity', lambda: list(settings['affinity']))
+    monkeypatch.setattr(harness, '_set_affinity', lambda cpus: settings.update(affinity=list(cpus)))
+    monkeypatch.setattr(harness, '_get_priority', lambda: settings['priority'])
+    monkeypatch.setattr(harness, '_set_priority', lambda priority: settings.update(priority=priority))
+    return settings
+
+
+def test_nested_pins_restore_the_original_settings(process_settings):
+    pin = BenchmarkHarness(cpu_affinity=[1], high_priority=True)
+    with pin.pinned():
+        with pin.pinned():
+            assert process_settings['affinity'] == [1]
+        # The outer block still runs pinned
+        assert process_settings['affinity'] == [1]
+    assert process_settings == {'affinity': [0, 1, 2, 3], 'priority': 0}
+
+
+def test_overlapping_pins_on_threads_restore_the_original_settings(process_settings):
+    pin = BenchmarkHarness(cpu_affinity=[1], high_priority=True)
+    first_pinned, second_done = threading.Event(), threading.Event()
+    seen_after_second = []
+
+    def first():
+        # Enters first and leaves while the second thread is still pinned
+        with pin.pinned():
+            first_pinned.set()
+            second_done.wait(5)
+
+    def second():
+        first_pinned.wait(5)
+        with pin.pinned():
+            pass
+        seen_after_second.append(process_settings['affinity'])
+        second_done.set()
+
+    threads = [threading.Thread(target=first), threading.Thread(target=second)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert seen_after_second == [[1]]
+    assert process_settings == {'affinity': [0, 1, 2, 3], 'priority': 0}
@@ -0,0 +1,77 @@
+import json
+import socket
+import struct
+import threading
+
+import pytest
+
+from coa_inspector.latency import latency_stats, load_probe_targets, run_latency_probes
+
+
+@pytest.fixture
+def dns_stub():
+    """UDP server answering A queries; names starting with 'missing' get NXDOMAIN, 'silent' no reply"""
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(('127.0.0.1', 0))
+
+    def serve():
+        while True:
+            try:
+                query, client = server.recvfrom(512)
+            except OSError:
+                return
+            label = query[13:13 + query[12]]
+            if label == b'silent':
+                continue
+            rcode = 3 if label == b'missing' else 0
+            header = struct.pack('>HHHHHH', struct.unpack('>H', query[:2])[0], 0x8180 | rcode, 1, 0, 0, 0)
+            server.sendto(header + query[12:], client)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield server.getsockname()
+    server.close()
+    thread.join(2)
+
+
+def test_tcp_probes_count_losses(tcp_listener, closed_port):
+    updates = []
+    report = run_latency_probes([tcp_listener, closed_port], [], rounds=3, interval=0, timeout=1,
+                                on_update=updates.append)
+    reachable, refused = report.targets
+    assert (reachable.sent, reachable.received, reachable.loss_percent) == (3, 3, 0.0)
+    assert reachable.min_ms <= reachable.avg_ms <= reachable.p95_ms
+    assert (refused.received, refused.loss_percent) == (0, 100.0) and refused.last_error
+    assert len(updates) == 6 and not report.cancelled
+
+
+def test_dns_probes_query_the_configured_server(dns_stub):
+    report = run_latency_probes([], ['intranet.local', 'missing.local', 'silent.local'], [dns_stub],
+                                rounds=2, interval=0, timeout=0.3)
+    answered, missing, silent = report.targets
+    assert answered.target == f"intranet.local @ 127.0.0.1:{dns_stub[1]}"
+    assert answered.received == 2
+    assert missing.received == 0 and missing.last_error == "server answered with error code 3"
+    assert silent.received == 0 and silent.last_error == "timed out"
+
+
+def test_cancelled_run_is_partial(tcp_listener):
+    cancel_event = threading.Event()
+    cancel_event.set()
+    report = run_latency_probes([tcp_listener], [], rounds=5, cancel_event=cancel_event)
+    assert report.cancelled and report.targets[0].sent == 0
+
+
+def test_latency_stats():
+    stats = latency_stats("TCP", "host:80", [10.0, None, 14.0, 12.0])
+    assert (stats.sent, stats.received, stats.loss_percent) == (4, 3, 25.0)
+    assert (stats.min_ms, stats.avg_ms, stats.p95_ms) == (10.0, 12.0, 14.0)
+    # Differences between consecutive replies: 4 and 2
+    assert stats.jitter_ms == 3.0
+
+
+def test_probe_targets_read_dns_servers(tmp_path):
+    path = tmp_path / 'connectivity_targets.json'
+    path.write_text(json.dumps({'tcp': ["192.168.1.1:80"], 'dns': ["intranet.local"],
+                                'dns_servers': ["192.168.1.1:53"]}), encoding='utf-8')
+    assert load_probe_targets(path) == ([('192.168.1.1', 80)], ["intranet.local"], [('192.168.1.1', 53)])
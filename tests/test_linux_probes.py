@@ -0,0 +1,130 @@
+import time
+
+import pytest
+
+from coa_inspector.linux_probes import LinuxProbes
+
+# Detection on the Linux boot stick must finish well within this
+BUDGET_SECONDS = 0.1
+
+CPUINFO = """processor\t: 0
+vendor_id\t: GenuineIntel
+model name\t: Intel(R) Core(TM) i5-8265U CPU @ 1.60GHz
+cpu MHz\t\t: 1800.000
+
+processor\t: 1
+vendor_id\t: GenuineIntel
+model name\t: Intel(R) Core(TM) i5-8265U CPU @ 1.60GHz
+"""
+
+MEMINFO = """MemTotal:       16189232 kB
+MemFree:         9862140 kB
+MemAvailable:   12345678 kB
+"""
+
+DMI = {
+    'bios_vendor': "LENOVO",
+    'bios_version': "N2IET98W (1.76 )",
+    'bios_date': "03/14/2022",
+    'sys_vendor': "LENOVO",
+    'product_name': "20N2S0K800",
+    'product_serial': "To be filled by O.E.M.",
+    'chassis_serial': "PF1ABCDE",
+}
+
+
+def memory_device(size_mb=8192, memory_type=26, speed=2667, configured_speed=2400) -> bytes:
+    """SMBIOS type 17 structure as exposed in /sys/firmware/dmi/entries/17-*/raw"""
+    raw = bytearray(0x28)
+    raw[0], raw[1] = 17, len(raw)
+    raw[0x0C:0x0E] = size_mb.to_bytes(2, 'little')
+    raw[0x12] = memory_type
+    raw[0x15:0x17] = speed.to_bytes(2, 'little')
+    raw[0x20:0x22] = configured_speed.to_bytes(2, 'little')
+    return bytes(raw)
+
+
+def write(root, relative, content):
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(content, bytes):
+        path.write_bytes(content)
+    else:
+        path.write_text(content)
+
+
+@pytest.fixture
+def laptop(tmp_path):
+    """A recorded sysfs/procfs tree of a laptop with one NVMe disk, an Intel GPU and a battery"""
+    write(tmp_path, 'proc/cpuinfo', CPUINFO)
+    write(tmp_path, 'proc/meminfo', MEMINFO)
+    for field, value in DMI.items():
+        write(tmp_path, f'sys/class/dmi/id/{field}', value + "\n")
+    write(tmp_path, 'sys/firmware/dmi/entries/17-0/raw', memory_device())
+    write(tmp_path, 'sys/firmware/dmi/entries/17-1/raw', memory_device())
+    write(tmp_path, 'sys/block/nvme0n1/size', str(512110190592 // 512))
+    write(tmp_path, 'sys/block/nvme0n1/queue/rotational', "0")
+    write(tmp_path, 'sys/block/nvme0n1/device/model', "SAMSUNG MZVLB512HBJQ-000L7")
+    write(tmp_path, 'sys/block/loop0/size', "1024")
+    write(tmp_path, 'sys/class/drm/card0/device/vendor', "0x8086")
+    write(tmp_path, 'sys/class/drm/card0/device/device', "0x3ea0")
+    write(tmp_path, 'sys/class/drm/card0-eDP-1/status', "connected")
+    write(tmp_path, 'sys/class/drm/card0-eDP-1/modes', "1920x1080\n1280x720")
+    write(tmp_path, 'sys/class/power_supply/AC/type', "Mains")
+    write(tmp_path, 'sys/class/power_supply/AC/online', "1")
+    for name, value in {'type': "Battery", 'status': "Charging", 'capacity': "81",
+                        'energy_full': "45000000", 'energy_full_design': "50000000", 'cycle_count': "212"}.items():
+        write(tmp_path, f'sys/class/power_supply/BAT0/{name}', value)
+    return LinuxProbes(root=tmp_path)
+
+
+def test_cpu_and_memory(laptop):
+    assert laptop.cpu_name() == "Intel(R) Core(TM) i5-8265U CPU @ 1.60GHz"
+    assert laptop.ram_details() == {'Modules': 2, 'Speed': "2400 MHz", 'Type': "DDR4"}
+    assert laptop.memory_total() == 16189232 * 1024
+
+
+def test_memory_without_root_falls_back_to_meminfo(tmp_path):
+    write(tmp_path, 'proc/meminfo', MEMINFO)
+    assert LinuxProbes(root=tmp_path).ram_details() == {
+        'Details': "15 GB visible to the OS; module type and speed need root"}
+
+
+def test_firmware_skips_placeholder_serials(laptop):
+    assert laptop.system_serial() == "PF1ABCDE"
+    assert laptop.bios_info() == {'Serial Number': "PF1ABCDE", 'Version': "N2IET98W (1.76 )",
+                                  'Manufacturer': "LENOVO", 'Release Date': "2022-03-14"}
+    assert laptop.warranty_info("PF1ABCDE")['Model'] == "20N2S0K800"
+
+
+def test_storage_graphics_display_and_battery(laptop):
+    assert laptop.storage_info() == {'Drive_1': {'Device': "/dev/nvme0n1", 'Model': "SAMSUNG MZVLB512HBJQ-000L7",
+                                                 'Media': "NVMe SSD", 'Bus': "NVMe", 'Removable': "No",
+                                                 'Total': "512 GB"}}
+    assert laptop.graphics_info() == {'Cards': ["Intel graphics [8086:3ea0]"]}
+    assert laptop.display_info() == {'Resolution': "1920x1080", 'Name': "Built-in Display"}
+    assert laptop.battery_info() == {'Percent': "81%", 'Power Plugged': "Yes", 'Status': "Charging",
+                                     'Health': "90%", 'Cycle Count': "212"}
+
+
+def test_empty_tree_gives_fallbacks(tmp_path):
+    probes = LinuxProbes(root=tmp_path)
+    assert probes.cpu_name() == "Unknown processor"
+    assert probes.ram_details() == {}
+    assert probes.bios_info() == {'Info': 'BIOS info unavailable (no DMI tables)'}
+    assert probes.battery_info() == {'Status': 'No battery detected'}
+
+
+def test_full_detection_is_within_budget(laptop):
+    started = time.perf_counter()
+    laptop.cpu_name()
+    laptop.ram_details()
+    laptop.bios_info()
+    laptop.warranty_info(laptop.system_serial())
+    laptop.storage_info()
+    laptop.graphics_info()
+    laptop.display_info()
+    laptop.battery_info()
+    laptop.network_info()
+    laptop.peripheral_devices()
+    assert time.perf_counter() - started < BUDGET_SECONDS
@@ -0,0 +1,37 @@
+import pytest
+
+from coa_inspector.harness import BenchmarkHarness
+from coa_inspector.memory_benchmark import (channel_assessment, channel_peak, format_memory_result,
+                                            run_memory_benchmark)
+
+# Small sizes: these check the shape and units of the results, not the hardware
+QUICK = BenchmarkHarness(warmup=0, repetitions=2)
+
+
+def test_memory_benchmark_reports_bandwidth_and_latency():
+    result = run_memory_benchmark({'Type': "DDR4", 'Speed': "3200 MHz", 'Modules': 1},
+                                  array_bytes=8 * 1024**2, harness=QUICK)
+    assert sorted(result.bandwidth_gbs) == ['add', 'copy', 'scale', 'triad']
+    assert all(value > 0 for value in result.bandwidth_gbs.values())
+    assert result.bandwidth_stats['copy']['unit'] == "GB/s"
+    assert result.latency_stats['unit'] == "ns" and result.latency_ns >= 0
+    assert result.channel_peak_gbs == 25.6
+    assert "One-channel peak: 25.6 GB/s (64-bit DDR4 channel)" in "\n".join(format_memory_result(result))
+
+
+@pytest.mark.parametrize('ram_type, speed, peak', [
+    ("DDR4", "3200 MHz", 25.6),
+    ("DDR5", "4800 MHz", 38.4),
+    ("LPDDR4", "4266 MHz", 8.532),
+    ("LPDDR5", "6400 MHz", 12.8),
+    ("Unknown", "3200 MHz", 0.0),
+    ("DDR4", "Unknown", 0.0),
+])
+def test_channel_peak_follows_the_memory_type(ram_type, speed, peak):
+    assert channel_peak(ram_type, speed) == pytest.approx(peak)
+
+
+def test_lpddr_is_not_assessed_as_single_channel():
+    assert channel_assessment(10.0, channel_peak("LPDDR5", "6400 MHz"), 1, "LPDDR5").startswith("Not assessed")
+    assert channel_assessment(10.0, 25.6, 1, "DDR4") == "Likely single-channel (one module installed)"
+    assert channel_assessment(40.0, 25.6, 2, "DDR4").startswith("Multi-channel")
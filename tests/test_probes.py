@@ -0,0 +1,138 @@
+import threading
+import time
+
+import pytest
+
+from coa_inspector.probe_cache import ProbeCache
+from coa_inspector.probes import (PROBE_CANCELLED, PROBE_ERROR, PROBE_OK, PROBE_TIMEOUT, Probe,
+                                  ProbeEngine)
+
+
+@pytest.fixture
+def hang():
+    """A probe function that blocks until the test ends"""
+    release = threading.Event()
+    yield lambda *args: release.wait(10)
+    release.set()
+
+
+def test_dependencies_receive_values_in_order():
+    probes = [
+        Probe('Sum', lambda a, b: a + b, depends_on=('A', 'B')),
+        Probe('A', lambda: "a"),
+        Probe('B', lambda: "b"),
+    ]
+    results = ProbeEngine().run(probes)
+    assert results['Sum'].status == PROBE_OK and results['Sum'].value == "ab"
+
+
+def test_unknown_dependency_is_rejected():
+    with pytest.raises(ValueError, match="Missing"):
+        ProbeEngine().run([Probe('A', lambda value: value, depends_on=('Missing',))])
+
+
+def test_slow_probe_times_out_without_holding_up_the_rest(hang):
+    probes = [
+        Probe('Slow', hang, timeout=0.2, default="n/a"),
+        Probe('Fast', lambda: 1),
+    ]
+    started = time.monotonic()
+    results = ProbeEngine(poll_interval=0.01).run(probes)
+    assert time.monotonic() - started < 2
+    assert results['Slow'].status == PROBE_TIMEOUT and results['Slow'].value == "n/a"
+    assert "0.2s timeout" in results['Slow'].error
+    assert results['Fast'].ok
+
+
+def test_failed_dependency_passes_its_default_on():
+    def fail():
+        raise RuntimeError("wmic not found")
+
+    probes = [
+        Probe('Query', fail, default={}),
+        Probe('Serial', lambda snapshot: snapshot.get('Serial', "Unknown"), depends_on=('Query',)),
+    ]
+    results = ProbeEngine().run(probes)
+    assert results['Query'].status == PROBE_ERROR and results['Query'].error == "wmic not found"
+    assert results['Serial'].ok and results['Serial'].value == "Unknown"
+
+
+def test_dependents_of_a_timed_out_probe_still_run(hang):
+    probes = [
+        Probe('Query', hang, timeout=0.1, default={}),
+        Probe('Serial', lambda snapshot: snapshot.get('Serial', "Unknown"), depends_on=('Query',)),
+    ]
+    results = ProbeEngine(poll_interval=0.01).run(probes)
+    assert results['Query'].timed_out
+    assert results['Serial'].value == "Unknown"
+
+
+def test_deadline_times_out_running_and_unstarted_probes(hang):
+    probes = [
+        Probe('Slow', hang, timeout=30),
+        Probe('After', lambda value: value, depends_on=('Slow',), timeout=30),
+    ]
+    results = ProbeEngine(deadline=0.2, poll_interval=0.01).run(probes)
+    assert results['Slow'].timed_out and "overall deadline" in results['Slow'].error
+    assert results['After'].timed_out and "not started" in results['After'].error
+
+
+def test_cancel_reports_unfinished_probes(hang):
+    cancel_event = threading.Event()
+    cancel_event.set()
+    probes = [Probe('Slow', hang), Probe('After', lambda value: value, depends_on=('Slow',))]
+    results = ProbeEngine(poll_interval=0.01).run(probes, cancel_event=cancel_event)
+    assert results['Slow'].status == PROBE_CANCELLED
+    assert results['After'].status == PROBE_CANCELLED
+
+
+def test_query_feeding_only_cached_probes_is_skipped():
+    calls = []
+
+    def query():
+        calls.append('query')
+        return {'Serial': "ABC123"}
+
+    probes = [
+        Probe('Static Query', query, default={}),
+        Probe('Serial', lambda snapshot: snapshot['Serial'], depends_on=('Static Query',), static=True),
+    ]
+    cache = ProbeCache()
+    first = ProbeEngine().run(probes, cache=cache)
+    assert first['Serial'].value == "ABC123" and not first['Serial'].cached
+    second = ProbeEngine().run(probes, cache=cache)
+    assert second['Serial'].cached and second['Serial'].value == "ABC123"
+    assert second['Static Query'].cached and second['Static Query'].status == PROBE_OK
+    assert calls == ['query']
+
+
+def test_query_still_runs_for_an_uncached_dependent():
+    calls = []
+    probes = [
+        Probe('Query', lambda: calls.append('query') or 1, default=0),
+        Probe('Cached', lambda value: value, depends_on=('Query',), static=True),
+        Probe('Volatile', lambda value: value + 1, depends_on=('Query',)),
+    ]
+    cache = ProbeCache()
+    ProbeEngine().run(probes, cache=cache)
+    results = ProbeEngine().run(probes, cache=cache)
+    assert results['Volatile'].value == 2
+    assert calls == ['query', 'query']
+
+
+def test_static_detection_probes_do_not_wait_for_the_volatile_cim_query(tmp_path):
+    from coa_inspector.detection import HardwareDetector
+
+    probes = {probe.name: probe for probe in HardwareDetector(tmp_path).build_probes()}
+    for probe in probes.values():
+        if probe.static:
+            assert all(probes[dep].static or dep == 'Static CIM' for dep in probe.depends_on), probe.name
+
+
+def test_unreadable_cache_is_reported_on_stderr(tmp_path, capsys):
+    path = tmp_path / 'probe_cache.json'
+    path.write_text("{not json", encoding='utf-8')
+    assert ProbeCache(path).entries == {}
+    captured = capsys.readouterr()
+    # stdout carries the JSON of `main.py detect --json`
+    assert captured.out == "" and "unreadable probe cache" in captured.err
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+from coa_inspector.reference import (REFERENCE_FILE, SECTION_CPU, SECTION_LAPTOP_MODEL, UNDERPERFORMING_PERCENT,
+                                     ReferenceTable, compare_to_reference, reference_summary)
+
+REFERENCE = {'cpu_single_thread': 100.0, 'memory_copy': 20.0, 'memory_latency': 80.0}
+
+
+def test_reference_file_is_next_to_main():
+    assert REFERENCE_FILE.is_absolute()
+    assert REFERENCE_FILE.parent == Path(__file__).resolve().parent.parent
+    assert (REFERENCE_FILE.parent / 'main.py').exists()
+
+
+def test_scores_are_compared_as_percent_of_reference():
+    rows = {row['metric']: row for row in compare_to_reference(
+        {'cpu_single_thread': 95.0, 'memory_copy': 10.0, 'memory_latency': 100.0, 'disk_sequential_read': 500.0},
+        REFERENCE)}
+    # Only scores with a reference are compared
+    assert set(rows) == {'cpu_single_thread', 'memory_copy', 'memory_latency'}
+    assert rows['cpu_single_thread']['percent'] == 95.0 and not rows['cpu_single_thread']['underperforming']
+    assert rows['memory_copy']['percent'] == 50.0 and rows['memory_copy']['underperforming']
+    # Lower latency is better: 100 ns against 80 ns is 80% of the reference
+    assert rows['memory_latency']['percent'] == 80.0 and not rows['memory_latency']['underperforming']
+
+
+def test_flag_threshold():
+    just_below = UNDERPERFORMING_PERCENT - 0.1
+    row, = compare_to_reference({'cpu_single_thread': just_below}, REFERENCE)
+    assert row['underperforming']
+    row, = compare_to_reference({'cpu_single_thread': UNDERPERFORMING_PERCENT}, REFERENCE)
+    assert not row['underperforming']
+
+
+def test_summary_prefers_the_laptop_model(tmp_path):
+    table = ReferenceTable()
+    table.set_reference(SECTION_CPU, "Core i5-8265U", {'cpu_single_thread': 50.0})
+    table.set_reference(SECTION_LAPTOP_MODEL, "ThinkPad T490", REFERENCE)
+    path = tmp_path / 'reference_scores.json'
+    table.save(path)
+    table = ReferenceTable.load(path)
+
+    summary = reference_summary({'cpu_single_thread': 60.0}, table, "thinkpad  t490",
+                                "Intel(R) Core(TM) i5-8265U CPU @ 1.60GHz")
+    assert summary['source'] == "laptop model ThinkPad T490" and summary['underperforming']
+    summary = reference_summary({'cpu_single_thread': 60.0}, table, "", "Intel(R) Core(TM) i5-8265U CPU @ 1.60GHz")
+    assert summary['source'] == "CPU Core i5-8265U" and not summary['underperforming']
+
+
+def test_missing_table_has_no_reference(tmp_path):
+    table = ReferenceTable.load(tmp_path / 'missing.json')
+    assert reference_summary({'cpu_single_thread': 60.0}, table, "ThinkPad T490") == {
+        'source': "", 'rows': [], 'underperforming': False}
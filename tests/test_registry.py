@@ -0,0 +1,51 @@
+from coa_inspector.registry import BIOS_KEY, CPU_KEY, DictRegistryReader, RegistryProbes
+
+# Values under HKLM\HARDWARE\DESCRIPTION on a ThinkPad T490
+CPU_VALUES = {
+    'ProcessorNameString': "Intel(R) Core(TM) i5-8265U CPU @ 1.60GHz   ",
+    'Identifier': "Intel64 Family 6 Model 142 Stepping 11",
+    'VendorIdentifier': "GenuineIntel",
+    '~MHz': 1800,
+}
+BIOS_VALUES = {
+    'BIOSVendor': "LENOVO",
+    'BIOSVersion': "N2IET98W (1.76 )",
+    'BIOSReleaseDate': "03/14/2022",
+    'SystemManufacturer': "LENOVO",
+    'SystemProductName': "20N2S0K800",
+    'SystemFamily': "ThinkPad T490",
+    'SystemSKU': "To be filled by O.E.M.",
+    'BaseBoardManufacturer': "LENOVO",
+    'BaseBoardProduct': "20N2S0K800",
+}
+
+
+def probes(keys):
+    return RegistryProbes(DictRegistryReader(keys))
+
+
+def test_cpu_info_reads_the_brand_string():
+    cpu = probes({CPU_KEY: CPU_VALUES}).cpu_info()
+    assert cpu == {'Name': "Intel(R) Core(TM) i5-8265U CPU @ 1.60GHz", 'Base Frequency': "1800 MHz",
+                   'Vendor': "GenuineIntel"}
+
+
+def test_bios_info_normalizes_the_release_date():
+    bios = probes({BIOS_KEY: BIOS_VALUES}).bios_info()
+    assert bios == {'Version': "N2IET98W (1.76 )", 'Manufacturer': "LENOVO", 'Release Date': "2022-03-14"}
+
+
+def test_system_info_drops_placeholders():
+    system = probes({BIOS_KEY: BIOS_VALUES}).system_info()
+    assert system['Model'] == "20N2S0K800" and system['Family'] == "ThinkPad T490"
+    assert 'SKU' not in system
+
+
+def test_key_paths_are_case_insensitive():
+    assert probes({CPU_KEY.upper(): CPU_VALUES}).cpu_name().startswith("Intel(R) Core(TM) i5-8265U")
+
+
+def test_missing_keys_give_empty_results():
+    registry = probes({})
+    assert registry.cpu_info() == {} and registry.cpu_name() is None
+    assert registry.bios_info() == {} and registry.system_info() == {}
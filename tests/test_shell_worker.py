@@ -0,0 +1,101 @@
+import sys
+import threading
+import time
+
+import pytest
+
+from coa_inspector.cim import collect_cim_snapshot
+from coa_inspector.shell_worker import ShellWorker, ShellWorkerError, ShellWorkerExited, ShellWorkerTimeout
+
+# Stands in for PowerShell: a script is a command word and an argument
+ECHO_WORKER = r"""
+import json, os, sys, time
+print("stray banner line", flush=True)
+for line in sys.stdin:
+    request = json.loads(line)
+    command, _, argument = request['script'].partition(' ')
+    if command == 'crash-once' and not os.path.exists(argument):
+        open(argument, 'w').close()
+        sys.exit(1)
+    if command == 'exit':
+        sys.exit(1)
+    if command == 'sleep':
+        time.sleep(float(argument))
+    if command == 'fail':
+        response = {'id': request['id'], 'ok': False, 'error': argument}
+    else:
+        response = {'id': request['id'], 'ok': True, 'output': argument or str(os.getpid())}
+    print(json.dumps(response), flush=True)
+"""
+
+
+@pytest.fixture
+def worker():
+    worker = ShellWorker([sys.executable, '-c', ECHO_WORKER])
+    yield worker
+    worker.stop()
+
+
+def test_requests_reuse_one_process(worker):
+    assert worker.request("echo hello", timeout=10) == "hello"
+    pid = worker.request("pid", timeout=10)
+    assert worker.request("pid", timeout=10) == pid
+    assert worker.running
+
+
+def test_error_response_raises(worker):
+    with pytest.raises(ShellWorkerError, match="Access denied"):
+        worker.request("fail Access denied", timeout=10)
+    assert worker.request("echo still here", timeout=10) == "still here"
+
+
+def test_unanswered_request_times_out_and_restarts(worker):
+    pid = worker.request("pid", timeout=10)
+    with pytest.raises(ShellWorkerTimeout):
+        worker.request("sleep 30", timeout=0.5)
+    assert worker.request("pid", timeout=10) != pid
+    assert worker.restarts == 0
+
+
+def test_request_is_retried_when_the_worker_dies(worker, tmp_path):
+    marker = tmp_path / 'crashed'
+    assert worker.request(f"crash-once {marker}", timeout=10) == str(marker)
+    assert marker.exists()
+
+
+def test_worker_that_keeps_exiting_gives_up(worker):
+    # Every request starts the worker twice, counting its retry
+    for _ in range(2):
+        with pytest.raises(ShellWorkerExited):
+            worker.request("exit", timeout=10)
+    with pytest.raises(ShellWorkerError, match="keeps exiting"):
+        worker.request("exit", timeout=10)
+    assert worker.restarts == worker.max_restarts
+
+
+def test_worker_is_a_cim_executor(worker):
+    snapshot = collect_cim_snapshot(lambda script, timeout: worker(
+        'echo {"Win32_BIOS": {"SerialNumber": "PF1ABCDE"}}', timeout))
+    assert snapshot.first('Win32_BIOS')['SerialNumber'] == "PF1ABCDE"
+
+
+def test_stop_ends_the_process(worker):
+    worker.request("echo hello", timeout=10)
+    worker.stop()
+    assert not worker.running
+
+
+def test_timeout_starts_when_the_request_gets_its_turn(worker):
+    worker.start()
+    results = {}
+
+    def slow():
+        results['slow'] = worker.request("sleep 0.8", timeout=10)
+
+    first = threading.Thread(target=slow)
+    first.start()
+    time.sleep(0.1)
+    # Queued behind the slow query for longer than its own timeout
+    assert worker.request("echo quick", timeout=0.5) == "quick"
+    first.join(5)
+    assert 'slow' in results
@@ -0,0 +1,47 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from coa_inspector.startup import DEFAULT_BUDGET, run_startup_benchmark
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Imported on first use; loading any of them at startup costs seconds per launch
+DEFERRED_MODULES = ['numpy', 'pandas', 'reportlab']
+
+
+@pytest.fixture
+def offscreen(monkeypatch):
+    monkeypatch.setenv('QT_QPA_PLATFORM', 'offscreen')
+
+
+def loaded_modules(statement: str, cwd: Path) -> list:
+    """Top-level packages loaded after running statement in a fresh interpreter"""
+    script = f"import sys, json\n{statement}\nprint(json.dumps(sorted({{m.split('.')[0] for m in sys.modules}})))"
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    output = subprocess.run([sys.executable, '-c', script], cwd=cwd, env=env, capture_output=True,
+                            text=True, timeout=60, check=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def test_gui_import_defers_heavy_modules(offscreen, tmp_path):
+    pytest.importorskip('PySide6')
+    modules = loaded_modules("import main", tmp_path)
+    assert 'PySide6' in modules
+    assert [name for name in DEFERRED_MODULES if name in modules] == []
+
+
+def test_headless_commands_do_not_load_qt(tmp_path):
+    modules = loaded_modules("import coa_inspector.cli", tmp_path)
+    assert [name for name in ['PySide6'] + DEFERRED_MODULES if name in modules] == []
+
+
+def test_login_window_appears_within_budget(offscreen, tmp_path, monkeypatch):
+    pytest.importorskip('PySide6')
+    monkeypatch.chdir(tmp_path)
+    result = run_startup_benchmark(runs=3)
+    assert result['passed'], f"median startup {result['median']:.2f}s is over the {DEFAULT_BUDGET:g}s budget"
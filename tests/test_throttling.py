@@ -0,0 +1,33 @@
+from coa_inspector.throttling import MIN_SAMPLES, ThrottlingResult, summarize_samples
+
+
+def sample(throughput, frequency=2000.0):
+    return {'time': 0.0, 'frequency_mhz': frequency, 'frequency_per_cpu': [frequency], 'cpu_percent': 100.0,
+            'temperature_c': None, 'fan_rpm': None, 'throughput_mops': throughput}
+
+
+def summarized(throughput):
+    result = ThrottlingResult(duration=len(throughput), workers=1,
+                              samples=[sample(value) for value in throughput])
+    summarize_samples(result)
+    return result
+
+
+def test_fixed_clock_noise_is_not_throttling():
+    # A VM at a fixed clock: +-5% jitter and a slow wander, no real drop
+    throughput = [6.0, 6.3, 5.8, 6.1, 5.7, 6.2, 5.9, 6.0, 5.8, 6.3, 5.9, 6.1, 5.7, 6.0, 6.2, 5.8, 6.1, 5.9]
+    result = summarized([3.0] + throughput)
+    assert result.verdict == "No significant throttling"
+
+
+def test_sustained_drop_is_heavy_throttling():
+    throughput = [10.0, 10.1, 9.9, 10.0, 9.0, 8.0, 7.2, 7.0, 7.1, 6.9, 7.0, 7.1, 7.0, 6.9, 7.0]
+    result = summarized([5.0] + throughput)
+    assert result.peak_throughput_mops == 10.0
+    assert result.steady_throughput_mops == 7.0
+    assert result.verdict == "Heavy throttling"
+
+
+def test_short_run_gives_no_verdict():
+    result = summarized([5.0] + [10.0] * 4 + [6.0] * (MIN_SAMPLES - 5))
+    assert result.verdict == "Too few samples to judge throttling"
@@ -0,0 +1,45 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from coa_inspector.throughput import DIRECTION_DOWNLOAD, DIRECTION_UPLOAD, ThroughputServer, run_throughput_test
+
+
+@pytest.fixture
+def server():
+    server = ThroughputServer('127.0.0.1', 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def stalled_server():
+    """Accepts connections (from the backlog) but never reads or sends"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as listener:
+        listener.bind(('127.0.0.1', 0))
+        listener.listen(16)
+        yield listener.getsockname()
+
+
+def test_both_directions_against_the_bench_server(server):
+    result = run_throughput_test(*server, streams=2, duration=0.5)
+    for direction in (DIRECTION_DOWNLOAD, DIRECTION_UPLOAD):
+        assert result.aggregate_mbps[direction] > 0
+        assert all(not stream['error'] for stream in result.streams_by_direction[direction])
+    assert not result.cancelled
+
+
+@pytest.mark.parametrize('direction', [DIRECTION_DOWNLOAD, DIRECTION_UPLOAD])
+def test_cancel_wakes_streams_blocked_on_a_stalled_server(stalled_server, direction):
+    cancel_event = threading.Event()
+    threading.Timer(0.3, cancel_event.set).start()
+    started = time.perf_counter()
+    result = run_throughput_test(*stalled_server, streams=2, duration=30, directions=[direction],
+                                 cancel_event=cancel_event)
+    assert time.perf_counter() - started < 3
+    assert result.cancelled